@@ -0,0 +1,105 @@
+"""
+排行榜解析基准：逐条字典 vs 按列解析
+Benchmark: per-record dict parsing vs columnar parse_video_frame
+
+用法:
+    python bench_parse.py              # 10^3 ~ 10^5 条视频
+    python bench_parse.py 1000000      # 指定最大条数
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from crawler import BilibiliCrawler
+
+
+def make_video_list(n, seed=0):
+    """生成 n 条接口格式的视频（含少量播放量为0和缺字段的记录）"""
+    rng = np.random.default_rng(seed)
+    views = rng.lognormal(12, 1.5, n).astype(np.int64)
+    views[rng.random(n) < 0.01] = 0
+    videos = []
+    for i in range(n):
+        view = int(views[i])
+        video = {
+            'bvid': f'BV{i:010d}',
+            'title': f'视频{i}',
+            'owner': {'name': f'UP{i % 500}', 'mid': 1000000 + i % 500},
+            'stat': {'view': view, 'danmaku': view // 80, 'like': view // 20,
+                     'coin': view // 50, 'favorite': view // 30, 'share': view // 200},
+            'duration': 60 + i % 1800,
+            'pubdate': 1700000000 + i,
+            'tname': '游戏',
+            'desc': '简介' * (i % 80),
+        }
+        if i % 97 == 0:
+            del video['stat']['share']
+        videos.append(video)
+    return videos
+
+
+def parse_records(video_list, category_name):
+    """旧实现：每条视频一个字典，逐条计算互动率"""
+    parsed_videos = []
+    for video in video_list:
+        video_data = {
+            'BV号': video.get('bvid', ''),
+            '标题': video.get('title', ''),
+            'UP主': video.get('owner', {}).get('name', ''),
+            'UP主ID': video.get('owner', {}).get('mid', ''),
+            '播放量': video.get('stat', {}).get('view', 0),
+            '弹幕数': video.get('stat', {}).get('danmaku', 0),
+            '点赞数': video.get('stat', {}).get('like', 0),
+            '投币数': video.get('stat', {}).get('coin', 0),
+            '收藏数': video.get('stat', {}).get('favorite', 0),
+            '分享数': video.get('stat', {}).get('share', 0),
+            '时长秒': video.get('duration', 0),
+            '发布时间戳': video.get('pubdate', 0),
+            '分区': video.get('tname', ''),
+            '简介': video.get('desc', '')[:100],
+            '排行榜分区': category_name,
+        }
+        total_view = video_data['播放量']
+        if total_view > 0:
+            video_data['点赞率'] = video_data['点赞数'] / total_view
+            video_data['投币率'] = video_data['投币数'] / total_view
+            video_data['收藏率'] = video_data['收藏数'] / total_view
+        else:
+            video_data['点赞率'] = 0
+            video_data['投币率'] = 0
+            video_data['收藏率'] = 0
+        parsed_videos.append(video_data)
+    # save_data 随后把字典列表转换为 DataFrame
+    return pd.DataFrame(parsed_videos)
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    max_n = int(sys.argv[1]) if len(sys.argv) > 1 else 10 ** 5
+    crawler = BilibiliCrawler(cache_path=None, stream_path=None)
+
+    print("=" * 80)
+    print("排行榜解析: 逐条字典 + DataFrame 转换 vs parse_video_frame 按列解析")
+    print("=" * 80)
+
+    n = 1000
+    while n <= max_n:
+        videos = make_video_list(n)
+        old, old_time = timed(lambda: parse_records(videos, '游戏'))
+        new, new_time = timed(lambda: crawler.parse_video_frame(videos, '游戏'))
+        pd.testing.assert_frame_equal(old, new, check_dtype=False)
+        print(f"  n={n:>9,d} | 逐条 {old_time:7.3f}s | 按列 {new_time:7.3f}s | "
+              f"加速 {old_time / new_time:5.1f}x | 输出一致")
+        n *= 10
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+B站数据分析共用派生表
+爬虫报告、二维和三维可视化共用的分区统计、Top N、UP主汇总和互动率
+
+每个数据快照（CSV文件内容的哈希）只计算一次，结果保存为Parquet：
+    data/.analysis/<快照哈希>/<表名>_<代码哈希>.parquet
+数据或派生表代码变化后自动重新计算
+"""
+
+import hashlib
+import inspect
+import os
+import shutil
+
+import pandas as pd
+
+
+DATA_FILE = 'data/bilibili_data.csv'
+
+# 保留最近几个快照的派生表
+KEEP_SNAPSHOTS = 3
+
+# 表名 -> (计算函数, 需要的数据列)
+TABLES = {}
+
+
+def table(name, columns):
+    """注册派生表"""
+    def decorator(func):
+        TABLES[name] = (func, list(columns))
+        return func
+    return decorator
+
+
+# ============================================================================
+# 派生表
+# ============================================================================
+@table('overview', columns=['播放量', '点赞数', '投币数', '收藏数'])
+def overview(df):
+    """总体统计（一行）"""
+    return pd.DataFrame([{
+        '视频总数': len(df),
+        '总播放量': df['播放量'].sum(),
+        '平均播放量': df['播放量'].mean(),
+        '最高播放量': df['播放量'].max(),
+        '最低播放量': df['播放量'].min(),
+        '总点赞数': df['点赞数'].sum(),
+        '总投币数': df['投币数'].sum(),
+        '总收藏数': df['收藏数'].sum(),
+    }])
+
+
+@table('interaction_means', columns=['点赞率', '投币率', '收藏率'])
+def interaction_means(df):
+    """平均互动率"""
+    return df[['点赞率', '投币率', '收藏率']].mean()
+
+
+@table('top_videos', columns=['标题', 'UP主', '分区', '播放量', '点赞数', '投币数'])
+def top_videos(df):
+    """播放量 Top 20 视频"""
+    return df.nlargest(20, '播放量')[['标题', 'UP主', '分区', '播放量', '点赞数', '投币数']]
+
+
+@table('category_counts', columns=['排行榜分区'])
+def category_counts(df):
+    """各分区视频数量"""
+    return df['排行榜分区'].value_counts()
+
+
+@table('category_totals', columns=['排行榜分区', '播放量', '点赞数', '投币数', '收藏数'])
+def category_totals(df):
+    """各分区播放量和互动数据总和"""
+    return df.groupby('排行榜分区')[['播放量', '点赞数', '投币数', '收藏数']].sum()
+
+
+@table('category_means', columns=['排行榜分区', '播放量', '点赞数', '投币数', '收藏数', '弹幕数'])
+def category_means(df):
+    """各分区平均指标"""
+    return df.groupby('排行榜分区')[['播放量', '点赞数', '投币数', '收藏数', '弹幕数']].mean()
+
+
+@table('uploader_stats', columns=['UP主', '播放量'])
+def uploader_stats(df):
+    """UP主视频数、总播放量、平均播放量"""
+    return df.groupby('UP主')['播放量'].agg(视频数='size', 总播放量='sum', 平均播放量='mean')
+
+
+# ============================================================================
+# 快照与持久化
+# ============================================================================
+def snapshot_hash(path):
+    """数据文件内容的哈希"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def _code_hash(name):
+    return hashlib.sha256(inspect.getsource(TABLES[name][0]).encode('utf-8')).hexdigest()[:8]
+
+
+def _write_table(obj, path_prefix):
+    """保存派生表（Series 保存为单列表，文件名带 .series 标记）"""
+    if isinstance(obj, pd.Series):
+        path_prefix += '.series'
+        obj = obj.to_frame()
+    try:
+        obj.to_parquet(path_prefix + '.parquet')
+    except ImportError:
+        obj.to_pickle(path_prefix + '.pkl')
+
+
+def _read_table(path):
+    obj = pd.read_parquet(path) if path.endswith('.parquet') else pd.read_pickle(path)
+    if '.series.' in os.path.basename(path):
+        obj = obj.iloc[:, 0]
+    return obj
+
+
+class BilibiliAnalysis:
+    """按数据快照缓存的派生表（可像字典一样取表）"""
+
+    def __init__(self, data_file=DATA_FILE, cache_dir=None, df=None):
+        """
+        参数:
+            data_file: 数据CSV文件
+            cache_dir: 派生表保存目录（默认数据文件旁的 .analysis）
+            df: 已在内存中的数据（爬虫刚保存时传入，避免重新读取CSV）
+        """
+        self.data_file = data_file
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(data_file) or '.', '.analysis')
+        self.snapshot = snapshot_hash(data_file)
+        self.df = df
+        self.computed = []
+        self._tables = {}
+
+    def _snapshot_dir(self):
+        return os.path.join(self.cache_dir, self.snapshot)
+
+    def _find(self, name):
+        """已保存的派生表文件（没有时返回None）"""
+        prefix = f'{name}_{_code_hash(name)}.'
+        directory = self._snapshot_dir()
+        if os.path.isdir(directory):
+            for filename in os.listdir(directory):
+                if filename.startswith(prefix):
+                    return os.path.join(directory, filename)
+        return None
+
+    def cached(self, name):
+        """派生表是否已计算（内存中或已保存）"""
+        return name in self._tables or self._find(name) is not None
+
+    def signature(self, name):
+        """派生表内容的签名（数据快照 + 计算代码，用于图表缓存键）"""
+        return f'{self.snapshot}:{name}:{_code_hash(name)}'
+
+    def _data(self, columns):
+        if self.df is not None:
+            return self.df
+        return pd.read_csv(self.data_file, encoding='utf-8-sig', usecols=columns)
+
+    def __getitem__(self, name):
+        if name not in self._tables:
+            path = self._find(name)
+            if path is not None:
+                self._tables[name] = _read_table(path)
+            else:
+                self._compute([name])
+        return self._tables[name]
+
+    def __contains__(self, name):
+        return name in TABLES
+
+    def _compute(self, names):
+        """计算并保存派生表（一次读取所有表需要的列）"""
+        columns = list(dict.fromkeys(col for name in names for col in TABLES[name][1]))
+        df = self._data(columns)
+        os.makedirs(self._snapshot_dir(), exist_ok=True)
+        for name in names:
+            result = TABLES[name][0](df)
+            _write_table(result, os.path.join(self._snapshot_dir(), f'{name}_{_code_hash(name)}'))
+            self._tables[name] = result
+            self.computed.append(name)
+        self._prune()
+
+    def build(self, names=None):
+        """
+        计算（或读取）全部派生表
+
+        返回:
+            self
+        """
+        names = list(names or TABLES)
+        missing = [name for name in names if not self.cached(name)]
+        if missing:
+            self._compute(missing)
+        for name in names:
+            self[name]
+        return self
+
+    def _prune(self):
+        """只保留最近的几个快照"""
+        snapshots = [os.path.join(self.cache_dir, d) for d in os.listdir(self.cache_dir)]
+        snapshots = sorted((d for d in snapshots if os.path.isdir(d)), key=os.path.getmtime, reverse=True)
+        for directory in snapshots[KEEP_SNAPSHOTS:]:
+            if os.path.basename(directory) != self.snapshot:
+                shutil.rmtree(directory, ignore_errors=True)
+
+
+def register_tables(registry):
+    """把派生表注册到 ChartRegistry（用于列出依赖和在没有快照时直接计算）"""
+    for name, (func, columns) in TABLES.items():
+        registry.table(name, columns=columns)(func)
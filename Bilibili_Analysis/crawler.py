@@ -11,93 +11,289 @@ if sys.platform == 'win32':
     sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8')
 
+import asyncio
 import requests
+import numpy as np
 import pandas as pd
 import time
-import json
 from datetime import datetime
-import random
+import argparse
 import os
+from urllib.parse import urlsplit
+
+# 与可视化脚本共用的派生表（按数据快照缓存）
+from bilibili_analysis import BilibiliAnalysis
+from snapshot_store import SnapshotStore
+from detail_pipeline import DETAIL_URL, DetailPipeline, enrich
+
+# 异步爬取引擎（连接池 + 按主机令牌桶限速）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'beat_120_mine_levels_in_one_turn'))
+from crawl_engine import AsyncCrawlEngine
+from http_cache import HttpCache
+from ndjson_stream import NDJSONWriter
+from mock_data import generate, numbered, choice, write_chunks
 
 print("=" * 70)
 print("B站热门视频数据爬虫")
 print("=" * 70)
 
+
+# 接口字段 -> 输出列: (列名, 字段路径, 缺省值, 是否数值列)
+VIDEO_SCHEMA = [
+    ('BV号', ('bvid',), '', False),
+    ('标题', ('title',), '', False),
+    ('UP主', ('owner', 'name'), '', False),
+    ('UP主ID', ('owner', 'mid'), '', False),
+    ('播放量', ('stat', 'view'), 0, True),
+    ('弹幕数', ('stat', 'danmaku'), 0, True),
+    ('点赞数', ('stat', 'like'), 0, True),
+    ('投币数', ('stat', 'coin'), 0, True),
+    ('收藏数', ('stat', 'favorite'), 0, True),
+    ('分享数', ('stat', 'share'), 0, True),
+    ('时长秒', ('duration',), 0, True),
+    ('发布时间戳', ('pubdate',), 0, True),
+    ('分区', ('tname',), '', False),
+    ('简介', ('desc',), '', False),
+]
+
+# 互动率列: (列名, 分子列)，分母为播放量
+RATE_COLUMNS = [('点赞率', '点赞数'), ('投币率', '投币数'), ('收藏率', '收藏数')]
+
+VIDEO_COLUMNS = [name for name, *_ in VIDEO_SCHEMA] + ['排行榜分区'] + [name for name, _ in RATE_COLUMNS]
+
+
+# 模拟数据的取值范围
+MOCK_CATEGORIES = ['全站', '动画', '音乐', '游戏', '娱乐']
+MOCK_VIDEO_TYPES = ['生活', '科技', '美食', '舞蹈', '鬼畜', '时尚', '影视', '知识']
+MOCK_UP_NAMES = [
+    '老番茄', '徐大虾咯', '影视飓风', '敬汉卿', '华农兄弟',
+    '李子柒', 'Lex', '小潮院长', '芳斯塔芙', '绵羊料理',
+    '技术宅阿伟', '何同学', '老师好我叫何同学', '稚晖君', '硬核的半佛仙人',
+    '罗翔说刑法', '巫师财经', '半佛仙人', '蕾蕾Kyokyo', '泛式',
+]
+MOCK_TITLES = [
+    '这游戏太离谱了！', '震惊！原来真相是这样', '教你一招搞定',
+    '万万没想到', '这才是正确的打开方式', '太强了！',
+    '我悟了！', '这个技巧你一定要学', '神仙操作',
+    '笑死我了', '太真实了', '这也太厉害了吧',
+    '绝了！', '学到了学到了', '涨知识了',
+]
+# 互动数 = 播放量 × 均匀分布的比例: (列名, 下限, 上限)
+MOCK_RATIOS = [('弹幕数', 0.005, 0.02), ('点赞数', 0.03, 0.08), ('投币数', 0.01, 0.04),
+               ('收藏数', 0.015, 0.05), ('分享数', 0.001, 0.01)]
+
+
+def make_mock_chunk(rng, start, n, now=None):
+    """
+    生成第 start 行起的 n 条模拟视频（整列生成，列为 VIDEO_COLUMNS）
+    
+    播放量为对数正态分布（长尾），截断在 5万 ~ 500万；
+    弹幕、点赞、投币、收藏、分享为播放量乘以 MOCK_RATIOS 中的均匀比例
+    """
+    now = int(time.time()) if now is None else now
+    index = np.arange(start, start + n, dtype=np.int64)
+    view = np.clip(rng.lognormal(np.log(300_000), 1.0, n), 50_000, 5_000_000).astype(np.int64)
+    type_codes = rng.integers(0, len(MOCK_VIDEO_TYPES), n)
+    title_codes = rng.integers(0, len(MOCK_TITLES), n) * len(MOCK_VIDEO_TYPES) + type_codes
+    titles = [f'{title} - {video_type}相关' for title in MOCK_TITLES for video_type in MOCK_VIDEO_TYPES]
+    
+    df = pd.DataFrame({
+        # 10位数字由行号映射得到（7919 与 9×10^9 互质），不同行不会重复
+        'BV号': numbered('BV', 1_000_000_000 + index * 7919 % 9_000_000_000),
+        '标题': pd.Categorical.from_codes(title_codes, categories=titles),
+        'UP主': choice(rng, MOCK_UP_NAMES, n),
+        'UP主ID': rng.integers(1_000_000, 10_000_000, n),
+        '播放量': view,
+    })
+    for column, low, high in MOCK_RATIOS:
+        df[column] = (view * rng.uniform(low, high, n)).astype(np.int64)
+    df = df[VIDEO_COLUMNS[:10]]
+    df['时长秒'] = rng.integers(60, 1801, n)
+    df['发布时间戳'] = now - rng.integers(0, 7 * 24 * 3600 + 1, n)
+    df['分区'] = pd.Categorical.from_codes(type_codes, categories=MOCK_VIDEO_TYPES)
+    df['简介'] = pd.Categorical.from_codes(
+        type_codes, categories=[f'这是一个关于{video_type}的精彩视频' for video_type in MOCK_VIDEO_TYPES])
+    df['排行榜分区'] = choice(rng, MOCK_CATEGORIES, n)
+    for rate, count in RATE_COLUMNS:
+        df[rate] = df[count] / view
+    return df
+
+
+def write_mock_data(path, n_rows, seed=None, chunksize=1_000_000, now=None):
+    """
+    生成大规模模拟数据并逐块写入 .parquet / .csv（用于可视化和清洗脚本的压力测试）
+    
+    参数:
+        now: 发布时间戳的参考时间（默认当前时间；与 seed 一起固定时结果完全可复现）
+    
+    返回:
+        写出的行数
+    """
+    now = int(time.time()) if now is None else now
+    chunks = generate(lambda rng, start, n: make_mock_chunk(rng, start, n, now),
+                      n_rows, seed=seed, chunksize=chunksize)
+    return write_chunks(chunks, path)
+
+
+def _extract_column(video_list, path, default, nested):
+    """
+    按字段路径取出一列（最多两层嵌套）
+    
+    参数:
+        nested: {外层字段: 子字典列表}，同一外层字段（如 stat）只取一次
+    """
+    if len(path) == 1:
+        key, = path
+        return [video.get(key, default) for video in video_list]
+    outer, inner = path
+    if outer not in nested:
+        nested[outer] = [video.get(outer) or {} for video in video_list]
+    return [item.get(inner, default) for item in nested[outer]]
+
 class BilibiliCrawler:
     """B站视频爬虫类"""
     
-    def __init__(self):
-        self.api_url = "https://api.bilibili.com/x/web-interface/ranking/v2"
+    def __init__(self, api_url=None, rate=1.0, burst=3, cache_path='data/http_cache.sqlite',
+                 cache_ttl=1800, offline=False, stream_path='data/bilibili_data.ndjson'):
+        """
+        参数:
+            api_url: 排行榜接口地址（默认B站官方接口，测试时可指向本地桩服务）
+            rate: 每秒请求数
+            burst: 允许的突发请求数（并发爬取的分区数）
+            cache_path: 响应缓存文件（None 表示不缓存）
+            cache_ttl: 缓存有效秒数，过期后用 ETag/Last-Modified 重新验证
+            offline: 离线模式，只使用缓存的响应
+            stream_path: 爬取过程中逐条写出的NDJSON文件（.gz/.zst 结尾时压缩；None 表示不写）
+        """
+        self.api_url = api_url or "https://api.bilibili.com/x/web-interface/ranking/v2"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
             'Referer': 'https://www.bilibili.com',
         }
-        self.videos = []
-        
+        self.rate = rate
+        self.burst = burst
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.cache = None
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+            self.cache = HttpCache(cache_path, ttl=cache_ttl, offline=offline)
+        self.stream_path = stream_path
+        # stream_path 的内容是否与 self.frame 完全一致（模拟数据、补充详情后为False）
+        self._streamed = False
+        # 数据来源: 'crawl'（爬取）或 'mock'（模拟数据，不追加到快照存储）
+        self.source = 'crawl'
+        self.fetch_summary = ''
+        # 视频数据（内部以 DataFrame 保存，对外的 videos 和各方法的返回值仍是字典列表）
+        self.frame = pd.DataFrame(columns=VIDEO_COLUMNS)
+
+    @property
+    def videos(self):
+        """视频数据的字典列表（每次从 self.frame 生成新列表）"""
+        return self.frame.to_dict('records')
+
+    @videos.setter
+    def videos(self, videos):
+        self.frame = pd.DataFrame(videos)
+
+    def _extract_list(self, data):
+        """从接口响应中取出视频列表"""
+        if data['code'] == 0 and 'data' in data and 'list' in data['data']:
+            return data['data']['list']
+        print(f"  × API返回错误: {data.get('message', '未知错误')}")
+        return None
+
     def get_ranking_data(self, rid=0):
         """获取排行榜数据"""
         try:
             params = {'rid': rid, 'type': 'all'}
-            response = requests.get(self.api_url, headers=self.headers, 
-                                   params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            if data['code'] == 0 and 'data' in data and 'list' in data['data']:
-                return data['data']['list']
+            if self.cache is not None:
+                response = self.cache.get(self.session, self.api_url, params=params, timeout=10)
             else:
-                print(f"  × API返回错误: {data.get('message', '未知错误')}")
-                return None
+                response = self.session.get(self.api_url, params=params, timeout=10)
+            response.raise_for_status()
+            return self._extract_list(response.json())
                 
         except Exception as e:
             print(f"  × 请求失败: {e}")
             return None
+
+    async def _fetch_rankings(self, categories):
+        """
+        在限速范围内并发获取各分区排行榜，返回与 categories 对应的响应（失败为异常对象）
+        
+        412（风控）、429、5xx 和超时会退避重试，429/503 时自动降低并发和速率；
+        连接被拒绝时直接失败
+        """
+        async with AsyncCrawlEngine(rate=self.rate, burst=self.burst,
+                                    max_connections=max(len(categories), 1),
+                                    headers=self.headers, cache=self.cache) as engine:
+            tasks = [engine.fetch_json(self.api_url, params={'rid': c['rid'], 'type': 'all'})
+                     for c in categories]
+            responses = await asyncio.gather(*tasks, return_exceptions=True)
+            self.fetch_summary = engine.summary()
+            return responses
     
     def parse_video_data(self, video_list, category_name):
-        """解析视频数据"""
-        parsed_videos = []
-        
-        for video in video_list:
-            try:
-                video_data = {
-                    'BV号': video.get('bvid', ''),
-                    '标题': video.get('title', ''),
-                    'UP主': video.get('owner', {}).get('name', ''),
-                    'UP主ID': video.get('owner', {}).get('mid', ''),
-                    '播放量': video.get('stat', {}).get('view', 0),
-                    '弹幕数': video.get('stat', {}).get('danmaku', 0),
-                    '点赞数': video.get('stat', {}).get('like', 0),
-                    '投币数': video.get('stat', {}).get('coin', 0),
-                    '收藏数': video.get('stat', {}).get('favorite', 0),
-                    '分享数': video.get('stat', {}).get('share', 0),
-                    '时长秒': video.get('duration', 0),
-                    '发布时间戳': video.get('pubdate', 0),
-                    '分区': video.get('tname', ''),
-                    '简介': video.get('desc', '')[:100],
-                    '排行榜分区': category_name,
-                }
-                
-                # 计算互动率
-                total_view = video_data['播放量']
-                if total_view > 0:
-                    video_data['点赞率'] = video_data['点赞数'] / total_view
-                    video_data['投币率'] = video_data['投币数'] / total_view
-                    video_data['收藏率'] = video_data['收藏数'] / total_view
-                else:
-                    video_data['点赞率'] = 0
-                    video_data['投币率'] = 0
-                    video_data['收藏率'] = 0
-                
-                parsed_videos.append(video_data)
-                
-            except Exception as e:
-                print(f"  × 解析视频失败: {e}")
-                continue
+        """
+        解析视频数据
+        
+        参数:
+            video_list: 接口返回的视频列表
+            category_name: 排行榜分区名
         
-        return parsed_videos
+        返回:
+            视频字典列表（键为 VIDEO_COLUMNS）；需要 DataFrame 时用 parse_video_frame
+        """
+        return self.parse_video_frame(video_list, category_name).to_dict('records')
+    
+    def parse_video_frame(self, video_list, category_name):
+        """
+        按列解析视频数据（按 VIDEO_SCHEMA 直接取成列，互动率整列计算）
+        
+        参数:
+            video_list: 接口返回的视频列表
+            category_name: 排行榜分区名
+        
+        返回:
+            DataFrame，列为 VIDEO_COLUMNS
+        """
+        videos = [video for video in video_list if isinstance(video, dict)]
+        if len(videos) < len(video_list):
+            print(f"  × 跳过 {len(video_list) - len(videos)} 条无法解析的视频")
+        
+        columns, nested = {}, {}
+        for name, path, default, numeric in VIDEO_SCHEMA:
+            values = _extract_column(videos, path, default, nested)
+            if numeric:
+                try:
+                    columns[name] = np.fromiter(values, dtype=np.int64, count=len(values))
+                except (TypeError, ValueError):
+                    # 有 None 或非数字字符串时逐个转换，无法转换的记为0
+                    columns[name] = pd.to_numeric(pd.Series(values, dtype=object),
+                                                  errors='coerce').fillna(0).astype('int64')
+            else:
+                columns[name] = pd.Series(values, dtype=object)
+        df = pd.DataFrame(columns)
+        df['简介'] = df['简介'].fillna('').astype(str).str[:100]
+        df['排行榜分区'] = category_name
+        
+        # 计算互动率（播放量为0时记为0）
+        view = df['播放量'].to_numpy(dtype='float64')
+        for rate, count in RATE_COLUMNS:
+            df[rate] = np.divide(df[count].to_numpy(dtype='float64'), view,
+                                 out=np.zeros(len(df)), where=view > 0)
+        
+        return df
     
     def crawl(self, categories=None):
-        """执行爬取"""
+        """
+        执行爬取
+        
+        返回:
+            视频字典列表（包括之前已有的数据），全部分区失败时返回 None
+        """
         if categories is None:
             categories = [
                 {'rid': 0, 'name': '全站'},
@@ -112,105 +308,111 @@ class BilibiliCrawler:
         print("=" * 70)
         
         success_count = 0
+        frames = []
+        start = time.perf_counter()
+        responses = asyncio.run(self._fetch_rankings(categories))
+        
+        # 解析结果逐条写出，中途出错时已解析的数据不会丢失；
+        # 写出器在第一条数据时才打开，全部分区失败时不会留下空文件
+        writer = None
+        appended = len(self.frame) > 0
         
-        for category in categories:
-            rid = category['rid']
+        for category, data in zip(categories, responses):
             name = category['name']
             
             print(f"\n正在爬取【{name}】排行榜...")
             
-            video_list = self.get_ranking_data(rid=rid)
+            if isinstance(data, Exception):
+                print(f"  × 请求失败: {data}")
+                video_list = None
+            else:
+                video_list = self._extract_list(data)
             
             if not video_list:
                 print(f"  × 【{name}】获取失败，跳过")
                 continue
             
-            parsed_videos = self.parse_video_data(video_list, name)
+            parsed_videos = self.parse_video_frame(video_list, name)
             
-            if parsed_videos:
-                self.videos.extend(parsed_videos)
+            if len(parsed_videos):
+                frames.append(parsed_videos)
+                if self.stream_path:
+                    if writer is None:
+                        os.makedirs(os.path.dirname(self.stream_path) or '.', exist_ok=True)
+                        writer = NDJSONWriter(self.stream_path)
+                    writer.write_many(parsed_videos.to_dict('records'))
                 print(f"  √ 成功爬取 {len(parsed_videos)} 个视频")
                 success_count += 1
-            
-            time.sleep(1)
         
-        if self.videos:
-            print(f"\n√ 爬取完成！共获取 {len(self.videos)} 个视频数据")
+        if writer is not None:
+            writer.close()
+            # 之前已有数据时流文件只包含本次的分区，保存时需要整体重写
+            self._streamed = not appended
+        if frames:
+            if appended:
+                frames.insert(0, self.frame)
+            self.frame = pd.concat(frames, ignore_index=True)
+        print(f"\n请求耗时: {time.perf_counter() - start:.2f}s")
+        print(self.fetch_summary)
+        if self.cache is not None:
+            print(self.cache.summary())
+        
+        if len(self.frame):
+            print(f"\n√ 爬取完成！共获取 {len(self.frame)} 个视频数据")
             return self.videos
         else:
             print(f"\n× 所有分区爬取失败")
             return None
     
-    def generate_mock_data(self):
-        """生成模拟数据（当API无法访问时使用）"""
+    def generate_mock_data(self, n_rows=100, seed=None):
+        """
+        生成模拟数据（当API无法访问时使用）
+        
+        参数:
+            n_rows: 视频条数
+            seed: 随机种子（None 表示每次不同）
+        
+        返回:
+            视频字典列表
+        """
         print("\n" + "=" * 70)
         print("使用模拟数据模式")
         print("=" * 70)
         
-        categories = ['全站', '动画', '音乐', '游戏', '娱乐']
-        video_types = ['生活', '科技', '美食', '舞蹈', '鬼畜', '时尚', '影视', '知识']
-        
-        up_names = [
-            '老番茄', '徐大虾咯', '影视飓风', '敬汉卿', '华农兄弟',
-            '李子柒', 'Lex', '小潮院长', '芳斯塔芙', '绵羊料理',
-            '技术宅阿伟', '何同学', '老师好我叫何同学', '稚晖君', '硬核的半佛仙人',
-            '罗翔说刑法', '巫师财经', '半佛仙人', '蕾蕾Kyokyo', '泛式',
-        ]
-        
-        video_titles = [
-            '这游戏太离谱了！', '震惊！原来真相是这样', '教你一招搞定',
-            '万万没想到', '这才是正确的打开方式', '太强了！',
-            '我悟了！', '这个技巧你一定要学', '神仙操作',
-            '笑死我了', '太真实了', '这也太厉害了吧',
-            '绝了！', '学到了学到了', '涨知识了',
-        ]
-        
-        mock_videos = []
-        
-        for i in range(100):
-            category = random.choice(categories)
-            up_name = random.choice(up_names)
-            title_base = random.choice(video_titles)
-            video_type = random.choice(video_types)
-            
-            # 生成合理的数据
-            view = random.randint(50000, 5000000)
-            like = int(view * random.uniform(0.03, 0.08))
-            coin = int(view * random.uniform(0.01, 0.04))
-            favorite = int(view * random.uniform(0.015, 0.05))
-            danmaku = int(view * random.uniform(0.005, 0.02))
-            share = int(view * random.uniform(0.001, 0.01))
-            
-            video = {
-                'BV号': f'BV{random.randint(1000000000, 9999999999)}',
-                '标题': f'{title_base} - {video_type}相关',
-                'UP主': up_name,
-                'UP主ID': random.randint(1000000, 9999999),
-                '播放量': view,
-                '弹幕数': danmaku,
-                '点赞数': like,
-                '投币数': coin,
-                '收藏数': favorite,
-                '分享数': share,
-                '时长秒': random.randint(60, 1800),
-                '发布时间戳': int(time.time()) - random.randint(0, 7*24*3600),
-                '分区': video_type,
-                '简介': f'这是一个关于{video_type}的精彩视频',
-                '排行榜分区': category,
-                '点赞率': like / view,
-                '投币率': coin / view,
-                '收藏率': favorite / view,
-            }
-            
-            mock_videos.append(video)
+        df = pd.concat(generate(make_mock_chunk, n_rows, seed=seed), ignore_index=True)
+        # 分类列转回普通字符串，与爬取的数据一致
+        self.frame = df.astype({col: str for col in df.columns if isinstance(df[col].dtype, pd.CategoricalDtype)})
+        self.source = 'mock'
+        self._streamed = False
+        print(f"\n√ 已生成 {len(self.frame)} 条模拟数据")
+        return self.videos
+    
+    def enrich_details(self, fetchers=8, rate=10.0):
+        """
+        按 BV号 获取视频详情（标签、分P时长、完整简介）并合并到 self.frame
         
-        self.videos = mock_videos
-        print(f"\n√ 已生成 {len(mock_videos)} 条模拟数据")
-        return mock_videos
+        参数:
+            fetchers: 并发请求数
+            rate: 每秒请求数上限
+        
+        返回:
+            补充详情后的视频字典列表
+        """
+        if self.frame.empty:
+            return self.videos
+        print(f"\n获取 {self.frame['BV号'].nunique()} 个视频的详情...")
+        # 详情接口与排行榜接口在同一主机（测试时为本地桩服务）
+        detail_url = urlsplit(self.api_url)._replace(path=urlsplit(DETAIL_URL).path).geturl()
+        pipeline = DetailPipeline(detail_url, fetchers=fetchers, rate=rate, burst=fetchers,
+                                  headers=self.headers, cache=self.cache)
+        self.frame = enrich(self.frame, pipeline.run(self.frame['BV号']))
+        # 流文件中没有详情列，保存时重写
+        self._streamed = False
+        return self.videos
     
     def save_data(self, output_dir='data'):
         """保存数据"""
-        if not self.videos:
+        if self.frame.empty:
             print("\n警告: 没有数据可保存")
             return None
         
@@ -219,7 +421,7 @@ class BilibiliCrawler:
         # 创建输出目录
         os.makedirs(output_dir, exist_ok=True)
         
-        df = pd.DataFrame(self.videos)
+        df = self.frame.copy()
         
         # 转换时间戳为日期
         df['发布日期'] = pd.to_datetime(df['发布时间戳'], unit='s')
@@ -230,51 +432,68 @@ class BilibiliCrawler:
         df.to_csv(csv_file, index=False, encoding='utf-8-sig')
         print(f"  √ 已保存CSV: {csv_file}")
         
-        # 保存JSON
-        json_file = f'{output_dir}/bilibili_data.json'
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(self.videos, f, ensure_ascii=False, indent=2)
-        print(f"  √ 已保存JSON: {json_file}")
+        # 保存NDJSON（爬取时已经逐条写到同一文件、且之后数据没有变化的不再重写）
+        ndjson_file = f'{output_dir}/bilibili_data.ndjson'
+        if not (self._streamed and os.path.abspath(self.stream_path) == os.path.abspath(ndjson_file)):
+            with NDJSONWriter(ndjson_file) as writer:
+                writer.write_many(self.frame.to_dict('records'))
+        print(f"  √ 已保存NDJSON: {ndjson_file}")
+        
+        # 追加到按日期分区的快照存储（保留每次爬取的历史）；
+        # 模拟数据的播放量是编造的，不进入 history() / growth() 的统计
+        if self.source == 'mock':
+            print("  - 模拟数据，不追加快照")
+        else:
+            store = SnapshotStore(f'{output_dir}/snapshots')
+            snapshot_id = store.append(df)
+            store.close()
+            print(f"  √ 已追加快照: {snapshot_id}")
         
-        # 生成报告
-        self.generate_report(df, output_dir)
+        # 计算并保存派生表（可视化脚本直接读取），再生成报告
+        analysis = BilibiliAnalysis(csv_file, df=df).build()
+        self.generate_report(df, output_dir, analysis)
         
         return df
     
-    def generate_report(self, df, output_dir):
+    def generate_report(self, df, output_dir, analysis=None):
         """生成数据报告"""
+        if analysis is None:
+            analysis = BilibiliAnalysis(f'{output_dir}/bilibili_data.csv', df=df)
+        overview = analysis['overview'].iloc[0]
+        rates = analysis['interaction_means']
+
         report = f"""
 {'=' * 70}
 B站热门视频数据报告
 {'=' * 70}
 
 爬取时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-数据总量: {len(df)} 个视频
+数据总量: {int(overview['视频总数'])} 个视频
 
 播放量统计:
-  - 总播放量: {df['播放量'].sum():,}
-  - 平均播放量: {df['播放量'].mean():.0f}
-  - 最高播放量: {df['播放量'].max():,}
-  - 最低播放量: {df['播放量'].min():,}
+  - 总播放量: {int(overview['总播放量']):,}
+  - 平均播放量: {overview['平均播放量']:.0f}
+  - 最高播放量: {int(overview['最高播放量']):,}
+  - 最低播放量: {int(overview['最低播放量']):,}
 
 互动数据统计:
-  - 总点赞数: {df['点赞数'].sum():,}
-  - 总投币数: {df['投币数'].sum():,}
-  - 总收藏数: {df['收藏数'].sum():,}
-  - 平均点赞率: {df['点赞率'].mean():.2%}
-  - 平均投币率: {df['投币率'].mean():.2%}
-  - 平均收藏率: {df['收藏率'].mean():.2%}
+  - 总点赞数: {int(overview['总点赞数']):,}
+  - 总投币数: {int(overview['总投币数']):,}
+  - 总收藏数: {int(overview['总收藏数']):,}
+  - 平均点赞率: {rates['点赞率']:.2%}
+  - 平均投币率: {rates['投币率']:.2%}
+  - 平均收藏率: {rates['收藏率']:.2%}
 
 分区分布:
 """
         
-        category_counts = df['排行榜分区'].value_counts()
+        category_counts = analysis['category_counts']
         for category, count in category_counts.items():
             report += f"  - {category}: {count} 个视频\n"
         
         report += f"\nTop 10 热门视频:\n"
         
-        top10 = df.nlargest(10, '播放量')[['标题', 'UP主', '播放量', '点赞数', '分区']]
+        top10 = analysis['top_videos'].head(10)
         for idx, (_, row) in enumerate(top10.iterrows(), 1):
             report += f"\n  {idx}. {row['标题']}\n"
             report += f"     UP主: {row['UP主']} | 分区: {row['分区']}\n"
@@ -291,8 +510,25 @@ B站热门视频数据报告
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='B站热门视频数据爬虫')
+    parser.add_argument('--mock-rows', type=int, default=None,
+                        help='不爬取，只生成指定行数的模拟数据写入 --output（压力测试用）')
+    parser.add_argument('--output', default='data/bilibili_mock.parquet', help='模拟数据文件（.parquet 或 .csv）')
+    parser.add_argument('--seed', type=int, default=None, help='模拟数据的随机种子')
+    parser.add_argument('--chunksize', type=int, default=1_000_000, help='模拟数据每块行数')
+    parser.add_argument('--details', action='store_true', help='爬取后按 BV号 补充视频详情（标签、分P时长、完整简介）')
+    parser.add_argument('--fetchers', type=int, default=8, help='获取详情的并发请求数')
+    parser.add_argument('--detail-rate', type=float, default=10.0, help='获取详情的每秒请求数上限')
+    args = parser.parse_args()
+    
+    if args.mock_rows:
+        write_mock_data(args.output, args.mock_rows, seed=args.seed, chunksize=args.chunksize)
+        sys.exit(0)
+    
     # 创建爬虫实例
-    crawler = BilibiliCrawler()
+    # BILIBILI_OFFLINE=1 时只使用缓存的响应（不访问网络）
+    crawler = BilibiliCrawler(api_url=os.environ.get('BILIBILI_API_URL'),
+                              offline=os.environ.get('BILIBILI_OFFLINE') == '1')
     
     # 定义要爬取的分区
     categories = [
@@ -306,9 +542,11 @@ if __name__ == "__main__":
     # 尝试爬取真实数据
     print("\n尝试从B站API获取数据...")
     videos = crawler.crawl(categories=categories)
+    if videos is not None and args.details:
+        videos = crawler.enrich_details(fetchers=args.fetchers, rate=args.detail_rate)
     
     # 如果爬取失败，使用模拟数据
-    if not videos:
+    if videos is None:
         print("\n" + "=" * 70)
         print("⚠️  无法从B站API获取数据")
         print("可能原因:")
@@ -318,10 +556,10 @@ if __name__ == "__main__":
         print("\n切换到模拟数据模式...")
         print("=" * 70)
         
-        videos = crawler.generate_mock_data()
+        videos = crawler.generate_mock_data(seed=args.seed)
     
     # 保存数据
-    if videos:
+    if videos is not None:
         df = crawler.save_data(output_dir='data')
         
         print("\n" + "=" * 70)
@@ -0,0 +1,165 @@
+"""
+B站视频详情补充流水线
+按 BV号 获取视频详情（标签、分P时长、完整简介），合并回排行榜数据
+
+流程（生产者-消费者）:
+    BV号 --有界队列--> N 个异步请求协程 --有界队列--> 批量解析（进程池） --> 按 BV号 合并
+
+请求经过 AsyncCrawlEngine（限速、AIMD自适应并发、退避重试、可选磁盘缓存）；
+队列有界，请求快于解析时请求协程会等待，内存占用不随视频数增长
+
+用法:
+    pipeline = DetailPipeline(fetchers=16, rate=20)
+    details = pipeline.run(df['BV号'])
+    df = enrich(df, details)
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'beat_120_mine_levels_in_one_turn'))
+from crawl_engine import AsyncCrawlEngine
+
+
+DETAIL_URL = 'https://api.bilibili.com/x/web-interface/view/detail'
+
+# 详情补充的列（'BV号' 为合并键）
+DETAIL_COLUMNS = ['BV号', '标签', '分P数', '分P时长', '完整简介']
+
+
+def parse_detail_batch(items):
+    """
+    解析一批详情响应（在进程池中执行）
+
+    参数:
+        items: [(BV号, 响应体bytes)]
+
+    返回:
+        [行字典]，接口返回错误的视频各列为空
+    """
+    rows = []
+    for bvid, body in items:
+        row = {'BV号': bvid, '标签': None, '分P数': None, '分P时长': None, '完整简介': None}
+        try:
+            data = json.loads(body)
+        except ValueError:
+            rows.append(row)
+            continue
+        if data.get('code') == 0:
+            view = data['data'].get('View') or {}
+            pages = view.get('pages') or []
+            row.update({
+                '标签': ','.join(tag['tag_name'] for tag in data['data'].get('Tags') or []),
+                '分P数': len(pages),
+                '分P时长': ','.join(str(page.get('duration', 0)) for page in pages),
+                '完整简介': view.get('desc', ''),
+            })
+        rows.append(row)
+    return rows
+
+
+class DetailPipeline:
+    """视频详情流水线"""
+
+    def __init__(self, detail_url=DETAIL_URL, fetchers=8, queue_size=256, batch_size=64,
+                 parse_workers=None, **engine_kwargs):
+        """
+        参数:
+            detail_url: 详情接口地址
+            fetchers: 并发请求协程数（也是连接池大小）
+            queue_size: 两个队列的容量
+            batch_size: 每次交给解析进程的响应数
+            parse_workers: 解析进程数（默认 min(4, CPU数)）
+            engine_kwargs: 传给 AsyncCrawlEngine 的参数（rate、burst、headers、cache 等）
+        """
+        self.detail_url = detail_url
+        self.fetchers = fetchers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.parse_workers = parse_workers or min(4, os.cpu_count() or 1)
+        self.engine_kwargs = dict(engine_kwargs, max_connections=fetchers)
+        self.failures = {}
+        self.summary = ''
+
+    async def _produce(self, bvids, todo):
+        for bvid in bvids:
+            await todo.put(bvid)
+        for _ in range(self.fetchers):
+            await todo.put(None)
+
+    async def _fetch(self, engine, todo, fetched):
+        while True:
+            bvid = await todo.get()
+            if bvid is None:
+                break
+            try:
+                response = await engine.fetch(self.detail_url, params={'bvid': bvid})
+            except requests.RequestException as e:
+                self.failures[bvid] = str(e)
+                continue
+            await fetched.put((bvid, response.content))
+        await fetched.put(None)
+
+    async def _parse(self, pool, fetched):
+        loop = asyncio.get_running_loop()
+        futures, batch, finished = [], [], 0
+        while finished < self.fetchers:
+            item = await fetched.get()
+            if item is None:
+                finished += 1
+                continue
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                futures.append(loop.run_in_executor(pool, parse_detail_batch, batch))
+                batch = []
+        if batch:
+            futures.append(loop.run_in_executor(pool, parse_detail_batch, batch))
+        return [row for rows in await asyncio.gather(*futures) for row in rows]
+
+    async def run_async(self, bvids):
+        """异步执行流水线，返回详情 DataFrame（列为 DETAIL_COLUMNS）"""
+        todo = asyncio.Queue(self.queue_size)
+        fetched = asyncio.Queue(self.queue_size)
+        with ProcessPoolExecutor(self.parse_workers) as pool:
+            async with AsyncCrawlEngine(**self.engine_kwargs) as engine:
+                fetch_tasks = [asyncio.create_task(self._fetch(engine, todo, fetched))
+                               for _ in range(self.fetchers)]
+                parse_task = asyncio.create_task(self._parse(pool, fetched))
+                await self._produce(bvids, todo)
+                await asyncio.gather(*fetch_tasks)
+                rows = await parse_task
+                self.summary = engine.summary()
+        return pd.DataFrame(rows, columns=DETAIL_COLUMNS)
+
+    def run(self, bvids):
+        """
+        获取一组视频的详情
+
+        参数:
+            bvids: BV号序列（重复的只请求一次）
+
+        返回:
+            详情 DataFrame，请求失败的 BV号 记录在 self.failures 中
+        """
+        bvids = list(dict.fromkeys(bvids))
+        self.failures = {}
+        start = time.perf_counter()
+        details = asyncio.run(self.run_async(bvids))
+        seconds = time.perf_counter() - start
+        print(f"  √ 已获取 {len(details)}/{len(bvids)} 个视频详情（{seconds:.1f}s，失败 {len(self.failures)}）")
+        print(f"  {self.summary}")
+        return details
+
+
+def enrich(df, details):
+    """按 BV号 把详情合并到排行榜数据（左连接，没有详情的视频补充列为空）"""
+    df = df.drop(columns=[col for col in DETAIL_COLUMNS[1:] if col in df.columns])
+    return df.merge(details, on='BV号', how='left')
@@ -46,7 +46,7 @@ echo ============================================================
 echo.
 echo 已生成文件:
 echo   - data/bilibili_data.csv
-echo   - data/bilibili_data.json
+echo   - data/bilibili_data.ndjson
 echo   - data/bilibili_report.txt
 echo   - visualizations/ 目录下的10个图表
 echo.
@@ -0,0 +1,179 @@
+"""
+B站爬取快照存储
+每次爬取追加为一个按日期分区的Parquet文件，不再覆盖历史数据
+
+目录结构:
+    data/snapshots/
+    ├── date=2024-05-01/crawl_20240501_080000.parquet
+    ├── date=2024-05-02/crawl_20240502_080000.parquet
+    └── index.sqlite    # BV号 -> 各快照中的播放量等指标（带索引）
+
+同一快照内按 BV号 去重（同一视频出现在多个分区排行榜时保留第一次出现的记录）。
+视频的历史和播放量增长率直接查询索引，不需要重新读取所有快照
+"""
+
+import os
+import sqlite3
+from datetime import datetime
+
+import pandas as pd
+
+
+# 写入索引的指标列
+INDEX_METRICS = ['播放量', '点赞数', '投币数', '收藏数', '弹幕数']
+
+
+class SnapshotStore:
+    """按日期分区的快照存储"""
+
+    def __init__(self, root='data/snapshots'):
+        """
+        参数:
+            root: 快照根目录
+        """
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, 'index.sqlite'))
+        metrics = ', '.join(f'"{col}" INTEGER' for col in INDEX_METRICS)
+        self._db.executescript(f"""
+            CREATE TABLE IF NOT EXISTS snapshots (
+                snapshot_id TEXT PRIMARY KEY,
+                crawled_at TEXT,
+                path TEXT,
+                n_videos INTEGER
+            );
+            CREATE TABLE IF NOT EXISTS videos (
+                bvid TEXT,
+                snapshot_id TEXT,
+                crawled_at TEXT,
+                {metrics},
+                PRIMARY KEY (bvid, snapshot_id)
+            );
+            CREATE INDEX IF NOT EXISTS idx_videos_bvid ON videos (bvid, crawled_at);
+        """)
+        self._db.commit()
+
+    def _snapshot_path(self, crawled_at):
+        partition = os.path.join(self.root, f"date={crawled_at:%Y-%m-%d}")
+        os.makedirs(partition, exist_ok=True)
+        base = os.path.join(partition, f"crawl_{crawled_at:%Y%m%d_%H%M%S}")
+        path, suffix = base, 1
+        while os.path.exists(path + '.parquet') or os.path.exists(path + '.pkl'):
+            suffix += 1
+            path = f"{base}_{suffix}"
+        return path
+
+    def append(self, df, crawled_at=None):
+        """
+        追加一次爬取
+
+        参数:
+            df: 爬取结果（包含 BV号 和 INDEX_METRICS 列）
+            crawled_at: 爬取时间（默认当前时间）
+
+        返回:
+            快照ID
+        """
+        crawled_at = crawled_at or datetime.now()
+        snapshot = df.drop_duplicates('BV号', keep='first').copy()
+        snapshot['爬取时间'] = crawled_at
+
+        path = self._snapshot_path(crawled_at)
+        try:
+            path += '.parquet'
+            snapshot.to_parquet(path, index=False)
+        except ImportError:
+            path = path[:-len('.parquet')] + '.pkl'
+            snapshot.to_pickle(path)
+        snapshot_id = os.path.splitext(os.path.basename(path))[0][len('crawl_'):]
+
+        stamp = crawled_at.isoformat(timespec='seconds')
+        rows = snapshot[['BV号'] + INDEX_METRICS].astype({col: 'int64' for col in INDEX_METRICS})
+        placeholders = ', '.join('?' * (3 + len(INDEX_METRICS)))
+        self._db.execute("INSERT INTO snapshots VALUES (?, ?, ?, ?)",
+                         (snapshot_id, stamp, os.path.relpath(path, self.root), len(snapshot)))
+        self._db.executemany(
+            f"INSERT OR REPLACE INTO videos VALUES ({placeholders})",
+            ((bvid, snapshot_id, stamp, *metrics)
+             for bvid, *metrics in rows.itertuples(index=False, name=None)))
+        self._db.commit()
+        return snapshot_id
+
+    def snapshots(self):
+        """全部快照（按时间排序）"""
+        return pd.read_sql_query("SELECT * FROM snapshots ORDER BY crawled_at", self._db)
+
+    def load(self, snapshot_id=None, columns=None):
+        """
+        读取一个快照（默认最新的）
+
+        参数:
+            snapshot_id: 快照ID
+            columns: 只读取这些列
+        """
+        query = "SELECT path FROM snapshots "
+        if snapshot_id is None:
+            row = self._db.execute(query + "ORDER BY crawled_at DESC LIMIT 1").fetchone()
+        else:
+            row = self._db.execute(query + "WHERE snapshot_id = ?", (snapshot_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"快照不存在: {snapshot_id}")
+        path = os.path.join(self.root, row[0])
+        if path.endswith('.parquet'):
+            return pd.read_parquet(path, columns=columns)
+        df = pd.read_pickle(path)
+        return df[columns] if columns else df
+
+    def load_range(self, start=None, end=None, columns=None):
+        """读取日期范围内（含两端，格式 YYYY-MM-DD）的全部快照并合并"""
+        snapshots = self.snapshots()
+        dates = snapshots['crawled_at'].str[:10]
+        if start:
+            snapshots = snapshots[dates >= start]
+        if end:
+            snapshots = snapshots[dates <= end]
+        frames = [self.load(sid, columns) for sid in snapshots['snapshot_id']]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=columns)
+
+    def history(self, bvid):
+        """一个视频在各快照中的指标（按时间排序，走索引）"""
+        return pd.read_sql_query(
+            "SELECT * FROM videos WHERE bvid = ? ORDER BY crawled_at", self._db,
+            params=(bvid,), parse_dates=['crawled_at'])
+
+    def growth(self, metric='播放量', bvids=None):
+        """
+        视频在首次和最近一次快照之间的增长（只包含出现在至少两个快照中的视频）
+
+        参数:
+            metric: 指标列
+            bvids: 只计算这些视频（默认全部）
+
+        返回:
+            DataFrame: bvid, 首次, 最近, 增量, 小时数, 每小时增长
+        """
+        if metric not in INDEX_METRICS:
+            raise ValueError(f"索引中没有该指标: {metric}（可选: {', '.join(INDEX_METRICS)}）")
+        where, params = '', ()
+        if bvids is not None:
+            bvids = list(bvids)
+            where = f"WHERE bvid IN ({', '.join('?' * len(bvids))})"
+            params = tuple(bvids)
+        query = f"""
+            WITH ranked AS (
+                SELECT bvid, crawled_at, "{metric}" AS value,
+                       ROW_NUMBER() OVER (PARTITION BY bvid ORDER BY crawled_at) AS first_rank,
+                       ROW_NUMBER() OVER (PARTITION BY bvid ORDER BY crawled_at DESC) AS last_rank
+                FROM videos {where}
+            )
+            SELECT f.bvid, f.value AS 首次, l.value AS 最近, l.value - f.value AS 增量,
+                   (julianday(l.crawled_at) - julianday(f.crawled_at)) * 24 AS 小时数
+            FROM ranked f JOIN ranked l ON f.bvid = l.bvid
+            WHERE f.first_rank = 1 AND l.last_rank = 1 AND l.crawled_at > f.crawled_at
+        """
+        result = pd.read_sql_query(query, self._db, params=params)
+        result['每小时增长'] = result['增量'] / result['小时数']
+        return result.sort_values('每小时增长', ascending=False, ignore_index=True)
+
+    def close(self):
+        self._db.close()
@@ -0,0 +1,196 @@
+"""
+B站排行榜API本地桩服务
+在本地提供与 ranking/v2 和 view/detail 接口相同格式的JSON，用于离线测试爬虫
+
+数据来源（按顺序）:
+  1. 录制的响应: <fixtures>/ranking_<rid>.json
+  2. 没有录制文件时，由爬虫保存的 data/bilibili_data.ndjson（或旧的 bilibili_data.json）按排行榜分区还原
+
+视频详情（标签、分P、完整简介）由排行榜中的记录生成，不在排行榜中的 BV号 生成确定的假数据。
+可以按比例返回 429（带 Retry-After），用于测试爬虫的退避和自适应限速
+
+用法:
+    python stub_server.py --port 8765 --delay 0.5 --throttle 0.2
+    BILIBILI_API_URL=http://127.0.0.1:8765/x/web-interface/ranking/v2 python crawler.py
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', 'beat_120_mine_levels_in_one_turn'))
+from ndjson_stream import iter_ndjson
+
+
+RANKING_PATH = '/x/web-interface/ranking/v2'
+DETAIL_PATH = '/x/web-interface/view/detail'
+
+# 分区ID -> 排行榜分区名（与 crawler.py 一致）
+CATEGORY_NAMES = {0: '全站', 1: '动画', 3: '音乐', 4: '游戏', 5: '娱乐'}
+
+
+def _to_api_video(record):
+    """把 crawler 保存的一条记录还原为接口格式"""
+    return {
+        'bvid': record['BV号'],
+        'title': record['标题'],
+        'owner': {'name': record['UP主'], 'mid': record['UP主ID']},
+        'stat': {'view': record['播放量'], 'danmaku': record['弹幕数'], 'like': record['点赞数'],
+                 'coin': record['投币数'], 'favorite': record['收藏数'], 'share': record['分享数']},
+        'duration': record['时长秒'],
+        'pubdate': record['发布时间戳'],
+        'tname': record['分区'],
+        'desc': record['简介'],
+    }
+
+
+def _load_records(data_file):
+    """读取爬虫保存的记录（NDJSON；不存在或为空时尝试同名的旧JSON文件）"""
+    records = []
+    if not data_file.endswith('.json'):
+        if os.path.exists(data_file):
+            records = list(iter_ndjson(data_file))
+        if records:
+            return records
+        data_file = os.path.splitext(data_file)[0] + '.json'
+    if not os.path.exists(data_file):
+        return records
+    with open(data_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _detail_response(bvid, video=None):
+    """生成 view/detail 接口格式的视频详情"""
+    seed = int(hashlib.md5(bvid.encode('utf-8')).hexdigest()[:8], 16)
+    if video is None:
+        video = {'bvid': bvid, 'title': f'视频{bvid}', 'tname': '知识',
+                 'desc': f'{bvid} 的完整简介。' * (1 + seed % 5), 'duration': 60 + seed % 1800}
+    n_pages = 1 + seed % 3
+    durations = [video['duration'] // n_pages] * n_pages
+    durations[-1] += video['duration'] - sum(durations)
+    view = dict(video, pages=[{'cid': seed + i, 'page': i + 1, 'part': f'P{i + 1}', 'duration': d}
+                              for i, d in enumerate(durations)])
+    tags = [{'tag_id': seed % 1000 + i, 'tag_name': name}
+            for i, name in enumerate([video['tname'], f'标签{seed % 50}', f'标签{seed % 7}'])]
+    return {'code': 0, 'message': '0', 'data': {'View': view, 'Tags': tags}}
+
+
+def load_rankings(fixtures_dir='data/fixtures', data_file='data/bilibili_data.ndjson'):
+    """
+    读取各分区的排行榜响应
+
+    返回:
+        {rid: 响应字典}
+    """
+    rankings = {}
+    records = None
+    for rid, name in CATEGORY_NAMES.items():
+        path = os.path.join(fixtures_dir, f'ranking_{rid}.json')
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                rankings[rid] = json.load(f)
+            continue
+        if records is None:
+            records = _load_records(data_file)
+        videos = [_to_api_video(r) for r in records if r.get('排行榜分区') == name]
+        if videos:
+            rankings[rid] = {'code': 0, 'message': '0', 'data': {'list': videos}}
+    return rankings
+
+
+class _Handler(BaseHTTPRequestHandler):
+    rankings = {}
+    videos = {}
+    delay = 0.0
+    throttle = 0.0
+    # 实际返回响应体的请求数（304不计）
+    served = [0]
+    throttled = [0]
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        if url.path not in (RANKING_PATH, DETAIL_PATH):
+            self.send_error(404)
+            return
+        time.sleep(self.delay)
+        if random.random() < self.throttle:
+            self.throttled[0] += 1
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        if url.path == DETAIL_PATH:
+            bvid = query.get('bvid', [''])[0]
+            body = _detail_response(bvid, self.videos.get(bvid))
+        else:
+            rid = int(query.get('rid', ['0'])[0])
+            body = self.rankings.get(rid, {'code': -404, 'message': '分区不存在'})
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        etag = '"' + hashlib.md5(payload).hexdigest() + '"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        self.served[0] += 1
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port=0, delay=0.0, rankings=None, throttle=0.0):
+    """
+    在后台线程启动桩服务
+
+    参数:
+        port: 端口（0表示自动选择）
+        delay: 每个请求的模拟延迟秒数
+        rankings: {rid: 响应字典}（默认 load_rankings()）
+        throttle: 返回 429 的请求比例
+
+    返回:
+        (server, 接口URL)，用 server.shutdown() 停止，
+        server.RequestHandlerClass.served[0] 为返回了响应体的请求数，throttled[0] 为返回 429 的请求数
+    """
+    rankings = rankings if rankings is not None else load_rankings()
+    videos = {video['bvid']: video for ranking in rankings.values()
+              for video in ranking.get('data', {}).get('list', [])}
+    handler = type('Handler', (_Handler,), {'rankings': rankings, 'videos': videos,
+                                            'delay': delay, 'throttle': throttle,
+                                            'served': [0], 'throttled': [0]})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}{RANKING_PATH}'
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='B站排行榜API本地桩服务')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help='每个请求的模拟延迟秒数')
+    parser.add_argument('--fixtures', default='data/fixtures', help='录制的响应目录')
+    parser.add_argument('--throttle', type=float, default=0.0, help='返回 429 的请求比例（0~1）')
+    args = parser.parse_args()
+
+    rankings = load_rankings(args.fixtures)
+    server, url = start_stub_server(args.port, args.delay, rankings, args.throttle)
+    print(f"桩服务已启动: {url}（{len(rankings)} 个分区）")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
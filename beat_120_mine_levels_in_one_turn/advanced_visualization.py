@@ -17,6 +17,16 @@ from scipy import stats
 from datetime import datetime
 import os
 
+from ts_pyramid import TimeSeriesPyramid, nominal_seconds
+from decimation import plot_decimated
+from render_scheduler import RenderScheduler
+import binned_pairplot
+from figure_cache import FigureCache, hash_data
+from scatter_raster import FitStats, density_scatter
+from fused_stats import StreamingStats
+import dist_summary
+from export_profiles import save_figure, export_path
+
 # 设置中文显示
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei']
 plt.rcParams['axes.unicode_minus'] = False
@@ -29,16 +39,26 @@ sns.set_palette("husl")
 class AdvancedVisualizer:
     """高级可视化类"""
     
-    def __init__(self, df, output_dir='./figures/'):
+    def __init__(self, df, output_dir='./figures/', pyramid_dir=None, use_figure_cache=True,
+                 profile=None):
         """
         初始化
         
         参数:
             df: 清洗后的数据DataFrame
             output_dir: 图表输出目录
+            pyramid_dir: 时间聚合金字塔缓存目录（默认在输出目录下的 .pyramid）
+            use_figure_cache: 是否启用图表缓存（输入数据、参数和样式都没变的图表直接跳过）
+            profile: 分布摘要（dist_summary.profile_distributions 的结果或其JSON文件路径，
+                     通常由清洗脚本生成；默认在首次需要时从数据计算）
         """
         self.df = df
         self.output_dir = output_dir
+        self.pyramid_dir = pyramid_dir or os.path.join(output_dir, '.pyramid')
+        self._pyramid = None
+        self._column_hashes = {}
+        self._profile = dist_summary.load_profile(profile) if isinstance(profile, str) else (
+            dict(profile) if profile is not None else None)
         
         # 创建输出目录
         if not os.path.exists(output_dir):
@@ -48,20 +68,108 @@ class AdvancedVisualizer:
         # 获取数值列
         self.numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
         
+        self.figure_cache = FigureCache(os.path.join(output_dir, '.figure_cache')) if use_figure_cache else None
+        
         print(f"数据形状: {df.shape}")
         print(f"数值列数量: {len(self.numeric_cols)}")
     
+    def get_pyramid(self):
+        """
+        获取时间聚合金字塔（每个数据集只构建一次并持久化）
+        
+        返回:
+            TimeSeriesPyramid；数据没有时间索引时返回None
+        """
+        if not isinstance(self.df.index, pd.DatetimeIndex):
+            return None
+        
+        if self._pyramid is None:
+            self._pyramid = TimeSeriesPyramid.load_or_build(
+                self.df, self.pyramid_dir, columns=self.numeric_cols)
+        return self._pyramid
+    
+    def get_profile(self, columns=None):
+        """
+        获取分布摘要（箱线图、小提琴图、直方图都由它绘制，不再读取原始数据）
+        
+        参数:
+            columns: 需要包含的列（默认全部数值列）
+        
+        返回:
+            {列名: DistributionSummary}，只包含 columns 中的列
+        """
+        columns = self.numeric_cols if columns is None else list(columns)
+        if self._profile is None:
+            self._profile = {}
+        missing = [col for col in columns if col not in self._profile]
+        if missing:
+            # 只统计还没有摘要的列，已有的摘要（包括从JSON读入的）保留
+            self._profile.update(dist_summary.profile_distributions(self.df, missing))
+        return {col: self._profile[col] for col in columns}
+    
+    def timeseries_resolution(self, max_points=2000):
+        """
+        时间序列图使用的分辨率：数据点不超过 max_points 时返回None（绘制原始数据），
+        否则返回使曲线不超过 max_points 个点的最细金字塔层级频率
+        """
+        if not isinstance(self.df.index, pd.DatetimeIndex) or len(self.df) <= max_points:
+            return None
+        span = (self.df.index.max() - self.df.index.min()).total_seconds()
+        for freq in ('h', 'D', 'W'):
+            if span / nominal_seconds(freq) <= max_points:
+                return freq
+        return 'MS'
+    
+    def _resample(self, columns, rule, stat='mean'):
+        """
+        按时间重采样，优先从聚合金字塔读取，分辨率比小时更细时回退到原始数据
+        """
+        pyramid = self.get_pyramid()
+        if pyramid is not None and pyramid.choose_level(rule) is not None:
+            return pyramid.query(columns, resolution=rule, stat=stat)
+        return self.df[columns].resample(rule).agg(stat)
+    
+    def _figure_key(self, filename, input_cols, func, **params):
+        """
+        图表缓存键：用到的列的内容哈希 + 绘图参数 + 绘图方法源码 + 样式设置
+        """
+        if self.figure_cache is None:
+            return None
+        for col in input_cols:
+            if col not in self._column_hashes:
+                self._column_hashes[col] = hash_data(self.df[col])
+        data = [[str(col), self._column_hashes[col]] for col in input_cols]
+        return self.figure_cache.make_key(filename, data=data, params=params, func=func)
+    
+    def _figure_cached(self, key, filename):
+        """缓存命中时恢复输出文件并返回True"""
+        path = export_path(f'{self.output_dir}{filename}')
+        if key is None or not self.figure_cache.restore(key, [path]):
+            return False
+        print(f"[SKIP] 未变化，使用缓存: {os.path.basename(path)}")
+        return True
+    
+    def _figure_store(self, key, filename):
+        """把新渲染的图表存入缓存"""
+        if key is not None:
+            self.figure_cache.store(key, [export_path(f'{self.output_dir}{filename}')])
+    
     def plot_bar_with_annotations(self, column, top_n=10):
         """
         图表1: 带数值标注和平均线的柱状图
         """
         print("\n[1/10] 生成带标注的柱状图...")
         
+        key = self._figure_key('01_bar_with_annotations.png', [column], self.plot_bar_with_annotations,
+                               column=column, top_n=top_n)
+        if self._figure_cached(key, '01_bar_with_annotations.png'):
+            return
+        
         fig, ax = plt.subplots(figsize=(12, 6))
         
         # 计算平均值（按天或按小时）
         if isinstance(self.df.index, pd.DatetimeIndex):
-            data = self.df[column].resample('D').mean().dropna().head(top_n)
+            data = self._resample([column], 'D')[column].dropna().head(top_n)
         else:
             data = self.df[column].dropna().head(top_n)
         
@@ -100,9 +208,10 @@ class AdvancedVisualizer:
         ax.grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig(f'{self.output_dir}01_bar_with_annotations.png', dpi=300, bbox_inches='tight')
+        saved = save_figure(f'{self.output_dir}01_bar_with_annotations.png')
         plt.close()
-        print(f"[OK] 保存: 01_bar_with_annotations.png")
+        self._figure_store(key, '01_bar_with_annotations.png')
+        print(f"[OK] 保存: {os.path.basename(saved)}")
     
     def plot_scatter_with_trendline(self, col_x, col_y):
         """
@@ -110,6 +219,11 @@ class AdvancedVisualizer:
         """
         print("\n[2/10] 生成带趋势线的散点图...")
         
+        key = self._figure_key('02_scatter_with_trendline.png', [col_x, col_y], self.plot_scatter_with_trendline,
+                               col_x=col_x, col_y=col_y)
+        if self._figure_cached(key, '02_scatter_with_trendline.png'):
+            return
+        
         fig, ax = plt.subplots(figsize=(10, 8))
         
         # 准备数据（去除缺失值）
@@ -117,27 +231,30 @@ class AdvancedVisualizer:
         x = data[col_x].values
         y = data[col_y].values
         
-        # 绘制散点图
-        scatter = ax.scatter(x, y, alpha=0.6, s=30, c='steelblue', edgecolors='black', linewidth=0.5)
+        # 绘制散点图（点数很多时自动改为像素网格计数图）
+        scatter = density_scatter(ax, x, y, c='steelblue', alpha=0.6, s=30,
+                                  edgecolors='black', linewidth=0.5)
         
-        # 计算并绘制趋势线
-        z = np.polyfit(x, y, 1)
-        p = np.poly1d(z)
-        ax.plot(x, p(x), "r--", linewidth=2, label=f'趋势线: y={z[0]:.4f}x+{z[1]:.4f}')
+        # 由充分统计量拟合趋势线，只需画两个端点
+        fit = FitStats.from_arrays(x, y)
+        slope, intercept = fit.slope_intercept()
+        x_line = np.array([x.min(), x.max()])
+        ax.plot(x_line, slope * x_line + intercept, "r--", linewidth=2,
+                label=f'趋势线: y={slope:.4f}x+{intercept:.4f}')
         
         # 计算统计指标
-        correlation = np.corrcoef(x, y)[0, 1]
+        correlation = fit.correlation()
         r_squared = correlation ** 2
         
         # 添加统计信息框
         stats_text = f'统计信息:\n'
         stats_text += f'相关系数 (r): {correlation:.4f}\n'
         stats_text += f'R²: {r_squared:.4f}\n'
-        stats_text += f'{col_x} 均值: {x.mean():.2f}\n'
-        stats_text += f'{col_y} 均值: {y.mean():.2f}\n'
-        stats_text += f'{col_x} 标准差: {x.std():.2f}\n'
-        stats_text += f'{col_y} 标准差: {y.std():.2f}\n'
-        stats_text += f'样本数: {len(x)}'
+        stats_text += f'{col_x} 均值: {fit.mean_x:.2f}\n'
+        stats_text += f'{col_y} 均值: {fit.mean_y:.2f}\n'
+        stats_text += f'{col_x} 标准差: {fit.std_x():.2f}\n'
+        stats_text += f'{col_y} 标准差: {fit.std_y():.2f}\n'
+        stats_text += f'样本数: {fit.n}'
         
         ax.text(0.05, 0.95, stats_text, transform=ax.transAxes,
                fontsize=10, verticalalignment='top',
@@ -151,30 +268,60 @@ class AdvancedVisualizer:
         ax.grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig(f'{self.output_dir}02_scatter_with_trendline.png', dpi=300, bbox_inches='tight')
+        saved = save_figure(f'{self.output_dir}02_scatter_with_trendline.png')
         plt.close()
-        print(f"[OK] 保存: 02_scatter_with_trendline.png")
+        self._figure_store(key, '02_scatter_with_trendline.png')
+        print(f"[OK] 保存: {os.path.basename(saved)}")
     
-    def plot_timeseries_with_annotations(self, column):
+    def plot_timeseries_with_annotations(self, column, resolution=None):
         """
         图表3: 带关键点标注的时间序列图
+        
+        参数:
+            column: 要绘制的列
+            resolution: 时间分辨率（如 'D'、'W'），指定且数据有时间索引时，
+                        从聚合金字塔读取均值曲线和最小/最大值包络
         """
         print("\n[3/10] 生成带标注的时间序列图...")
         
+        key = self._figure_key('03_timeseries_with_annotations.png', [column], self.plot_timeseries_with_annotations,
+                               column=column, resolution=resolution)
+        if self._figure_cached(key, '03_timeseries_with_annotations.png'):
+            return
+        
         fig, ax = plt.subplots(figsize=(14, 6))
         
-        # 准备数据
-        if isinstance(self.df.index, pd.DatetimeIndex):
-            data = self.df[column].dropna()
+        pyramid = self.get_pyramid() if resolution is not None else None
+        
+        if pyramid is not None and pyramid.choose_level(resolution) is not None:
+            # 从金字塔读取聚合曲线，最大/最小值取自各时间桶的极值，与原始数据一致
+            data = pyramid.query([column], resolution=resolution)[column].dropna()
+            low = pyramid.query([column], resolution=resolution, stat='min')[column].loc[data.index]
+            high = pyramid.query([column], resolution=resolution, stat='max')[column].loc[data.index]
+            
+            ax.plot(data.index, data.values, linewidth=1.5, color='steelblue',
+                    label=f'{column}（{resolution}均值）')
+            ax.fill_between(data.index, low.values, high.values, color='steelblue',
+                            alpha=0.2, label='最小-最大范围')
+            
+            max_idx, max_val = high.idxmax(), high.max()
+            min_idx, min_val = low.idxmin(), low.min()
+            mean_val = pyramid.total([column])[column]
+            std_val = pyramid.total([column], stat='std')[column]
+            n_points = int(pyramid.total([column], stat='count')[column])
         else:
             data = self.df[column].dropna()
-        
-        # 绘制时间序列
-        ax.plot(data.index, data.values, linewidth=1.5, color='steelblue', label=column)
+            
+            # 绘制时间序列（按输出像素抽稀，关键点仍由完整数据计算）
+            plot_decimated(ax, data.index, data.values, linewidth=1.5, color='steelblue', label=column)
+            
+            max_idx, max_val = data.idxmax(), data.max()
+            min_idx, min_val = data.idxmin(), data.min()
+            mean_val = data.mean()
+            std_val = data.std()
+            n_points = len(data)
         
         # 标注最大值
-        max_idx = data.idxmax()
-        max_val = data.max()
         ax.annotate(f'最大值: {max_val:.2f}',
                    xy=(max_idx, max_val),
                    xytext=(10, 20), textcoords='offset points',
@@ -183,8 +330,6 @@ class AdvancedVisualizer:
                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0', color='red', lw=2))
         
         # 标注最小值
-        min_idx = data.idxmin()
-        min_val = data.min()
         ax.annotate(f'最小值: {min_val:.2f}',
                    xy=(min_idx, min_val),
                    xytext=(10, -30), textcoords='offset points',
@@ -193,17 +338,16 @@ class AdvancedVisualizer:
                    arrowprops=dict(arrowstyle='->', connectionstyle='arc3,rad=0', color='green', lw=2))
         
         # 添加平均线
-        mean_val = data.mean()
         ax.axhline(y=mean_val, color='red', linestyle='--', linewidth=2, 
                    label=f'平均值: {mean_val:.2f}')
         
         # 添加统计信息框
         stats_text = f'统计信息:\n'
-        stats_text += f'均值: {data.mean():.2f}\n'
-        stats_text += f'标准差: {data.std():.2f}\n'
+        stats_text += f'均值: {mean_val:.2f}\n'
+        stats_text += f'标准差: {std_val:.2f}\n'
         stats_text += f'最大值: {max_val:.2f}\n'
         stats_text += f'最小值: {min_val:.2f}\n'
-        stats_text += f'数据点数: {len(data)}'
+        stats_text += f'数据点数: {n_points}'
         
         ax.text(0.02, 0.98, stats_text, transform=ax.transAxes,
                fontsize=10, verticalalignment='top',
@@ -218,9 +362,10 @@ class AdvancedVisualizer:
         
         plt.xticks(rotation=45)
         plt.tight_layout()
-        plt.savefig(f'{self.output_dir}03_timeseries_with_annotations.png', dpi=300, bbox_inches='tight')
+        saved = save_figure(f'{self.output_dir}03_timeseries_with_annotations.png')
         plt.close()
-        print(f"[OK] 保存: 03_timeseries_with_annotations.png")
+        self._figure_store(key, '03_timeseries_with_annotations.png')
+        print(f"[OK] 保存: {os.path.basename(saved)}")
     
     def plot_correlation_heatmap(self):
         """
@@ -228,6 +373,10 @@ class AdvancedVisualizer:
         """
         print("\n[4/10] 生成相关性热力图...")
         
+        key = self._figure_key('04_correlation_heatmap.png', self.numeric_cols, self.plot_correlation_heatmap)
+        if self._figure_cached(key, '04_correlation_heatmap.png'):
+            return
+        
         fig, ax = plt.subplots(figsize=(12, 10))
         
         # 计算相关性矩阵
@@ -241,9 +390,10 @@ class AdvancedVisualizer:
         ax.set_title('特征相关性热力图', fontsize=14, fontweight='bold', pad=20)
         
         plt.tight_layout()
-        plt.savefig(f'{self.output_dir}04_correlation_heatmap.png', dpi=300, bbox_inches='tight')
+        saved = save_figure(f'{self.output_dir}04_correlation_heatmap.png')
         plt.close()
-        print(f"[OK] 保存: 04_correlation_heatmap.png")
+        self._figure_store(key, '04_correlation_heatmap.png')
+        print(f"[OK] 保存: {os.path.basename(saved)}")
     
     def plot_boxplot_comparison(self, columns=None):
         """
@@ -254,14 +404,16 @@ class AdvancedVisualizer:
         if columns is None:
             columns = self.numeric_cols[:6]  # 选择前6个数值列
         
-        fig, ax = plt.subplots(figsize=(12, 6))
+        key = self._figure_key('05_boxplot_comparison.png', columns, self.plot_boxplot_comparison,
+                               columns=columns)
+        if self._figure_cached(key, '05_boxplot_comparison.png'):
+            return
         
-        # 准备数据
-        data_to_plot = [self.df[col].dropna().values for col in columns]
+        fig, ax = plt.subplots(figsize=(12, 6))
         
-        # 绘制箱线图
-        bp = ax.boxplot(data_to_plot, labels=columns, patch_artist=True,
-                       notch=True, showmeans=True)
+        # 由分布摘要绘制箱线图（四分位数、须线和异常值样本交给 Axes.bxp）
+        profile = self.get_profile(columns)
+        bp = dist_summary.plot_box(ax, profile, columns)
         
         # 美化箱线图
         colors = plt.cm.Set3(np.linspace(0, 1, len(columns)))
@@ -271,10 +423,7 @@ class AdvancedVisualizer:
         
         # 添加统计信息
         for i, col in enumerate(columns):
-            data = self.df[col].dropna()
-            median = data.median()
-            q1 = data.quantile(0.25)
-            q3 = data.quantile(0.75)
+            median, q1, q3 = profile[col].median, profile[col].q1, profile[col].q3
             
             # 在箱线图上方添加统计信息
             ax.text(i+1, q3, f'Q3:{q3:.1f}', ha='center', va='bottom', fontsize=8)
@@ -289,9 +438,10 @@ class AdvancedVisualizer:
         plt.xticks(rotation=45, ha='right')
         
         plt.tight_layout()
-        plt.savefig(f'{self.output_dir}05_boxplot_comparison.png', dpi=300, bbox_inches='tight')
+        saved = save_figure(f'{self.output_dir}05_boxplot_comparison.png')
         plt.close()
-        print(f"[OK] 保存: 05_boxplot_comparison.png")
+        self._figure_store(key, '05_boxplot_comparison.png')
+        print(f"[OK] 保存: {os.path.basename(saved)}")
     
     def plot_violin_plot(self, columns=None):
         """
@@ -302,26 +452,19 @@ class AdvancedVisualizer:
         if columns is None:
             columns = self.numeric_cols[:4]  # 选择前4个数值列
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
-        # 准备数据（转换为长格式）
-        data_list = []
-        for col in columns:
-            temp_df = pd.DataFrame({
-                'value': self.df[col].dropna().values,
-                'variable': col
-            })
-            data_list.append(temp_df)
+        key = self._figure_key('06_violin_plot.png', columns, self.plot_violin_plot, columns=columns)
+        if self._figure_cached(key, '06_violin_plot.png'):
+            return
         
-        plot_data = pd.concat(data_list, ignore_index=True)
+        fig, ax = plt.subplots(figsize=(12, 6))
         
-        # 绘制小提琴图
-        sns.violinplot(data=plot_data, x='variable', y='value', ax=ax, palette='Set2')
+        # 由分布摘要的分箱密度绘制小提琴图
+        profile = self.get_profile(columns)
+        dist_summary.plot_violin(ax, profile, columns, colors=sns.color_palette('Set2', len(columns)))
         
         # 添加统计信息
         for i, col in enumerate(columns):
-            data = self.df[col].dropna()
-            mean_val = data.mean()
+            mean_val = profile[col].mean
             ax.plot(i, mean_val, 'ro', markersize=8, label='均值' if i == 0 else '')
         
         ax.set_xlabel('特征', fontsize=12, fontweight='bold')
@@ -332,9 +475,10 @@ class AdvancedVisualizer:
         plt.xticks(rotation=45, ha='right')
         
         plt.tight_layout()
-        plt.savefig(f'{self.output_dir}06_violin_plot.png', dpi=300, bbox_inches='tight')
+        saved = save_figure(f'{self.output_dir}06_violin_plot.png')
         plt.close()
-        print(f"[OK] 保存: 06_violin_plot.png")
+        self._figure_store(key, '06_violin_plot.png')
+        print(f"[OK] 保存: {os.path.basename(saved)}")
     
     def plot_stacked_area(self, columns=None, resample='D'):
         """
@@ -349,10 +493,15 @@ class AdvancedVisualizer:
         if columns is None:
             columns = self.numeric_cols[:4]  # 选择前4个数值列
         
+        key = self._figure_key('07_stacked_area.png', columns, self.plot_stacked_area,
+                               columns=columns, resample=resample)
+        if self._figure_cached(key, '07_stacked_area.png'):
+            return
+        
         fig, ax = plt.subplots(figsize=(14, 6))
         
         # 重采样数据
-        data = self.df[columns].resample(resample).mean().dropna()
+        data = self._resample(columns, resample).dropna()
         
         # 绘制堆叠面积图
         ax.stackplot(data.index, *[data[col].values for col in columns],
@@ -366,9 +515,10 @@ class AdvancedVisualizer:
         plt.xticks(rotation=45)
         
         plt.tight_layout()
-        plt.savefig(f'{self.output_dir}07_stacked_area.png', dpi=300, bbox_inches='tight')
+        saved = save_figure(f'{self.output_dir}07_stacked_area.png')
         plt.close()
-        print(f"[OK] 保存: 07_stacked_area.png")
+        self._figure_store(key, '07_stacked_area.png')
+        print(f"[OK] 保存: {os.path.basename(saved)}")
     
     def plot_histogram_with_kde(self, column):
         """
@@ -376,37 +526,40 @@ class AdvancedVisualizer:
         """
         print("\n[8/10] 生成直方图+KDE...")
         
+        key = self._figure_key('08_histogram_kde.png', [column], self.plot_histogram_with_kde, column=column)
+        if self._figure_cached(key, '08_histogram_kde.png'):
+            return
+        
         fig, ax = plt.subplots(figsize=(10, 6))
         
-        data = self.df[column].dropna()
+        summary = self.get_profile([column])[column]
         
-        # 绘制直方图
-        n, bins, patches = ax.hist(data, bins=30, alpha=0.7, color='steelblue', 
-                                   edgecolor='black', density=True, label='直方图')
+        # 绘制直方图（由固定边界的细分直方图合并）
+        dist_summary.plot_histogram(ax, summary, bins=30, density=True, alpha=0.7, color='steelblue',
+                                    edgecolor='black', label='直方图')
         
-        # 绘制KDE曲线
-        from scipy.stats import gaussian_kde
-        kde = gaussian_kde(data)
-        x_range = np.linspace(data.min(), data.max(), 100)
+        # 绘制KDE曲线（细分直方图经FFT核密度估计平滑，只画数据范围内的部分）
+        kde = summary.kde()
+        x_range = np.linspace(summary.min, summary.max, 200)
         ax.plot(x_range, kde(x_range), 'r-', linewidth=2, label='核密度估计')
         
         # 添加均值线
-        mean_val = data.mean()
+        mean_val = summary.mean
         ax.axvline(mean_val, color='green', linestyle='--', linewidth=2, 
                   label=f'均值: {mean_val:.2f}')
         
         # 添加中位数线
-        median_val = data.median()
+        median_val = summary.median
         ax.axvline(median_val, color='orange', linestyle='--', linewidth=2,
                   label=f'中位数: {median_val:.2f}')
         
         # 添加统计信息框
         stats_text = f'统计信息:\n'
-        stats_text += f'均值: {data.mean():.2f}\n'
-        stats_text += f'中位数: {data.median():.2f}\n'
-        stats_text += f'标准差: {data.std():.2f}\n'
-        stats_text += f'偏度: {data.skew():.2f}\n'
-        stats_text += f'峰度: {data.kurtosis():.2f}'
+        stats_text += f'均值: {summary.mean:.2f}\n'
+        stats_text += f'中位数: {summary.median:.2f}\n'
+        stats_text += f'标准差: {summary.std:.2f}\n'
+        stats_text += f'偏度: {summary.skew:.2f}\n'
+        stats_text += f'峰度: {summary.kurt:.2f}'
         
         ax.text(0.98, 0.98, stats_text, transform=ax.transAxes,
                fontsize=10, verticalalignment='top', horizontalalignment='right',
@@ -419,31 +572,45 @@ class AdvancedVisualizer:
         ax.grid(True, alpha=0.3)
         
         plt.tight_layout()
-        plt.savefig(f'{self.output_dir}08_histogram_kde.png', dpi=300, bbox_inches='tight')
+        saved = save_figure(f'{self.output_dir}08_histogram_kde.png')
         plt.close()
-        print(f"[OK] 保存: 08_histogram_kde.png")
+        self._figure_store(key, '08_histogram_kde.png')
+        print(f"[OK] 保存: {os.path.basename(saved)}")
     
-    def plot_pairplot(self, columns=None):
+    def plot_pairplot(self, columns=None, scatter_threshold=5000, bins=60, cmap='viridis'):
         """
         图表9: 成对关系图
+        
+        参数:
+            columns: 要绘制的列（默认前4个数值列）
+            scatter_threshold: 行数不超过该值时画散点，超过时画二维分箱密度
+            bins: 分箱数（分箱计数会缓存，只改样式时不会重新计算）
+            cmap: 密度模式的色图
         """
         print("\n[9/10] 生成成对关系图...")
         
         if columns is None:
             columns = self.numeric_cols[:4]  # 选择前4个数值列
         
-        # 使用seaborn的pairplot
+        key = self._figure_key('09_pairplot.png', columns, self.plot_pairplot,
+                               columns=columns, scatter_threshold=scatter_threshold, bins=bins, cmap=cmap)
+        if self._figure_cached(key, '09_pairplot.png'):
+            return
+        
         data_subset = self.df[columns].dropna()
+        counts = binned_pairplot.load_or_compute(
+            data_subset, bins=bins, cache_dir=os.path.join(self.output_dir, '.pair_bins'))
         
-        g = sns.pairplot(data_subset, diag_kind='kde', plot_kws={'alpha': 0.6, 's': 30},
-                        diag_kws={'linewidth': 2})
+        mode = 'scatter' if len(data_subset) <= scatter_threshold else 'density'
+        fig, axes = binned_pairplot.plot_pairgrid(counts, data=data_subset, mode=mode, cmap=cmap)
         
-        g.fig.suptitle('特征成对关系图', fontsize=14, fontweight='bold', y=1.02)
+        fig.suptitle('特征成对关系图', fontsize=14, fontweight='bold', y=1.02)
         
         plt.tight_layout()
-        plt.savefig(f'{self.output_dir}09_pairplot.png', dpi=300, bbox_inches='tight')
+        saved = save_figure(f'{self.output_dir}09_pairplot.png')
         plt.close()
-        print(f"[OK] 保存: 09_pairplot.png")
+        self._figure_store(key, '09_pairplot.png')
+        print(f"[OK] 保存: {os.path.basename(saved)}")
     
     def plot_radar_chart(self, columns=None):
         """
@@ -454,6 +621,10 @@ class AdvancedVisualizer:
         if columns is None:
             columns = self.numeric_cols[:6]  # 选择前6个数值列
         
+        key = self._figure_key('10_radar_chart.png', columns, self.plot_radar_chart, columns=columns)
+        if self._figure_cached(key, '10_radar_chart.png'):
+            return
+        
         # 计算每列的均值并归一化
         values = []
         for col in columns:
@@ -496,9 +667,10 @@ class AdvancedVisualizer:
         ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1))
         
         plt.tight_layout()
-        plt.savefig(f'{self.output_dir}10_radar_chart.png', dpi=300, bbox_inches='tight')
+        saved = save_figure(f'{self.output_dir}10_radar_chart.png')
         plt.close()
-        print(f"[OK] 保存: 10_radar_chart.png")
+        self._figure_store(key, '10_radar_chart.png')
+        print(f"[OK] 保存: {os.path.basename(saved)}")
     
     def generate_statistics_report(self):
         """
@@ -508,21 +680,8 @@ class AdvancedVisualizer:
         print("生成统计报告...")
         print("="*50)
         
-        # 计算关键统计指标
-        stats_dict = {
-            '计数': self.df[self.numeric_cols].count(),
-            '均值': self.df[self.numeric_cols].mean(),
-            '中位数': self.df[self.numeric_cols].median(),
-            '标准差': self.df[self.numeric_cols].std(),
-            '最小值': self.df[self.numeric_cols].min(),
-            '25%分位数': self.df[self.numeric_cols].quantile(0.25),
-            '75%分位数': self.df[self.numeric_cols].quantile(0.75),
-            '最大值': self.df[self.numeric_cols].max(),
-            '偏度': self.df[self.numeric_cols].skew(),
-            '峰度': self.df[self.numeric_cols].kurtosis()
-        }
-        
-        stats_df = pd.DataFrame(stats_dict).T
+        # 一次扫描计算全部统计指标（分块合并矩，分位数来自可合并的草图）
+        stats_df = StreamingStats.from_dataframe(self.df, self.numeric_cols).to_frame()
         
         # 保存为CSV
         stats_df.to_csv(f'{self.output_dir}statistics_report.csv', encoding='utf-8-sig')
@@ -530,13 +689,18 @@ class AdvancedVisualizer:
         
         # 打印统计报告
         print("\n统计报告预览:")
-        print(stats_df.round(2))
+        preview = stats_df.astype('float64').round(2).astype(object)
+        preview.loc['计数'] = stats_df.loc['计数']
+        print(preview)
         
         return stats_df
     
-    def generate_all_visualizations(self):
+    def generate_all_visualizations(self, workers=None):
         """
         生成所有可视化图表
+        
+        参数:
+            workers: 并行渲染的进程数（默认CPU核数，设为1则顺序渲染）
         """
         print("\n" + "="*60)
         print("开始生成高质量可视化图表")
@@ -550,20 +714,25 @@ class AdvancedVisualizer:
             print("错误: 数值列不足，无法生成可视化")
             return
         
-        # 生成10种图表
-        self.plot_bar_with_annotations(col1)
-        self.plot_scatter_with_trendline(col1, col2)
-        self.plot_timeseries_with_annotations(col1)
-        self.plot_correlation_heatmap()
-        self.plot_boxplot_comparison()
-        self.plot_violin_plot()
-        self.plot_stacked_area()
-        self.plot_histogram_with_kde(col1)
-        self.plot_pairplot()
-        self.plot_radar_chart()
-        
-        # 生成统计报告
-        self.generate_statistics_report()
+        # 生成10种图表（耗时最长的成对关系图和小提琴图排在最前，优先调度）
+        tasks = [
+            ('plot_pairplot', (), {}),
+            ('plot_violin_plot', (), {}),
+            ('plot_scatter_with_trendline', (col1, col2), {}),
+            ('plot_timeseries_with_annotations', (col1,), {'resolution': self.timeseries_resolution()}),
+            ('plot_histogram_with_kde', (col1,), {}),
+            ('plot_correlation_heatmap', (), {}),
+            ('plot_boxplot_comparison', (), {}),
+            ('plot_stacked_area', (), {}),
+            ('plot_bar_with_annotations', (col1,), {}),
+            ('plot_radar_chart', (), {}),
+        ]
+        try:
+            # 有图表失败时抛出 RenderError（统计报告照常生成），脚本以非零状态退出
+            RenderScheduler(self, workers=workers).run(tasks)
+        finally:
+            # 生成统计报告
+            self.generate_statistics_report()
         
         print("\n" + "="*60)
         print("✅ 所有可视化图表生成完成！")
@@ -0,0 +1,248 @@
+"""
+图表注册表与按需渲染
+Chart Registry with Selective, Dependency-aware Rendering
+
+功能：
+1. 图表注册为函数，声明自己用到的数据列和派生表
+2. 派生表（分组统计、Top N 等）也注册为函数，每次运行最多计算一次，
+   只有真正需要重新渲染的图表才会触发计算
+3. 只渲染选中的图表，读取数据时只读这些图表（及其派生表）需要的列
+4. 与图表缓存（figure_cache）配合，数据列、派生表代码、绘图代码都没变的图表直接使用缓存
+5. run_cli() 提供统一的命令行：列出图表、按编号或名称选择图表、关闭缓存
+6. 派生表也可以由外部提供（例如按数据快照持久化的表），此时只读取图表直接用到的列
+
+用法:
+    registry = ChartRegistry()
+
+    @registry.table('top_videos', columns=['播放量', '标题'])
+    def top_videos(df):
+        return df.nlargest(20, '播放量')
+
+    @registry.chart('01_播放量分析.png', columns=['播放量'], tables=['top_videos'])
+    def plot_views(df, tables):
+        top = tables['top_videos']
+        ...
+
+    run_cli(registry, lambda usecols: pd.read_csv(path, usecols=usecols))
+
+    python visualize_2d.py 08            # 只渲染编号以08开头的图表
+    python visualize_2d.py --list        # 列出全部图表
+"""
+
+import argparse
+import inspect
+import os
+
+import pandas as pd
+
+from figure_cache import FigureCache, render_cached
+from export_profiles import export_path, print_export_report
+
+
+class _Entry:
+    """注册的图表或派生表"""
+
+    def __init__(self, name, func, columns, tables):
+        self.name = name
+        self.func = func
+        self.columns = list(columns)
+        self.tables = list(tables)
+
+
+class TableStore:
+    """派生表的惰性计算与复用（按需计算，每张表只算一次）"""
+
+    def __init__(self, registry, df):
+        self.registry = registry
+        self.df = df
+        self._tables = {}
+        self.computed = []
+
+    def __getitem__(self, name):
+        if name not in self._tables:
+            entry = self.registry.tables[name]
+            for dependency in entry.tables:
+                self[dependency]
+            if entry.tables:
+                self._tables[name] = entry.func(self.df, self)
+            else:
+                self._tables[name] = entry.func(self.df)
+            self.computed.append(name)
+        return self._tables[name]
+
+    def __contains__(self, name):
+        return name in self.registry.tables
+
+    def signature(self, name):
+        """派生表的签名（计算代码，数据本身由图表的数据列体现）"""
+        return inspect.getsource(self.registry.tables[name].func)
+
+
+class ChartRegistry:
+    """图表注册表"""
+
+    def __init__(self, output_dir='visualizations'):
+        """
+        参数:
+            output_dir: 图表输出目录
+        """
+        self.output_dir = output_dir
+        self.charts = {}
+        self.tables = {}
+
+    def table(self, name, columns=(), tables=()):
+        """
+        注册派生表的装饰器
+
+        参数:
+            name: 表名
+            columns: 计算该表需要的数据列
+            tables: 依赖的其他派生表（有依赖时函数签名为 func(df, tables)）
+        """
+        def decorator(func):
+            self.tables[name] = _Entry(name, func, columns, tables)
+            return func
+        return decorator
+
+    def chart(self, filename, columns=(), tables=()):
+        """
+        注册图表的装饰器，图表函数签名为 func(df, tables)
+
+        参数:
+            filename: 输出文件名（去掉扩展名即图表名，例如 08_三维曲面图）
+            columns: 图表直接用到的数据列
+            tables: 图表用到的派生表
+        """
+        def decorator(func):
+            name = os.path.splitext(filename)[0]
+            entry = _Entry(name, func, columns, tables)
+            entry.filename = filename
+            self.charts[name] = entry
+            return func
+        return decorator
+
+    def select(self, patterns=None):
+        """
+        按名称选择图表（名称、编号前缀或名称片段均可；为空时选择全部）
+
+        返回:
+            按注册顺序排列的图表名列表
+        """
+        if not patterns:
+            return list(self.charts)
+        selected = [name for name in self.charts
+                    if any(name == p or name.startswith(p) or p in name for p in patterns)]
+        if not selected:
+            raise KeyError(f"没有匹配的图表: {', '.join(patterns)}（可选: {', '.join(self.charts)}）")
+        return selected
+
+    def _table_closure(self, names):
+        """派生表及其依赖（按依赖顺序）"""
+        ordered = []
+
+        def visit(name):
+            if name not in self.tables:
+                raise KeyError(f"未注册的派生表: {name}")
+            if name in ordered:
+                return
+            for dependency in self.tables[name].tables:
+                visit(dependency)
+            ordered.append(name)
+
+        for name in names:
+            visit(name)
+        return ordered
+
+    def chart_columns(self, name, include_tables=True):
+        """图表需要的数据列（include_tables 为真时包括其派生表需要的列）"""
+        entry = self.charts[name]
+        columns = list(entry.columns)
+        if include_tables:
+            for table in self._table_closure(entry.tables):
+                columns += self.tables[table].columns
+        return list(dict.fromkeys(columns))
+
+    def required_columns(self, names=None, include_tables=True):
+        """渲染这些图表需要读取的数据列"""
+        columns = []
+        for name in names or self.charts:
+            columns += self.chart_columns(name, include_tables)
+        return list(dict.fromkeys(columns))
+
+    def render(self, df, names=None, cache=None, tables=None):
+        """
+        渲染选中的图表
+
+        参数:
+            df: 数据（至少包含 required_columns(names) 的列）
+            names: 图表名列表（默认全部）
+            cache: FigureCache（None 表示不使用缓存）
+            tables: 外部提供的派生表（需支持 tables[name] 和 tables.signature(name)），
+                    此时 df 只需包含图表直接用到的列；默认由注册的函数在 df 上惰性计算
+
+        返回:
+            {图表名: True 重新渲染 / False 使用缓存}
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        external = tables is not None
+        if not external:
+            tables = TableStore(self, df)
+
+        results = {}
+        for name in names or self.charts:
+            entry = self.charts[name]
+            output = export_path(os.path.join(self.output_dir, entry.filename))
+            # 派生表的签名也参与缓存键
+            signatures = [tables.signature(t) for t in self._table_closure(entry.tables)]
+            results[name] = render_cached(cache, [output], entry.func, df, tables,
+                                          data=df[self.chart_columns(name, not external)],
+                                          params={'tables': signatures})
+            if not results[name]:
+                print(f"\n  √ 未变化，使用缓存: {output}")
+        return results
+
+    def print_list(self):
+        """列出全部图表及其依赖"""
+        for name, entry in self.charts.items():
+            needs = f"  派生表: {', '.join(entry.tables)}" if entry.tables else ''
+            print(f"  {name:20s} 列: {', '.join(self.chart_columns(name))}{needs}")
+
+
+def run_cli(registry, load, argv=None, description=None, tables=None):
+    """
+    图表脚本的命令行入口
+
+    参数:
+        registry: ChartRegistry
+        load: 读取数据的函数 load(usecols) -> DataFrame（失败时返回None）
+        argv: 命令行参数（默认 sys.argv[1:]）
+        description: 帮助信息
+        tables: 外部提供的派生表（见 ChartRegistry.render）
+
+    返回:
+        render() 的结果；数据读取失败时返回 None
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument('charts', nargs='*', help='要渲染的图表（编号、名称或名称片段，默认全部）')
+    parser.add_argument('--list', action='store_true', help='列出全部图表')
+    parser.add_argument('--no-cache', action='store_true', help='不使用图表缓存，全部重新渲染')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        registry.print_list()
+        return {}
+
+    try:
+        names = registry.select(args.charts)
+    except KeyError as e:
+        parser.error(e.args[0])
+    columns = registry.required_columns(names, include_tables=tables is None)
+    # 选中的图表只用派生表时不必读取数据
+    df = load(columns) if columns else pd.DataFrame()
+    if df is None:
+        return None
+
+    cache = None if args.no_cache else FigureCache(os.path.join(registry.output_dir, '.figure_cache'))
+    results = registry.render(df, names, cache=cache, tables=tables)
+    print_export_report()
+    return results
@@ -0,0 +1,434 @@
+"""
+异步爬取引擎
+Asyncio Crawl Engine
+
+功能：
+1. 连接池复用的HTTP客户端（requests.Session + HTTPAdapter，保持长连接）
+2. 按主机的令牌桶限速，代替固定的 time.sleep：
+   rate 为每秒请求数，burst 为允许的突发请求数
+3. 在 asyncio 中并发发出请求（阻塞的请求放在线程池中执行），并发数受连接池大小限制
+4. 统计请求数（每次尝试都计入）、失败数、字节数、吞吐量和延迟分位数（summary() 生成一行摘要）
+5. 可选的磁盘响应缓存（http_cache.HttpCache）：TTL内的命中不发请求、也不占用限速令牌
+6. AIMD自适应：请求成功且延迟正常时逐步提高并发上限和请求速率，
+   只有限流（429/503 或带 Retry-After 的响应）和延迟过高时减半（rate 是速率上限，不会超过）
+7. 412/429/5xx、超时和连接重置按带随机抖动的指数退避重试，服务器给出 Retry-After 时按其等待；
+   连接被拒绝（服务不可达）直接失败，不重试也不降速
+8. FetchScheduler：在后台事件循环中运行引擎，供同步代码调用；
+   get_many 并发发出一组事先已知的请求（如分页），结果按输入顺序返回
+
+用法:
+    async def main():
+        async with AsyncCrawlEngine(rate=1.0, burst=3) as engine:
+            pages = await asyncio.gather(*(engine.fetch_json(url, params={'rid': rid})
+                                           for rid in rids))
+    asyncio.run(main())
+
+    with FetchScheduler(rate=2.0, headers=headers) as scheduler:
+        html = scheduler.get(url).text
+        pages = scheduler.get_many([url] * 10, params=[{'start': i * 25} for i in range(10)])
+        print(scheduler.summary())
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+from functools import partial
+from urllib.parse import urlsplit
+
+import numpy as np
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+
+class TokenBucket:
+    """令牌桶限速器（asyncio）"""
+
+    def __init__(self, rate, burst=1):
+        """
+        参数:
+            rate: 每秒补充的令牌数（即平均每秒请求数）
+            burst: 桶容量（允许的突发请求数）
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """取一个令牌，没有令牌时等待"""
+        async with self._lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+
+# 需要退避重试的状态码（412 是B站风控的返回）
+RETRY_STATUSES = (412, 429, 500, 502, 503, 504)
+# 其中视为限流、需要降低并发和速率的状态码（带 Retry-After 的响应也算）
+THROTTLE_STATUSES = (429, 503)
+
+
+def retry_after_seconds(response):
+    """解析 Retry-After 响应头（秒数或HTTP日期），没有时返回 None"""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def is_throttled(response):
+    """响应是否表示限流（429/503 或带 Retry-After 头）"""
+    return response.status_code in THROTTLE_STATUSES or retry_after_seconds(response) is not None
+
+
+def is_connection_refused(error):
+    """连接错误是否为连接被拒绝或主机无法解析（服务不可达，重试无意义）"""
+    if isinstance(error, requests.Timeout):
+        return False
+    reason = error.args[0] if error.args else None
+    reason = getattr(reason, 'reason', reason)
+    return isinstance(reason, NewConnectionError)
+
+
+class AIMDController:
+    """加性增、乘性减（AIMD）的并发上限"""
+
+    def __init__(self, initial=2, minimum=1, maximum=8, increase=1.0, decrease=0.5, cooldown=1.0):
+        """
+        参数:
+            initial: 初始并发上限
+            minimum / maximum: 并发上限的范围
+            increase: 每个"窗口"（约 limit 个成功请求）增加的并发数
+            decrease: 过载时的乘数
+            cooldown: 两次减小之间的最短间隔秒数（同一批失败只减一次）
+        """
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.increase = increase
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self._last_decrease = float('-inf')
+
+    def on_success(self):
+        """请求成功且延迟正常"""
+        self.limit = min(self.maximum, self.limit + self.increase / self.limit)
+
+    def on_overload(self):
+        """
+        限流或延迟过高
+
+        返回:
+            是否实际减小了（冷却期内不重复减小）
+        """
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return False
+        self._last_decrease = now
+        self.limit = max(self.minimum, self.limit * self.decrease)
+        return True
+
+
+class AsyncCrawlEngine:
+    """异步爬取引擎"""
+
+    def __init__(self, rate=1.0, burst=1, max_connections=8, headers=None, timeout=10, cache=None,
+                 max_retries=4, backoff_base=0.5, backoff_cap=30.0, latency_target=2.0, min_rate=0.1,
+                 initial_concurrency=2):
+        """
+        参数:
+            rate: 每个主机每秒请求数的上限
+            burst: 每个主机允许的突发请求数
+            max_connections: 连接池大小（也是并发上限的最大值）
+            headers: 默认请求头
+            timeout: 请求超时秒数
+            cache: HttpCache（None 表示不缓存）
+            max_retries: 限流、服务器错误、超时和连接重置的最多重试次数
+            backoff_base / backoff_cap: 第 n 次重试等待 0 ~ min(cap, base × 2^n) 秒的随机时间
+            latency_target: 延迟超过该秒数时降低并发和速率
+            min_rate: 降速时的最低每秒请求数
+            initial_concurrency: 初始并发上限（之后按AIMD调整，不超过 max_connections）
+        """
+        self.cache = cache
+        self.rate = rate
+        self.burst = burst
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.min_rate = min(min_rate, rate)
+        self.latency_target = latency_target
+        self.controller = AIMDController(initial=min(initial_concurrency, max_connections),
+                                        maximum=max_connections)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+        self._executor = ThreadPoolExecutor(max_workers=max_connections)
+        self._slots = None
+        self._in_flight = 0
+        self._buckets = {}
+        self.stats = {'requests': 0, 'bytes': 0, 'seconds': 0.0, 'retries': 0, 'throttled': 0, 'failures': 0}
+        self._latencies = deque(maxlen=1000)
+        self._started = None
+
+    def _bucket(self, url):
+        host = urlsplit(url).netloc
+        if host not in self._buckets:
+            self._buckets[host] = TokenBucket(self.rate, self.burst)
+        return self._buckets[host]
+
+    def set_rate(self, rate):
+        """修改每个主机的速率上限（已有主机的当前速率不超过新上限）"""
+        self.rate = rate
+        self.min_rate = min(self.min_rate, rate)
+        for bucket in self._buckets.values():
+            bucket.rate = min(bucket.rate, rate)
+
+    async def _acquire_slot(self):
+        """等待在途请求数低于当前并发上限"""
+        if self._slots is None:
+            self._slots = asyncio.Condition()
+        async with self._slots:
+            await self._slots.wait_for(lambda: self._in_flight < int(self.controller.limit))
+            self._in_flight += 1
+
+    async def _release_slot(self):
+        async with self._slots:
+            self._in_flight -= 1
+            self._slots.notify_all()
+
+    def _slow_down(self, bucket):
+        if self.controller.on_overload():
+            bucket.rate = max(self.min_rate, bucket.rate * self.controller.decrease)
+
+    def _on_success(self, bucket, latency):
+        if latency > self.latency_target:
+            self._slow_down(bucket)
+            return
+        self.controller.on_success()
+        # 速率每个窗口恢复上限的 1/10
+        bucket.rate = min(self.rate, bucket.rate + self.rate / 10 / self.controller.limit)
+
+    def _on_overload(self, bucket):
+        self.stats['throttled'] += 1
+        self._slow_down(bucket)
+
+    def _backoff(self, attempt, response=None):
+        """第 attempt 次重试前的等待秒数（full jitter；有 Retry-After 时不少于它）"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        retry_after = retry_after_seconds(response) if response is not None else None
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_cap))
+        return delay
+
+    async def _send(self, url, params, headers):
+        """发出一次请求（限速 + 并发上限），返回 (响应, 延迟秒数)"""
+        bucket = self._bucket(url)
+        await bucket.acquire()
+        await self._acquire_slot()
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        if self._started is None:
+            self._started = start
+        self.stats['requests'] += 1
+        try:
+            response = await loop.run_in_executor(
+                self._executor,
+                partial(self.session.get, url, params=params, headers=headers, timeout=self.timeout))
+            latency = time.perf_counter() - start
+        finally:
+            self.stats['seconds'] += time.perf_counter() - start
+            await self._release_slot()
+        self.stats['bytes'] += len(response.content)
+        self._latencies.append(latency)
+        return response, latency
+
+    async def fetch(self, url, params=None, headers=None):
+        """
+        限速后发出GET请求，限流、服务器错误、超时和连接重置时退避重试
+
+        只有限流响应会降低并发和速率；连接被拒绝时直接抛出异常
+
+        返回:
+            requests.Response（已检查状态码）
+        """
+        entry = None
+        if self.cache is not None:
+            key, entry, fresh = self.cache.lookup(url, params)
+            if entry is not None and (fresh or self.cache.offline):
+                return self.cache.hit(entry)
+            if self.cache.offline:
+                self.cache.miss(key)
+            headers = dict(headers or {}, **self.cache.conditional_headers(entry))
+
+        bucket = self._bucket(url)
+        for attempt in range(self.max_retries + 1):
+            try:
+                response, latency = await self._send(url, params, headers)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self.stats['failures'] += 1
+                if attempt == self.max_retries or is_connection_refused(e):
+                    raise
+                self.stats['retries'] += 1
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+            if response.status_code not in RETRY_STATUSES:
+                self._on_success(bucket, latency)
+                break
+            self.stats['failures'] += 1
+            if is_throttled(response):
+                self._on_overload(bucket)
+            if attempt == self.max_retries:
+                break
+            self.stats['retries'] += 1
+            await asyncio.sleep(self._backoff(attempt, response))
+
+        if self.cache is not None:
+            response = self.cache.resolve(key, entry, response)
+        response.raise_for_status()
+        return response
+
+    async def fetch_json(self, url, params=None, headers=None):
+        """限速后发出GET请求并解析JSON"""
+        response = await self.fetch(url, params=params, headers=headers)
+        return response.json()
+
+    async def fetch_many(self, urls, params=None, headers=None):
+        """
+        并发发出一组GET请求
+
+        参数:
+            urls: URL列表
+            params: 与 urls 等长的查询参数列表（None 表示都没有）
+
+        返回:
+            按输入顺序的列表：成功为 requests.Response，失败为 requests.RequestException
+        """
+        params = params if params is not None else [None] * len(urls)
+        results = await asyncio.gather(*(self.fetch(url, params=p, headers=headers)
+                                         for url, p in zip(urls, params)),
+                                       return_exceptions=True)
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, requests.RequestException):
+                raise result
+        return results
+
+    def metrics(self):
+        """
+        吞吐量和延迟指标
+
+        返回:
+            字典: requests（含失败和重试的全部尝试）, throughput（次/秒）, latency_p50, latency_p95（秒）,
+                  retries, throttled, failures（连接错误、超时和需重试的状态码）, concurrency（当前并发上限）, rate（当前最低的主机速率）
+        """
+        latencies = np.array(self._latencies) if self._latencies else np.zeros(1)
+        elapsed = time.perf_counter() - self._started if self._started is not None else 0.0
+        rates = [bucket.rate for bucket in self._buckets.values()] or [self.rate]
+        return {
+            'requests': self.stats['requests'],
+            'throughput': self.stats['requests'] / elapsed if elapsed > 0 else 0.0,
+            'latency_p50': float(np.percentile(latencies, 50)),
+            'latency_p95': float(np.percentile(latencies, 95)),
+            'retries': self.stats['retries'],
+            'throttled': self.stats['throttled'],
+            'failures': self.stats['failures'],
+            'concurrency': self.controller.limit,
+            'rate': min(rates),
+        }
+
+    def summary(self):
+        m = self.metrics()
+        return (f"请求: {m['requests']} | 失败 {m['failures']} | 吞吐 {m['throughput']:.2f} 次/秒 | "
+                f"延迟 p50 {m['latency_p50']:.2f}s p95 {m['latency_p95']:.2f}s | "
+                f"重试 {m['retries']} | 限流 {m['throttled']} | 并发上限 {m['concurrency']:.1f} | "
+                f"速率 {m['rate']:.2f} 次/秒")
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+class FetchScheduler:
+    """同步抓取调度器：在后台线程的事件循环中运行 AsyncCrawlEngine"""
+
+    def __init__(self, **engine_kwargs):
+        """
+        参数:
+            engine_kwargs: 传给 AsyncCrawlEngine 的参数（rate、headers、max_connections 等）
+        """
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self.engine = AsyncCrawlEngine(**engine_kwargs)
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def get(self, url, params=None, headers=None):
+        """
+        发出GET请求（限速、自适应并发、退避重试）
+
+        返回:
+            requests.Response（已检查状态码，失败时抛出 requests.RequestException）
+        """
+        return self._run(self.engine.fetch(url, params=params, headers=headers))
+
+    def get_many(self, urls, params=None, headers=None):
+        """
+        并发发出一组GET请求（限速和并发上限与 get 相同）
+
+        并发上限和限速允许时，总耗时接近最慢的一个请求而不是各请求之和
+
+        返回:
+            按输入顺序的列表：成功为 requests.Response，失败为 requests.RequestException
+        """
+        return self._run(self.engine.fetch_many(urls, params=params, headers=headers))
+
+    def metrics(self):
+        return self.engine.metrics()
+
+    def summary(self):
+        return self.engine.summary()
+
+    def close(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self.engine.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
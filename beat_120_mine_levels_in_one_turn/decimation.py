@@ -0,0 +1,186 @@
+"""
+按像素抽稀折线数据
+Pixel-aware Line Decimation
+
+功能：
+1. 按输出像素宽度计算点数预算（默认每像素约2个点）
+2. min/max 分桶抽稀：每个像素桶保留最小值和最大值，峰谷不会丢失
+3. LTTB（Largest-Triangle-Three-Buckets）抽稀：保留曲线形状
+4. 支持只抽稀可见范围（局部放大子图）
+
+注意: 最大值、最小值等标注应始终用完整数据计算，这里只负责减少绘制的点数
+"""
+
+import numpy as np
+
+from export_profiles import get_export_profile
+
+
+def _as_float(values):
+    """把数值或datetime64数组转换为float，便于计算桶位置"""
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype('datetime64[ns]').astype('int64').astype('float64')
+    return values.astype('float64')
+
+
+def axes_pixel_size(ax, dpi=None):
+    """
+    子图在输出图片中的像素尺寸 (宽, 高)
+
+    参数:
+        ax: matplotlib子图（支持 inset_axes 创建的局部放大子图）
+        dpi: 保存图片时使用的dpi（默认取当前导出配置的dpi）
+    """
+    if dpi is None:
+        dpi = get_export_profile()[1]['dpi']
+    fig = ax.figure
+    bbox = ax.get_position()
+
+    # inset_axes 的实际位置由定位器决定
+    locator = ax.get_axes_locator()
+    if locator is not None:
+        try:
+            bbox = locator(ax, fig.canvas.get_renderer())
+        except Exception:
+            pass
+
+    width = max(1, int(round(bbox.width * fig.get_figwidth() * dpi)))
+    height = max(1, int(round(bbox.height * fig.get_figheight() * dpi)))
+    return width, height
+
+
+def axes_pixel_width(ax, dpi=None):
+    """子图在输出图片中的像素宽度"""
+    return axes_pixel_size(ax, dpi)[0]
+
+
+def minmax_indices(x, y, n_buckets):
+    """
+    min/max 分桶抽稀，返回保留点的下标（按原顺序）
+
+    参数:
+        x, y: 数据（x需要可转换为数值，如datetime64）
+        n_buckets: 桶数（通常等于像素宽度）
+    """
+    xf = _as_float(x)
+    y = np.asarray(y, dtype='float64')
+    valid = np.flatnonzero(np.isfinite(xf) & np.isfinite(y))
+    n = len(valid)
+
+    if n <= 2 * n_buckets or n_buckets < 1:
+        return valid
+
+    xv, yv = xf[valid], y[valid]
+    x_min, x_max = xv.min(), xv.max()
+    span = x_max - x_min
+    if span == 0:
+        bucket = np.zeros(n, dtype=np.int64)
+    else:
+        bucket = ((xv - x_min) / span * n_buckets).astype(np.int64)
+        bucket = np.minimum(bucket, n_buckets - 1)
+
+    # 桶内按y排序后，每个桶的第一个是最小值，最后一个是最大值
+    order = np.lexsort((yv, bucket))
+    b_sorted = bucket[order]
+    starts = np.flatnonzero(np.r_[True, b_sorted[1:] != b_sorted[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    keep = np.union1d(order[starts], order[ends])
+    keep = np.union1d(keep, [0, n - 1])
+    return valid[keep]
+
+
+def lttb_indices(x, y, n_out):
+    """
+    LTTB 抽稀，返回保留点的下标（按原顺序，要求x已排序）
+
+    参数:
+        x, y: 数据
+        n_out: 输出点数
+    """
+    xf = _as_float(x)
+    y = np.asarray(y, dtype='float64')
+    valid = np.flatnonzero(np.isfinite(xf) & np.isfinite(y))
+    n = len(valid)
+
+    if n_out >= n or n_out < 3:
+        return valid
+
+    xv, yv = xf[valid], y[valid]
+
+    # 首尾点固定，中间 n_out-2 个桶
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo = edges[i + 1]
+        next_hi = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = xv[next_lo:next_hi].mean()
+        avg_y = yv[next_lo:next_hi].mean()
+
+        # 与上一个选中点、下一桶均值构成的三角形面积最大的点
+        area = np.abs((xv[a] - avg_x) * (yv[lo:hi] - yv[a])
+                      - (xv[a] - xv[lo:hi]) * (avg_y - yv[a]))
+        a = lo + int(np.argmax(area))
+        keep[i + 1] = a
+
+    return valid[keep]
+
+
+def decimate(x, y, n_out=None, ax=None, dpi=None, points_per_pixel=2,
+             method='minmax', xlim=None):
+    """
+    抽稀折线数据
+
+    参数:
+        x, y: 数据（x需已排序）
+        n_out: 输出点数上限；不指定时按 ax 的像素宽度 × points_per_pixel 计算
+        ax: 目标子图
+        dpi: 保存图片时使用的dpi（默认取当前导出配置的dpi）
+        points_per_pixel: 每个像素保留的点数
+        method: 'minmax' 或 'lttb'
+        xlim: 只保留可见范围 (x1, x2) 内的数据（两侧各多留一个点，保证线条连到边界）
+
+    返回:
+        (x_decimated, y_decimated)
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+
+    if xlim is not None:
+        xf = _as_float(x)
+        lo, hi = _as_float(np.asarray(xlim, dtype=x.dtype))
+        inside = np.flatnonzero((xf >= lo) & (xf <= hi))
+        if len(inside) > 0:
+            sel = slice(max(inside[0] - 1, 0), min(inside[-1] + 2, len(x)))
+            x, y = x[sel], y[sel]
+
+    if n_out is None:
+        if ax is None:
+            raise ValueError("需要指定 n_out 或 ax")
+        n_out = axes_pixel_width(ax, dpi) * points_per_pixel
+
+    if method == 'minmax':
+        idx = minmax_indices(x, y, max(1, n_out // 2))
+    elif method == 'lttb':
+        idx = lttb_indices(x, y, n_out)
+    else:
+        raise ValueError(f"未知的抽稀方法: {method}")
+
+    return x[idx], y[idx]
+
+
+def plot_decimated(ax, x, y, *args, dpi=None, points_per_pixel=2, method='minmax',
+                   xlim=None, **kwargs):
+    """
+    ax.plot 的替代：按子图像素宽度抽稀后再绘制
+
+    参数与 ax.plot 相同，额外参数见 decimate()
+    """
+    x_dec, y_dec = decimate(x, y, ax=ax, dpi=dpi, points_per_pixel=points_per_pixel,
+                            method=method, xlim=xlim)
+    return ax.plot(x_dec, y_dec, *args, **kwargs)
@@ -0,0 +1,271 @@
+"""
+分布摘要与基于摘要的分布图
+Distribution Summaries and Summary-driven Distribution Plots
+
+功能：
+1. 分块扫描数据两遍，得到每列的分布摘要：
+   - 第一遍: 计数、矩、最值和四分位数（fused_stats.StreamingStats）
+   - 第二遍: 固定边界的细分直方图、须线端点、异常值计数和异常值样本
+2. 箱线图直接把四分位数、须线和异常值样本交给 Axes.bxp
+3. 小提琴图和KDE曲线由细分直方图经 density.FFTKDE 平滑得到（与 fft_kde 相同的核和带宽规则）
+4. 直方图由细分直方图合并得到，分箱数可以任意指定
+5. 摘要可保存为JSON，清洗脚本生成一次，之后重新画图不必再读数据
+
+数据源可以是DataFrame，也可以是返回分块迭代器的函数（例如
+lambda: pd.read_csv(path, chunksize=10**6)），因此可以处理比内存大的数据集
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+from density import FFTKDE
+from fused_stats import StreamingStats
+
+
+# 细分直方图的箱数（能被10、12、15、20、24、30、40、60等整除）
+FINE_BINS = 240
+
+
+class DistributionSummary:
+    """单列的分布摘要"""
+
+    FIELDS = ['name', 'n', 'mean', 'std', 'min', 'max', 'q1', 'median', 'q3', 'skew', 'kurt',
+              'whislo', 'whishi', 'n_outliers', 'fliers', 'edges', 'counts']
+
+    def __init__(self, **fields):
+        for field in self.FIELDS:
+            setattr(self, field, fields.get(field))
+        self.fliers = np.asarray(self.fliers if self.fliers is not None else [], dtype='float64')
+        self.edges = np.asarray(self.edges if self.edges is not None else [], dtype='float64')
+        self.counts = np.asarray(self.counts if self.counts is not None else [], dtype='float64')
+
+    def to_dict(self):
+        data = {field: getattr(self, field) for field in self.FIELDS}
+        for field in ('fliers', 'edges', 'counts'):
+            data[field] = data[field].tolist()
+        return data
+
+    def bxp_stats(self, label=None):
+        """Axes.bxp 需要的统计量字典"""
+        iqr = self.q3 - self.q1
+        notch = 1.57 * iqr / np.sqrt(self.n) if self.n else 0.0
+        return {
+            'label': self.name if label is None else label,
+            'mean': self.mean,
+            'med': self.median,
+            'q1': self.q1,
+            'q3': self.q3,
+            'cilo': self.median - notch,
+            'cihi': self.median + notch,
+            'whislo': self.whislo,
+            'whishi': self.whishi,
+            'fliers': self.fliers,
+        }
+
+    def histogram(self, bins=30, density=False):
+        """
+        由细分直方图得到等宽直方图
+
+        返回:
+            (边界, 计数或密度)
+        """
+        edges = np.linspace(self.edges[0], self.edges[-1], bins + 1)
+        if (len(self.counts) % bins) == 0:
+            counts = self.counts.reshape(bins, -1).sum(axis=1)
+        else:
+            # 箱数不整除时按累积分布线性插值
+            cumulative = np.concatenate([[0.0], np.cumsum(self.counts)])
+            counts = np.diff(np.interp(edges, self.edges, cumulative))
+        if density:
+            total = counts.sum()
+            counts = counts / (total * np.diff(edges)) if total else counts
+        return edges, counts
+
+    def kde(self, bw_method=None, cut=3.0):
+        """
+        由细分直方图构造的核密度估计（density.FFTKDE，用摘要中的精确标准差定带宽）
+
+        参数:
+            bw_method: 'scott'（默认）、'silverman' 或带宽因子
+            cut: 密度网格在数据范围外延伸的带宽倍数
+
+        返回:
+            FFTKDE（kde(points) 求值，kde.grids[0] / kde.density 为网格上的密度）
+        """
+        return FFTKDE.from_histogram(self.edges, self.counts, std=self.std,
+                                     bw_method=bw_method, cut=cut)
+
+
+def _as_chunks(source, chunksize):
+    """把数据源统一成分块迭代器"""
+    if isinstance(source, pd.DataFrame):
+        return (source.iloc[i:i + chunksize] for i in range(0, max(len(source), 1), chunksize))
+    return iter(source())
+
+
+def profile_distributions(source, columns, fine_bins=FINE_BINS, max_fliers=500,
+                          chunksize=1_000_000, seed=0):
+    """
+    计算各列的分布摘要
+
+    参数:
+        source: DataFrame，或返回分块迭代器的无参函数（会被调用两次）
+        columns: 要统计的数值列
+        fine_bins: 细分直方图箱数
+        max_fliers: 每列保留的异常值样本数（总是包含最小和最大的异常值）
+        chunksize: DataFrame按多少行分块
+        seed: 异常值抽样的随机种子
+
+    返回:
+        {列名: DistributionSummary}
+    """
+    columns = list(columns)
+    rng = np.random.default_rng(seed)
+
+    # 第一遍：矩、最值、四分位数
+    stats = StreamingStats(columns)
+    for chunk in _as_chunks(source, chunksize):
+        stats.update(chunk)
+    table = stats.to_frame()
+
+    lo = table.loc['最小值'].to_numpy(dtype='float64')
+    hi = table.loc['最大值'].to_numpy(dtype='float64')
+    q1 = table.loc['25%分位数'].to_numpy(dtype='float64')
+    q3 = table.loc['75%分位数'].to_numpy(dtype='float64')
+    lo = np.where(np.isfinite(lo), lo, 0.0)
+    hi = np.where(np.isfinite(hi) & (hi > lo), hi, lo + 1.0)
+    fence_lo = q1 - 1.5 * (q3 - q1)
+    fence_hi = q3 + 1.5 * (q3 - q1)
+
+    # 第二遍：直方图、须线端点、异常值
+    # 须线端点、异常值计数和异常值样本取决于 Q1/Q3 的 1.5×IQR 界限，只有看完整列后才知道，
+    # 所以第二遍不可省略；直方图使用第一遍得到的精确最小值/最大值作为固定边界，
+    # 放在这一遍中计算不增加扫描次数（若放进第一遍，边界未知，只能边扫描边重新分箱）
+    m = len(columns)
+    counts = np.zeros((m, fine_bins))
+    whislo = np.full(m, np.inf)
+    whishi = np.full(m, -np.inf)
+    n_outliers = np.zeros(m, dtype=np.int64)
+    # 异常值按随机键保留最小的 max_fliers 个（均匀抽样，可跨块进行）
+    flier_values = [np.empty(0) for _ in range(m)]
+    flier_keys = [np.empty(0) for _ in range(m)]
+    flier_min = np.full(m, np.inf)
+    flier_max = np.full(m, -np.inf)
+
+    for chunk in _as_chunks(source, chunksize):
+        values = chunk[columns].to_numpy(dtype='float64', na_value=np.nan)
+        for i in range(m):
+            v = values[:, i]
+            v = v[np.isfinite(v)]
+            if len(v) == 0:
+                continue
+            idx = np.clip(((v - lo[i]) / (hi[i] - lo[i]) * fine_bins).astype(np.int64), 0, fine_bins - 1)
+            counts[i] += np.bincount(idx, minlength=fine_bins)
+
+            inside = (v >= fence_lo[i]) & (v <= fence_hi[i])
+            if inside.any():
+                whislo[i] = min(whislo[i], v[inside].min())
+                whishi[i] = max(whishi[i], v[inside].max())
+
+            out = v[~inside]
+            if len(out):
+                n_outliers[i] += len(out)
+                flier_min[i] = min(flier_min[i], out.min())
+                flier_max[i] = max(flier_max[i], out.max())
+                keys = np.concatenate([flier_keys[i], rng.random(len(out))])
+                pool = np.concatenate([flier_values[i], out])
+                keep = np.argsort(keys)[:max_fliers]
+                flier_keys[i], flier_values[i] = keys[keep], pool[keep]
+
+    summaries = {}
+    for i, col in enumerate(columns):
+        fliers = flier_values[i]
+        if n_outliers[i]:
+            fliers = np.unique(np.concatenate([fliers, [flier_min[i], flier_max[i]]]))
+        summaries[col] = DistributionSummary(
+            name=str(col),
+            n=int(table.loc['计数', col]),
+            mean=float(table.loc['均值', col]),
+            std=float(table.loc['标准差', col]),
+            min=float(table.loc['最小值', col]),
+            max=float(table.loc['最大值', col]),
+            q1=float(q1[i]),
+            median=float(table.loc['中位数', col]),
+            q3=float(q3[i]),
+            skew=float(table.loc['偏度', col]),
+            kurt=float(table.loc['峰度', col]),
+            whislo=float(whislo[i]) if np.isfinite(whislo[i]) else float(q1[i]),
+            whishi=float(whishi[i]) if np.isfinite(whishi[i]) else float(q3[i]),
+            n_outliers=int(n_outliers[i]),
+            fliers=fliers,
+            edges=np.linspace(lo[i], hi[i], fine_bins + 1),
+            counts=counts[i],
+        )
+    return summaries
+
+
+def save_profile(summaries, path):
+    """保存分布摘要为JSON"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({col: s.to_dict() for col, s in summaries.items()}, f, ensure_ascii=False)
+
+
+def load_profile(path):
+    """读取 save_profile 保存的分布摘要"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return {col: DistributionSummary(**fields) for col, fields in data.items()}
+
+
+def plot_box(ax, summaries, columns, **bxp_kwargs):
+    """
+    由摘要绘制箱线图（Axes.bxp）
+
+    返回:
+        Axes.bxp 的返回值（含 'boxes'、'medians' 等）
+    """
+    stats = [summaries[col].bxp_stats() for col in columns]
+    kwargs = dict(patch_artist=True, shownotches=True, showmeans=True)
+    kwargs.update(bxp_kwargs)
+    return ax.bxp(stats, **kwargs)
+
+
+def plot_violin(ax, summaries, columns, width=0.8, colors=None, alpha=0.7, show_box=True):
+    """
+    由摘要绘制小提琴图，第 i 列画在 x=i 处（与 seaborn.violinplot 相同）
+
+    参数:
+        width: 小提琴最大宽度
+        colors: 每列的颜色
+        show_box: 是否在中间画四分位线和中位数
+    """
+    if colors is None:
+        colors = [None] * len(columns)
+    for i, (col, color) in enumerate(zip(columns, colors)):
+        s = summaries[col]
+        kde = s.kde()
+        points, dens = kde.grids[0], kde.density
+        scale = (width / 2) / dens.max() if dens.max() > 0 else 0.0
+        ax.fill_betweenx(points, i - dens * scale, i + dens * scale,
+                         facecolor=color, edgecolor='black', alpha=alpha, linewidth=1)
+        if show_box:
+            ax.vlines(i, s.whislo, s.whishi, color='black', linewidth=1)
+            ax.vlines(i, s.q1, s.q3, color='black', linewidth=5)
+            ax.scatter([i], [s.median], color='white', s=20, zorder=3)
+    ax.set_xticks(range(len(columns)))
+    ax.set_xticklabels(columns)
+    ax.set_xlim(-0.5, len(columns) - 0.5)
+
+
+def plot_histogram(ax, summary, bins=30, density=False, **bar_kwargs):
+    """
+    由摘要绘制直方图
+
+    返回:
+        (边界, 计数或密度)
+    """
+    edges, counts = summary.histogram(bins=bins, density=density)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align='edge', **bar_kwargs)
+    return edges, counts
@@ -0,0 +1,196 @@
+"""
+图表导出配置
+Figure Export Profiles
+
+功能：
+1. 命名的导出配置（print / web / thumbnail / vector），控制 dpi、格式、调色板量化和PNG压缩级别
+2. 全项目统一的设置：环境变量 FIGURE_PROFILE，或在代码中调用 set_export_profile()
+3. 矢量格式（SVG、PDF）下，点数很多的散点、折线、曲面等自动栅格化，文件不会过大
+4. 记录每张图表写出的字节数和编码耗时，print_export_report() 打印报告
+   （没有手动打印的记录会在程序退出时打印）；长期运行的进程只保留最近 EXPORT_HISTORY_LIMIT 条历史
+
+用法:
+    from export_profiles import save_figure
+    save_figure('figures/01_xxx.png')        # 代替 plt.savefig(..., dpi=300, bbox_inches='tight')
+
+    FIGURE_PROFILE=web python visualize_2d.py
+"""
+
+import atexit
+import io
+import itertools
+import os
+import time
+from collections import deque
+
+import matplotlib.pyplot as plt
+from matplotlib.collections import Collection
+from matplotlib.lines import Line2D
+
+
+PROFILES = {
+    # 默认：与原来的 dpi=300 PNG 相同
+    'print': {'dpi': 300, 'format': 'png', 'quantize': None, 'compress_level': 6},
+    'web': {'dpi': 150, 'format': 'webp', 'quantize': None, 'quality': 85},
+    'thumbnail': {'dpi': 72, 'format': 'png', 'quantize': 64, 'compress_level': 9},
+    'vector': {'dpi': 300, 'format': 'pdf', 'quantize': None},
+}
+
+# 矢量格式下，超过该数量的点/路径的对象会被栅格化
+RASTERIZE_THRESHOLD = 2000
+
+_active_profile = os.environ.get('FIGURE_PROFILE', 'print')
+
+# [(路径, 配置名, 字节数, 编码耗时秒)]
+_export_log = []
+# 最近的导出记录（不会被 pop_export_log 清空，长期运行的渲染守护进程中不会无限增长）
+EXPORT_HISTORY_LIMIT = 1000
+_export_history = deque(maxlen=EXPORT_HISTORY_LIMIT)
+# 累计导出次数（export_history 的序号）
+_export_count = 0
+_atexit_registered = False
+
+
+def set_export_profile(name):
+    """设置全项目使用的导出配置"""
+    global _active_profile
+    if name not in PROFILES:
+        raise ValueError(f"未知的导出配置: {name}（可选: {', '.join(PROFILES)}）")
+    _active_profile = name
+
+
+def register_profile(name, **settings):
+    """注册或修改导出配置，未指定的项沿用 print 配置"""
+    PROFILES[name] = dict(PROFILES['print'], **settings)
+
+
+def get_export_profile(name=None):
+    """返回 (配置名, 配置字典)"""
+    name = name or _active_profile
+    if name not in PROFILES:
+        raise ValueError(f"未知的导出配置: {name}（可选: {', '.join(PROFILES)}）")
+    return name, PROFILES[name]
+
+
+def export_signature(name=None):
+    """导出配置的签名（用于图表缓存键）"""
+    name, settings = get_export_profile(name)
+    return f"{name}:{sorted(settings.items())}"
+
+
+def export_path(path, name=None):
+    """按导出配置的格式替换文件扩展名"""
+    _, settings = get_export_profile(name)
+    return os.path.splitext(path)[0] + '.' + settings['format']
+
+
+def _rasterize_dense_artists(fig, threshold):
+    """把点数很多的对象设为栅格化（只影响矢量格式）"""
+    for ax in fig.axes:
+        for artist in ax.get_children():
+            if isinstance(artist, Line2D):
+                size = len(artist.get_xdata())
+            elif isinstance(artist, Collection):
+                size = max(len(artist.get_offsets()), len(artist.get_paths()))
+            else:
+                continue
+            if size > threshold:
+                artist.set_rasterized(True)
+
+
+def _quantized_png(fig, path, dpi, colors, compress_level, savefig_kwargs):
+    """先渲染为PNG，再量化为调色板图像"""
+    from PIL import Image
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, **savefig_kwargs)
+    buffer.seek(0)
+    image = Image.open(buffer)
+    method = Image.Quantize.FASTOCTREE if image.mode == 'RGBA' else Image.Quantize.MEDIANCUT
+    image.quantize(colors=colors, method=method).save(path, format='PNG', optimize=True,
+                                                      compress_level=compress_level)
+
+
+def save_figure(path, fig=None, profile=None, **savefig_kwargs):
+    """
+    按导出配置保存图表
+
+    参数:
+        path: 输出路径（扩展名会按配置的格式替换）
+        fig: 要保存的图表（默认当前图表）
+        profile: 导出配置名（默认全项目设置）
+        savefig_kwargs: 其他传给 savefig 的参数（bbox_inches 默认 'tight'；
+                        dpi 和 format 由导出配置决定，传入时忽略）
+
+    返回:
+        实际写出的文件路径
+    """
+    global _atexit_registered, _export_count
+    fig = fig or plt.gcf()
+    name, settings = get_export_profile(profile)
+    fmt = settings['format']
+    path = export_path(path, name)
+    dpi = settings['dpi']
+    savefig_kwargs.setdefault('bbox_inches', 'tight')
+    savefig_kwargs.pop('dpi', None)
+    savefig_kwargs.pop('format', None)
+
+    start = time.perf_counter()
+    if fmt in ('svg', 'pdf'):
+        _rasterize_dense_artists(fig, settings.get('rasterize_threshold', RASTERIZE_THRESHOLD))
+        fig.savefig(path, format=fmt, dpi=dpi, **savefig_kwargs)
+    elif fmt == 'png' and settings.get('quantize'):
+        _quantized_png(fig, path, dpi, settings['quantize'], settings.get('compress_level', 6),
+                       savefig_kwargs)
+    else:
+        pil_kwargs = dict(savefig_kwargs.pop('pil_kwargs', None) or {})
+        if fmt == 'png':
+            pil_kwargs.setdefault('compress_level', settings.get('compress_level', 6))
+        elif fmt in ('webp', 'jpg', 'jpeg'):
+            pil_kwargs.setdefault('quality', settings.get('quality', 85))
+        fig.savefig(path, format=fmt, dpi=dpi, pil_kwargs=pil_kwargs, **savefig_kwargs)
+    elapsed = time.perf_counter() - start
+
+    entry = (path, name, os.path.getsize(path), elapsed)
+    _export_log.append(entry)
+    _export_history.append(entry)
+    _export_count += 1
+    if not _atexit_registered:
+        atexit.register(print_export_report)
+        _atexit_registered = True
+    return path
+
+
+def pop_export_log():
+    """取出并清空导出记录"""
+    entries = list(_export_log)
+    _export_log.clear()
+    return entries
+
+
+def export_count():
+    """累计导出次数（可作为 export_history 的起始序号）"""
+    return _export_count
+
+
+def export_history(start=0):
+    """序号 start 起的导出记录（包括已被取出打印过的；只保留最近 EXPORT_HISTORY_LIMIT 条）"""
+    first_kept = _export_count - len(_export_history)
+    return list(itertools.islice(_export_history, max(0, start - first_kept), None))
+
+
+def print_export_report(entries=None):
+    """打印每张图表的字节数和编码耗时（默认取出当前的全部记录）"""
+    if entries is None:
+        entries = pop_export_log()
+    if not entries:
+        return
+
+    print("\n" + "=" * 60)
+    print("图表导出报告")
+    print("=" * 60)
+    for path, name, size, seconds in entries:
+        print(f"  {os.path.basename(path):40s} {size / 1024:10.1f} KB {seconds:7.2f}s  [{name}]")
+    total = sum(e[2] for e in entries)
+    total_time = sum(e[3] for e in entries)
+    print(f"\n  共 {len(entries)} 张 | 写出 {total / 1024 / 1024:.2f} MB | 编码耗时 {total_time:.2f}s")
@@ -0,0 +1,300 @@
+"""
+基于内容哈希的图表缓存
+Content-addressed Figure Cache
+
+功能：
+1. 缓存键 = 输入数据列的哈希 + 绘图参数 + 绘图函数源码 + 它用到的本地辅助模块源码
+   （decimation、dist_summary、scatter_raster 等，按导入关系递归）+ 样式/字体设置（rcParams）+ 导出配置
+2. 键已存在时跳过渲染，直接从缓存目录恢复输出文件（已有输出文件的sha256与缓存一致时不复制）
+3. index.json 记录 键 -> 输出文件，按最近使用时间（LRU）限制缓存总大小
+4. 多进程并行渲染时通过锁文件保护索引（锁文件超过一定时间未更新视为异常退出留下的）
+
+用法:
+    cache = FigureCache('visualizations/.figure_cache')
+    key = cache.make_key('01_xxx.png', data=df[cols], params={...}, func=plot_func)
+    if not cache.restore(key, ['visualizations/01_xxx.png']):
+        plot_func(...)
+        cache.store(key, ['visualizations/01_xxx.png'])
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import time
+import types
+
+import numpy as np
+import pandas as pd
+import matplotlib
+
+from export_profiles import export_signature
+
+
+# 影响图表外观的rcParams前缀（seaborn样式和中文字体设置都体现在这里）
+STYLE_PREFIXES = ('font.', 'axes.', 'figure.', 'savefig.', 'lines.', 'patch.', 'grid.',
+                  'xtick.', 'ytick.', 'legend.', 'image.', 'text.', 'mathtext.')
+
+
+def style_signature():
+    """当前样式和字体设置的签名"""
+    items = sorted((k, str(v)) for k, v in matplotlib.rcParams.items()
+                   if k.startswith(STYLE_PREFIXES))
+    items.append(('matplotlib', matplotlib.__version__))
+    return json.dumps(items, ensure_ascii=False)
+
+
+# 本目录（共用工具）的路径，其中的模块总是视为本地辅助模块
+_TOOLKIT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# 模块名 -> 该模块及其本地依赖的源码哈希（每个进程计算一次）
+_helper_hashes = {}
+
+
+def _local_dependencies(module, roots, found):
+    """递归收集 module 用到的、位于 roots 目录中的模块 {模块名: 文件路径}"""
+    for value in list(vars(module).values()):
+        if isinstance(value, types.ModuleType):
+            dep = value
+        else:
+            name = getattr(value, '__module__', None)
+            dep = sys.modules.get(name) if isinstance(name, str) else None
+        path = getattr(dep, '__file__', None)
+        if dep is None or path is None or dep.__name__ in found:
+            continue
+        if os.path.dirname(os.path.abspath(path)) in roots:
+            found[dep.__name__] = path
+            _local_dependencies(dep, roots, found)
+    return found
+
+
+def helper_signature(func):
+    """绘图函数所在模块用到的本地辅助模块的源码哈希（不含该模块自身）"""
+    module = sys.modules.get(getattr(func, '__module__', None) or '')
+    if module is None or getattr(module, '__file__', None) is None:
+        return ''
+    if module.__name__ not in _helper_hashes:
+        roots = {_TOOLKIT_DIR, os.path.dirname(os.path.abspath(module.__file__))}
+        deps = _local_dependencies(module, roots, {module.__name__: module.__file__})
+        del deps[module.__name__]
+        h = hashlib.sha1()
+        for name in sorted(deps):
+            h.update(name.encode('utf-8'))
+            with open(deps[name], 'rb') as f:
+                h.update(f.read())
+        _helper_hashes[module.__name__] = h.hexdigest()
+    return _helper_hashes[module.__name__]
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            h.update(block)
+    return h.hexdigest()
+
+
+def hash_data(data):
+    """数据内容哈希（DataFrame、Series、ndarray 或可JSON序列化的对象）"""
+    h = hashlib.sha1()
+    if isinstance(data, (pd.DataFrame, pd.Series)):
+        if isinstance(data, pd.DataFrame):
+            h.update(json.dumps([str(c) for c in data.columns], ensure_ascii=False).encode('utf-8'))
+        h.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    elif isinstance(data, np.ndarray):
+        h.update(str(data.dtype).encode() + str(data.shape).encode())
+        h.update(np.ascontiguousarray(data).tobytes())
+    else:
+        h.update(json.dumps(data, sort_keys=True, default=str, ensure_ascii=False).encode('utf-8'))
+    return h.hexdigest()
+
+
+class FigureCache:
+    """图表缓存"""
+
+    def __init__(self, cache_dir, max_bytes=500 * 1024 * 1024):
+        """
+        初始化
+
+        参数:
+            cache_dir: 缓存目录（保存图表副本和 index.json）
+            max_bytes: 缓存总大小上限，超过时按LRU淘汰
+        """
+        self.cache_dir = cache_dir
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.index_file = os.path.join(cache_dir, 'index.json')
+        self.lock_file = os.path.join(cache_dir, 'index.lock')
+        self.max_bytes = max_bytes
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # 索引读写（带锁）
+    # ------------------------------------------------------------------
+
+    def _acquire(self, stale_after=30):
+        while True:
+            try:
+                fd = os.open(self.lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.close(fd)
+                return
+            except FileExistsError:
+                # 按锁文件自身的修改时间判断：持有超过 stale_after 秒视为异常退出留下的，
+                # 其他进程刚取得的锁不会被删除
+                try:
+                    if time.time() - os.path.getmtime(self.lock_file) > stale_after:
+                        os.remove(self.lock_file)
+                        continue
+                except FileNotFoundError:
+                    continue
+                time.sleep(0.01)
+
+    def _release(self):
+        try:
+            os.remove(self.lock_file)
+        except FileNotFoundError:
+            pass
+
+    def _read_index(self):
+        if not os.path.exists(self.index_file):
+            return {}
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_index(self, index):
+        tmp = self.index_file + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.index_file)
+
+    # ------------------------------------------------------------------
+    # 公共接口
+    # ------------------------------------------------------------------
+
+    def make_key(self, name, data=None, params=None, func=None):
+        """
+        计算缓存键
+
+        参数:
+            name: 图表名称
+            data: 图表用到的输入数据（只传需要的列）
+            params: 绘图参数字典
+            func: 绘图函数（源码参与哈希，修改某个图表只会让它自己失效；
+                  它所在模块用到的本地辅助模块的源码也参与哈希）
+        """
+        h = hashlib.sha1()
+        h.update(str(name).encode('utf-8'))
+        if data is not None:
+            h.update(hash_data(data).encode())
+        h.update(json.dumps(params or {}, sort_keys=True, default=str, ensure_ascii=False).encode('utf-8'))
+        if func is not None:
+            try:
+                h.update(inspect.getsource(func).encode('utf-8'))
+            except (OSError, TypeError):
+                h.update(getattr(func, '__qualname__', str(func)).encode('utf-8'))
+            h.update(helper_signature(func).encode())
+        h.update(style_signature().encode('utf-8'))
+        h.update(export_signature().encode('utf-8'))
+        return h.hexdigest()[:24]
+
+    def restore(self, key, outputs):
+        """
+        键已缓存时恢复输出文件并返回True，否则返回False
+        """
+        self._acquire()
+        try:
+            index = self._read_index()
+            entry = index.get(key)
+            if entry is None:
+                return False
+
+            objects = [os.path.join(self.objects_dir, obj) for obj in entry['objects']]
+            if len(objects) != len(outputs) or not all(os.path.exists(o) for o in objects):
+                del index[key]
+                self._write_index(index)
+                return False
+
+            digests = entry.get('sha256') or [None] * len(objects)
+            for obj, output, digest in zip(objects, outputs, digests):
+                if digest is None or not os.path.exists(output) or file_sha256(output) != digest:
+                    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+                    shutil.copyfile(obj, output)
+
+            entry['last_used'] = time.time()
+            self._write_index(index)
+            return True
+        finally:
+            self._release()
+
+    def store(self, key, outputs):
+        """把刚渲染的输出文件存入缓存，并按LRU淘汰超出上限的条目"""
+        objects = []
+        digests = []
+        total = 0
+        for i, output in enumerate(outputs):
+            obj = f'{key}_{i}{os.path.splitext(output)[1]}'
+            shutil.copyfile(output, os.path.join(self.objects_dir, obj))
+            objects.append(obj)
+            digests.append(file_sha256(output))
+            total += os.path.getsize(output)
+
+        self._acquire()
+        try:
+            index = self._read_index()
+            index[key] = {
+                'outputs': [os.path.abspath(o) for o in outputs],
+                'objects': objects,
+                'sha256': digests,
+                'bytes': total,
+                'last_used': time.time(),
+            }
+            self._evict(index)
+            self._write_index(index)
+        finally:
+            self._release()
+
+    def _evict(self, index):
+        used = sum(entry['bytes'] for entry in index.values())
+        for key in sorted(index, key=lambda k: index[k]['last_used']):
+            if used <= self.max_bytes or len(index) <= 1:
+                break
+            for obj in index[key]['objects']:
+                try:
+                    os.remove(os.path.join(self.objects_dir, obj))
+                except FileNotFoundError:
+                    pass
+            used -= index[key]['bytes']
+            del index[key]
+
+    def clear(self):
+        """清空缓存"""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+
+def render_cached(cache, outputs, plot_func, *args, data=None, params=None):
+    """
+    带缓存地渲染一张图表
+
+    参数:
+        cache: FigureCache（为None时总是渲染）
+        outputs: 绘图函数写出的文件路径列表
+        plot_func: 绘图函数（源码参与缓存键）
+        args: 传给绘图函数的参数
+        data: 图表用到的输入数据
+        params: 绘图参数
+
+    返回:
+        True 表示重新渲染，False 表示使用了缓存
+    """
+    if cache is None:
+        plot_func(*args)
+        return True
+
+    key = cache.make_key(os.path.basename(outputs[0]), data=data, params=params, func=plot_func)
+    if cache.restore(key, outputs):
+        return False
+    plot_func(*args)
+    cache.store(key, outputs)
+    return True
@@ -0,0 +1,224 @@
+"""
+单次扫描的融合统计内核
+Fused Single-pass Statistics Kernel
+
+功能：
+1. 一次扫描同时得到计数、均值、二至四阶中心矩（偏度、峰度）、最小值和最大值
+2. 分块计算后用 Chan/Pébay 公式合并，结果与整体计算一致，可跨文件合并
+3. 分位数（中位数、25%、75%）来自可合并的KLL分位数草图，样本数不超过草图容量时是精确值
+4. 输出与 generate_statistics_report 相同的统计表布局
+
+用法:
+    stats = StreamingStats(columns)
+    for chunk in pd.read_csv(path, chunksize=10**6):
+        stats.update(chunk)
+    report = stats.to_frame()
+"""
+
+import numpy as np
+import pandas as pd
+
+
+# 统计报告的行顺序（与 generate_statistics_report 一致）
+REPORT_ROWS = ['计数', '均值', '中位数', '标准差', '最小值', '25%分位数', '75%分位数', '最大值', '偏度', '峰度']
+
+
+class QuantileSketch:
+    """KLL分位数草图（可合并）"""
+
+    def __init__(self, k=1024, seed=0):
+        """
+        参数:
+            k: 最高层的容量，越大越精确；样本数不超过k时结果是精确的
+            seed: 压缩时随机选奇偶位置用的随机种子
+        """
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, h):
+        depth = len(self.levels)
+        return max(2, int(np.ceil(self.k * (2 / 3) ** (depth - 1 - h))))
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                buf = np.sort(self.levels[h])
+                leftover = buf[:0]
+                if len(buf) % 2:
+                    leftover, buf = buf[-1:], buf[:-1]
+                # 相邻两个值随机保留一个，权重翻倍后进入上一层
+                promoted = buf[self._rng.integers(2)::2]
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+                self.levels[h] = leftover
+            h += 1
+
+    def update(self, values):
+        """加入一批数值（忽略非有限值）"""
+        values = np.asarray(values, dtype='float64')
+        values = values[np.isfinite(values)]
+        if len(values) == 0:
+            return self
+        self.n += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+        return self
+
+    def merge(self, other):
+        """把另一个草图并入当前草图"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.n += other.n
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """分位数（精确模式下与 pandas 的线性插值一致）"""
+        if self.n == 0:
+            return np.nan
+        if len(self.levels) == 1:
+            return float(np.quantile(self.levels[0], q))
+
+        values = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(values)
+        values, weights = values[order], weights[order]
+        # 每个值代表其权重区间的中点
+        positions = (np.cumsum(weights) - weights / 2) / weights.sum()
+        return float(np.interp(q, positions, values))
+
+
+class StreamingStats:
+    """多列的流式统计量"""
+
+    def __init__(self, columns, sketch_k=1024):
+        """
+        参数:
+            columns: 要统计的数值列
+            sketch_k: 分位数草图容量
+        """
+        self.columns = list(columns)
+        m = len(self.columns)
+        self.n = np.zeros(m)
+        self.mean = np.zeros(m)
+        self.m2 = np.zeros(m)
+        self.m3 = np.zeros(m)
+        self.m4 = np.zeros(m)
+        self.min = np.full(m, np.inf)
+        self.max = np.full(m, -np.inf)
+        self.sketches = [QuantileSketch(k=sketch_k, seed=i) for i in range(m)]
+
+    def _merge_moments(self, n_b, mean_b, m2_b, m3_b, m4_b):
+        """Pébay 合并公式（按列向量化）"""
+        n_a = self.n
+        n = n_a + n_b
+        with np.errstate(invalid='ignore', divide='ignore'):
+            d = np.where(n > 0, mean_b - self.mean, 0.0)
+            nn = np.where(n > 0, n, 1.0)
+            ab = n_a * n_b
+
+            mean = self.mean + d * n_b / nn
+            m2 = self.m2 + m2_b + d ** 2 * ab / nn
+            m3 = (self.m3 + m3_b + d ** 3 * ab * (n_a - n_b) / nn ** 2
+                  + 3 * d * (n_a * m2_b - n_b * self.m2) / nn)
+            m4 = (self.m4 + m4_b + d ** 4 * ab * (n_a ** 2 - ab + n_b ** 2) / nn ** 3
+                  + 6 * d ** 2 * (n_a ** 2 * m2_b + n_b ** 2 * self.m2) / nn ** 2
+                  + 4 * d * (n_a * m3_b - n_b * self.m3) / nn)
+
+        self.n, self.mean, self.m2, self.m3, self.m4 = n, mean, m2, m3, m4
+
+    def update(self, chunk):
+        """
+        累积一块数据
+
+        参数:
+            chunk: 包含 columns 的DataFrame
+        """
+        values = chunk[self.columns].to_numpy(dtype='float64', na_value=np.nan)
+        valid = np.isfinite(values)
+        n_b = valid.sum(axis=0).astype('float64')
+
+        filled = np.where(valid, values, 0.0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_b = np.where(n_b > 0, filled.sum(axis=0) / np.maximum(n_b, 1), 0.0)
+        d = np.where(valid, values - mean_b, 0.0)
+        d2 = d * d
+        self._merge_moments(n_b, mean_b, d2.sum(axis=0), (d2 * d).sum(axis=0), (d2 * d2).sum(axis=0))
+
+        self.min = np.minimum(self.min, np.where(valid, values, np.inf).min(axis=0, initial=np.inf))
+        self.max = np.maximum(self.max, np.where(valid, values, -np.inf).max(axis=0, initial=-np.inf))
+
+        for i, sketch in enumerate(self.sketches):
+            sketch.update(values[valid[:, i], i])
+        return self
+
+    def merge(self, other):
+        """并入另一个 StreamingStats（列必须相同），例如来自另一个文件"""
+        if other.columns != self.columns:
+            raise ValueError("列不一致，无法合并")
+        self._merge_moments(other.n, other.mean, other.m2, other.m3, other.m4)
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        for mine, theirs in zip(self.sketches, other.sketches):
+            mine.merge(theirs)
+        return self
+
+    def to_frame(self):
+        """
+        生成统计表（行: 计数/均值/.../峰度，列: 各数值列；计数为整数，其余为浮点数），
+        标准差、偏度、峰度与 pandas 的无偏估计一致
+        """
+        n = self.n
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = np.where(n > 1, self.m2 / (n - 1), np.nan)
+            m2n = self.m2 / n
+            g1 = (self.m3 / n) / m2n ** 1.5
+            g2 = (self.m4 / n) / m2n ** 2 - 3
+            skew = np.where((n > 2) & (self.m2 > 0), np.sqrt(n * (n - 1)) / (n - 2) * g1,
+                            np.where(n > 2, 0.0, np.nan))
+            kurt = np.where((n > 3) & (self.m2 > 0),
+                            ((n + 1) * g2 + 6) * (n - 1) / ((n - 2) * (n - 3)),
+                            np.where(n > 3, 0.0, np.nan))
+
+        empty = n == 0
+        rows = {
+            '计数': n,
+            '均值': np.where(empty, np.nan, self.mean),
+            '中位数': [s.quantile(0.5) for s in self.sketches],
+            '标准差': np.sqrt(var),
+            '最小值': np.where(empty, np.nan, self.min),
+            '25%分位数': [s.quantile(0.25) for s in self.sketches],
+            '75%分位数': [s.quantile(0.75) for s in self.sketches],
+            '最大值': np.where(empty, np.nan, self.max),
+            '偏度': skew,
+            '峰度': kurt,
+        }
+        frame = pd.DataFrame(rows, index=self.columns).T.loc[REPORT_ROWS].astype(object)
+        # 合并时计数按浮点累加，报告中恢复为整数（不显示为 1234.0）
+        frame.loc['计数'] = n.astype('int64')
+        return frame
+
+    @classmethod
+    def from_dataframe(cls, df, columns, chunksize=1_000_000, sketch_k=1024):
+        """分块扫描一个DataFrame"""
+        stats = cls(columns, sketch_k=sketch_k)
+        for start in range(0, len(df), chunksize):
+            stats.update(df.iloc[start:start + chunksize])
+        return stats
+
+    @classmethod
+    def from_csv(cls, paths, columns, chunksize=1_000_000, sketch_k=1024, **read_kwargs):
+        """分块扫描一个或多个CSV文件（不需要一次性读入内存）"""
+        if isinstance(paths, str):
+            paths = [paths]
+        stats = cls(columns, sketch_k=sketch_k)
+        for path in paths:
+            for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize, **read_kwargs):
+                stats.update(chunk)
+        return stats
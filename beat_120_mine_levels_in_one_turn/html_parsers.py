@@ -0,0 +1,248 @@
+"""
+可替换后端的HTML抽取
+Pluggable HTML Parser Backends with Compiled CSS Rules
+
+功能：
+1. 抽取规则用CSS选择器描述：一个条目选择器 + 每个字段的选择器（取文本或属性、取第几个匹配）
+2. 规则在创建 ParseRules 时按后端编译一次，之后每个页面直接复用
+3. 后端（auto 时按速度依次尝试）:
+   - selectolax: lexbor 解析器（需要安装 selectolax）
+   - lxml:       lxml.html + 编译为XPath的CSS选择器（有 cssselect 时用它翻译，
+                 否则用内置的简单翻译：标签、.类、#id、[属性]、[属性=值]，组合符 空格 > +）
+   - soup:       BeautifulSoup（有lxml时用lxml建树）+ soupsieve 预编译选择器，总是可用
+
+用法:
+    rules = ParseRules('div.item', {
+        '标题': Field('span.title'),
+        '评价人数': Field('div.star span', index=-1),
+        '链接': Field('a', attr='href'),
+    })
+    for row in rules.parse(html):
+        ...
+"""
+
+import re
+from collections import namedtuple
+
+
+class Field(namedtuple('Field', ['selector', 'attr', 'index', 'default'])):
+    """
+    字段抽取规则
+
+    参数:
+        selector: 条目内的CSS选择器
+        attr: 取该属性（None 取文本）
+        index: 取第几个匹配（负数从末尾数；None 取全部，结果为列表）
+        default: 没有匹配时的值
+    """
+    __slots__ = ()
+
+    def __new__(cls, selector, attr=None, index=0, default=''):
+        return super().__new__(cls, selector, attr, index, default)
+
+
+_SIMPLE_TOKEN = re.compile(r"""
+    (?P<combinator>\s*[>+]\s*|\s+)
+  | (?P<tag>[A-Za-z][\w-]*|\*)
+  | \.(?P<cls>[\w-]+)
+  | \#(?P<id>[\w-]+)
+  | \[(?P<attr>[\w-]+)(?:=(?P<quote>["']?)(?P<value>[^"'\]]*)(?P=quote))?\]
+""", re.VERBOSE)
+
+
+def css_to_xpath(selector):
+    """
+    把简单CSS选择器翻译为XPath（没有 cssselect 时使用）
+
+    支持: 标签、*、.类、#id、[属性]、[属性=值]，组合符 空格、>、+
+    """
+    steps, axis = [], 'descendant-or-self::'
+    tag, predicates = '*', []
+    pos, selector = 0, selector.strip()
+
+    def close_step():
+        steps.append(axis + tag + ''.join(f'[{p}]' for p in predicates))
+
+    while pos < len(selector):
+        match = _SIMPLE_TOKEN.match(selector, pos)
+        if match is None:
+            raise ValueError(f"内置翻译不支持该选择器（请安装 cssselect）: {selector!r}")
+        pos = match.end()
+        if match.group('combinator') is not None:
+            close_step()
+            tag, predicates = '*', []
+            combinator = match.group('combinator').strip()
+            axis = {'': '/descendant::', '>': '/', '+': '/following-sibling::*[1]/self::'}[combinator]
+        elif match.group('tag'):
+            tag = match.group('tag').lower()
+        elif match.group('cls'):
+            predicates.append(f"contains(concat(' ', normalize-space(@class), ' '), ' {match.group('cls')} ')")
+        elif match.group('id'):
+            predicates.append(f"@id='{match.group('id')}'")
+        elif match.group('value') is not None:
+            predicates.append(f"@{match.group('attr')}='{match.group('value')}'")
+        else:
+            predicates.append(f"@{match.group('attr')}")
+    close_step()
+    return ''.join(steps)
+
+
+class SelectolaxBackend:
+    name = 'selectolax'
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser = LexborHTMLParser
+
+    def parse(self, html):
+        return self._parser(html)
+
+    def compile(self, selector):
+        # selectolax 不提供预编译，选择器在 lexbor 内部缓存
+        return selector
+
+    def select(self, node, compiled):
+        return node.css(compiled)
+
+    def text(self, node):
+        return node.text(deep=True)
+
+    def attr(self, node, name):
+        return node.attributes.get(name)
+
+
+class LxmlBackend:
+    name = 'lxml'
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        self._fromstring = lxml.html.fromstring
+        self._xpath = etree.XPath
+        try:
+            from cssselect import HTMLTranslator
+            self._translate = HTMLTranslator().css_to_xpath
+        except ImportError:
+            self._translate = css_to_xpath
+
+    def parse(self, html):
+        return self._fromstring(html)
+
+    def compile(self, selector):
+        return self._xpath(self._translate(selector))
+
+    def select(self, node, compiled):
+        return compiled(node)
+
+    def text(self, node):
+        return node.text_content()
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+class SoupBackend:
+    name = 'soup'
+
+    def __init__(self):
+        import soupsieve
+        from bs4 import BeautifulSoup
+        try:
+            import lxml  # noqa: F401
+            self._features = 'lxml'
+        except ImportError:
+            self._features = 'html.parser'
+        self._soup = BeautifulSoup
+        self._compile = soupsieve.compile
+
+    def parse(self, html):
+        return self._soup(html, self._features)
+
+    def compile(self, selector):
+        return self._compile(selector)
+
+    def select(self, node, compiled):
+        return compiled.select(node)
+
+    def text(self, node):
+        return node.get_text()
+
+    def attr(self, node, name):
+        return node.get(name)
+
+
+BACKENDS = {'selectolax': SelectolaxBackend, 'lxml': LxmlBackend, 'soup': SoupBackend}
+
+
+def available_backends():
+    """当前环境可用的后端名称（按速度从快到慢）"""
+    names = []
+    for name, backend in BACKENDS.items():
+        try:
+            backend()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def get_backend(name='auto'):
+    """
+    创建解析后端
+
+    参数:
+        name: 'auto'、'selectolax'、'lxml' 或 'soup'
+    """
+    if name != 'auto':
+        if name not in BACKENDS:
+            raise ValueError(f"未知的解析后端: {name}（可选: auto, {', '.join(BACKENDS)}）")
+        return BACKENDS[name]()
+    return BACKENDS[available_backends()[0]]()
+
+
+class ParseRules:
+    """编译好的抽取规则"""
+
+    def __init__(self, item, fields, backend='auto'):
+        """
+        参数:
+            item: 条目的CSS选择器（每个匹配生成一行）
+            fields: {字段名: Field}
+            backend: 解析后端名称或后端对象
+        """
+        self.backend = get_backend(backend) if isinstance(backend, str) else backend
+        self._item = self.backend.compile(item)
+        self._fields = [(name, self.backend.compile(field.selector), field)
+                        for name, field in fields.items()]
+
+    def _value(self, node, field):
+        if field.attr is None:
+            return self.backend.text(node).strip()
+        value = self.backend.attr(node, field.attr)
+        return field.default if value is None else value
+
+    def items(self, html):
+        """页面中的条目节点"""
+        return self.backend.select(self.backend.parse(html), self._item)
+
+    def extract(self, node):
+        """从一个条目节点抽取全部字段"""
+        row = {}
+        for name, compiled, field in self._fields:
+            matches = self.backend.select(node, compiled)
+            if field.index is None:
+                row[name] = [self._value(match, field) for match in matches]
+            elif -len(matches) <= field.index < len(matches):
+                row[name] = self._value(matches[field.index], field)
+            else:
+                row[name] = field.default
+        return row
+
+    def parse(self, html):
+        """
+        抽取页面中的全部条目
+
+        返回:
+            [{字段名: 值}]
+        """
+        return [self.extract(node) for node in self.items(html)]
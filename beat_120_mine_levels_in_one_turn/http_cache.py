@@ -0,0 +1,188 @@
+"""
+HTTP响应磁盘缓存
+On-disk HTTP Response Cache
+
+功能：
+1. SQLite保存响应（状态码、响应头、响应体），键为 URL + 排序后的查询参数
+2. 条目在TTL内直接使用，不发出任何请求
+3. 过期条目带 If-None-Match / If-Modified-Since 重新验证，服务器返回304时沿用缓存内容
+4. 离线模式：只从缓存读取（过期条目也可使用），缓存中没有时抛出 CacheMiss
+5. 命中、重新验证、未命中计数，summary() 生成一行摘要
+6. 只缓存调用方认为有效的响应（cacheable 判断）；默认不缓存 code 非0的JSON响应体，
+   例如B站以HTTP 200返回的风控错误（-352/-412），否则错误会在TTL内被当作命中
+
+用法:
+    cache = HttpCache('data/http_cache.sqlite', ttl=1800)
+    response = cache.get(session, url, params={'rid': 0}, timeout=10)
+    print(cache.summary())
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlencode
+
+import requests
+
+
+class CacheMiss(requests.RequestException):
+    """离线模式下缓存中没有该请求"""
+
+
+def json_code_ok(response):
+    """默认的可缓存判断：JSON响应体带非0的 code 字段时不缓存，不是JSON的响应照常缓存"""
+    content_type = response.headers.get('Content-Type', '')
+    if 'json' not in content_type and response.content.lstrip()[:1] not in (b'{', b'['):
+        return True
+    try:
+        data = response.json()
+    except ValueError:
+        return False
+    return not (isinstance(data, dict) and data.get('code', 0) != 0)
+
+
+class HttpCache:
+    """HTTP响应缓存"""
+
+    def __init__(self, path, ttl=1800, offline=False, cacheable=json_code_ok):
+        """
+        参数:
+            path: SQLite数据库文件
+            ttl: 条目有效秒数
+            offline: 离线模式（只从缓存读取）
+            cacheable: cacheable(response) -> bool，2xx响应是否写入缓存（None 表示全部写入）
+        """
+        self.path = path
+        self.cacheable = cacheable
+        self.ttl = ttl
+        self.offline = offline
+        self.counters = {'hits': 0, 'revalidated': 0, 'misses': 0, 'rejected': 0}
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                url TEXT,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                fetched_at REAL
+            )""")
+        self._db.commit()
+
+    @staticmethod
+    def make_key(url, params=None):
+        """缓存键：URL + 排序后的查询参数"""
+        if not params:
+            return url
+        return f"{url}?{urlencode(sorted((str(k), str(v)) for k, v in dict(params).items()))}"
+
+    def lookup(self, url, params=None):
+        """
+        查找缓存
+
+        返回:
+            (键, 条目字典或None, 是否在TTL内)
+        """
+        key = self.make_key(url, params)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT url, status, headers, body, fetched_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return key, None, False
+        entry = {'url': row[0], 'status': row[1], 'headers': json.loads(row[2]),
+                 'body': row[3], 'fetched_at': row[4]}
+        return key, entry, time.time() - entry['fetched_at'] < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry):
+        """重新验证用的请求头"""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry['headers'].get('ETag'):
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+
+    @staticmethod
+    def to_response(entry):
+        """把缓存条目还原为 requests.Response"""
+        response = requests.Response()
+        response.status_code = entry['status']
+        response.headers.update(entry['headers'])
+        response._content = entry['body']
+        response.url = entry['url']
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers) or 'utf-8'
+        return response
+
+    def hit(self, entry):
+        """TTL内命中（或离线模式使用过期条目）"""
+        self.counters['hits'] += 1
+        return self.to_response(entry)
+
+    def miss(self, key):
+        """离线模式下未命中"""
+        self.counters['misses'] += 1
+        raise CacheMiss(f"离线模式下缓存中没有: {key}")
+
+    def resolve(self, key, entry, response):
+        """
+        处理网络响应：304时刷新并返回缓存内容，2xx且通过 cacheable 判断时写入缓存
+
+        返回:
+            requests.Response
+        """
+        if response.status_code == 304 and entry is not None:
+            self.counters['revalidated'] += 1
+            with self._lock:
+                self._db.execute("UPDATE responses SET fetched_at = ? WHERE key = ?", (time.time(), key))
+                self._db.commit()
+            return self.to_response(entry)
+
+        self.counters['misses'] += 1
+        if 200 <= response.status_code < 300 and self.cacheable is not None \
+                and not self.cacheable(response):
+            self.counters['rejected'] += 1
+        elif 200 <= response.status_code < 300:
+            headers = {k: v for k, v in response.headers.items()
+                       if k in ('Content-Type', 'ETag', 'Last-Modified')}
+            with self._lock:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, response.url, response.status_code, json.dumps(headers),
+                     response.content, time.time()))
+                self._db.commit()
+        return response
+
+    def get(self, session, url, params=None, headers=None, **kwargs):
+        """
+        带缓存的 GET 请求
+
+        参数:
+            session: requests.Session
+            其他参数同 session.get
+
+        返回:
+            requests.Response
+        """
+        key, entry, fresh = self.lookup(url, params)
+        if entry is not None and (fresh or self.offline):
+            return self.hit(entry)
+        if self.offline:
+            self.miss(key)
+        request_headers = dict(headers or {}, **self.conditional_headers(entry))
+        response = session.get(url, params=params, headers=request_headers, **kwargs)
+        return self.resolve(key, entry, response)
+
+    def summary(self):
+        c = self.counters
+        mode = '（离线）' if self.offline else ''
+        return (f"缓存{mode}: 命中 {c['hits']} | 重新验证 {c['revalidated']} | 未命中 {c['misses']} | "
+                f"未缓存的错误响应 {c['rejected']}")
+
+    def close(self):
+        self._db.close()
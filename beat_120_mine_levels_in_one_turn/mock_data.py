@@ -0,0 +1,111 @@
+"""
+大规模模拟数据生成
+Chunked, Seeded Mock Data Generation
+
+功能：
+1. 按块生成模拟数据，每块由调用方的 make_chunk(rng, start, n) 用NumPy整列生成
+2. 种子相同（且块大小相同）时结果完全相同；每块使用独立的随机数流
+3. 逐块写出到 Parquet（需要pyarrow）或 CSV，内存占用只与块大小有关
+4. 生成带编号的字符串列（如 "电影123"）和取自固定选项的分类列
+
+用法:
+    def make_chunk(rng, start, n):
+        return pd.DataFrame({'编号': np.arange(start, start + n), '值': rng.normal(size=n)})
+
+    write_chunks(generate(make_chunk, 10_000_000, seed=42), 'data/mock.parquet')
+"""
+
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def generate(make_chunk, n_rows, seed=None, chunksize=1_000_000):
+    """
+    逐块生成模拟数据
+
+    参数:
+        make_chunk: make_chunk(rng, start, n) -> DataFrame，生成第 start 行起的 n 行
+        n_rows: 总行数
+        seed: 随机种子（None 表示不固定）
+        chunksize: 每块行数
+
+    返回:
+        DataFrame 生成器
+    """
+    n_chunks = max(1, -(-n_rows // chunksize))
+    streams = np.random.SeedSequence(seed).spawn(n_chunks)
+    for i, stream in enumerate(streams):
+        start = i * chunksize
+        n = min(chunksize, n_rows - start)
+        if n <= 0:
+            break
+        yield make_chunk(np.random.default_rng(stream), start, n)
+
+
+def numbered(prefix, numbers, suffix=''):
+    """
+    带编号的字符串列: prefix + 编号 + suffix
+
+    有pyarrow时在Arrow中拼接（不生成Python字符串对象），否则用NumPy
+    """
+    numbers = np.asarray(numbers)
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError:
+        values = np.char.add(prefix, numbers.astype(str))
+        return np.char.add(values, suffix) if suffix else values
+    values = pc.binary_join_element_wise(prefix, pc.cast(pa.array(numbers), pa.string()), suffix, '')
+    return pd.arrays.ArrowStringArray(pc.cast(values, pa.large_string()))
+
+
+def choice(rng, options, n):
+    """从固定选项中随机取 n 个，返回分类列（写Parquet时按字典编码）"""
+    codes = rng.integers(0, len(options), n)
+    return pd.Categorical.from_codes(codes, categories=list(options))
+
+
+def write_chunks(chunks, path):
+    """
+    把数据块逐块写入一个文件
+
+    参数:
+        chunks: DataFrame 可迭代对象（各块列相同）
+        path: 输出文件（.parquet 或 .csv）
+
+    返回:
+        写出的总行数
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    start = time.perf_counter()
+    total = 0
+    if path.endswith('.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for chunk in chunks:
+                if writer is None:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    writer = pq.ParquetWriter(path, table.schema)
+                else:
+                    # 后续块按第一块的列类型转换（如第一块的字符串列是object）
+                    table = pa.Table.from_pandas(chunk, schema=writer.schema, preserve_index=False)
+                writer.write_table(table)
+                total += len(chunk)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        for chunk in chunks:
+            first = total == 0
+            chunk.to_csv(path, index=False, mode='w' if first else 'a', header=first,
+                         encoding='utf-8-sig' if first else 'utf-8')
+            total += len(chunk)
+
+    seconds = time.perf_counter() - start
+    print(f"  √ 已生成 {total:,} 行 -> {path}（{seconds:.1f}s，{total / max(seconds, 1e-9):,.0f} 行/秒）")
+    return total
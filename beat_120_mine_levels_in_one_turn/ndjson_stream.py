@@ -0,0 +1,142 @@
+"""
+流式NDJSON读写
+Streaming NDJSON Writer and Lazy Reader
+
+功能：
+1. 每条记录一行JSON（NDJSON），边解析边写出，不必在内存中保留全部结果
+2. 按文件扩展名压缩: .gz 用 gzip，.zst 用 zstandard（需要安装 zstandard），其他为纯文本
+3. 每写出 flush_every 条或每隔 flush_interval 秒刷新一次，
+   程序中途崩溃时已刷新的记录都能读回
+4. iter_ndjson() 逐条惰性读取；文件末尾不完整的记录（崩溃时正在写的那一行）会被跳过
+
+用法:
+    with NDJSONWriter('data/items.ndjson.gz') as writer:
+        for page in pages:
+            writer.write_many(parse(page))
+
+    for record in iter_ndjson('data/items.ndjson.gz'):
+        ...
+"""
+
+import gzip
+import io
+import json
+import time
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("读写 .zst 文件需要安装 zstandard: pip install zstandard")
+    return zstandard
+
+
+def open_text(path, mode='r'):
+    """
+    按扩展名打开（可能压缩的）UTF-8文本文件
+
+    参数:
+        path: 文件路径（.gz / .zst / 其他）
+        mode: 'r' 读、'w' 写、'a' 追加
+    """
+    if path.endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8')
+    if path.endswith('.zst'):
+        zstd = _zstandard()
+        if mode == 'r':
+            raw = zstd.ZstdDecompressor().stream_reader(open(path, 'rb'), closefd=True)
+        else:
+            raw = zstd.ZstdCompressor().stream_writer(open(path, mode + 'b'), closefd=True)
+        return io.TextIOWrapper(raw, encoding='utf-8')
+    return open(path, mode, encoding='utf-8')
+
+
+class NDJSONWriter:
+    """流式NDJSON写入器"""
+
+    def __init__(self, path, flush_every=100, flush_interval=5.0, append=False):
+        """
+        参数:
+            path: 输出文件（.ndjson / .ndjson.gz / .ndjson.zst）
+            flush_every: 每写出多少条刷新一次
+            flush_interval: 距上次刷新超过多少秒时刷新
+            append: 追加到已有文件
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.count = 0
+        self._file = open_text(path, 'a' if append else 'w')
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def write(self, record):
+        """写出一条记录"""
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str))
+        self._file.write('\n')
+        self.count += 1
+        self._pending += 1
+        if (self._pending >= self.flush_every
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def write_many(self, records):
+        """写出多条记录"""
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        """把缓冲的记录写到磁盘（压缩格式会结束当前压缩块）"""
+        self._file.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def iter_ndjson(path):
+    """
+    逐条读取NDJSON文件（惰性，内存占用与文件大小无关）
+
+    文件因崩溃而不完整时，读到最后一条完整记录为止
+    """
+    with open_text(path, 'r') as f:
+        while True:
+            try:
+                line = f.readline()
+            except (EOFError, OSError, ValueError):
+                # 压缩流在最后一次刷新之后被截断
+                return
+            if not line:
+                return
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                # 最后一行没写完
+                if not line.endswith('\n'):
+                    return
+                raise
+
+
+def iter_chunks(path, chunksize=10_000):
+    """按块读取NDJSON文件，每块为记录列表"""
+    chunk = []
+    for record in iter_ndjson(path):
+        chunk.append(record)
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
@@ -0,0 +1,308 @@
+"""
+本地图表渲染守护进程
+Local Render Daemon
+
+功能：
+1. 工作进程启动时一次性导入 matplotlib、seaborn、scipy、sklearn、plotly，
+   并解析 SimHei / Microsoft YaHei 字体，之后每个任务不再付出2-3秒的启动开销
+2. 通过本地套接字（multiprocessing.connection，Windows和Linux通用）接收渲染任务，
+   由进程池并行执行；认证密钥在首次启动时随机生成，保存在只有当前用户可读的文件中
+   （连接会反序列化收到的数据，没有密钥的进程不能提交任务）
+3. 任务类型:
+   - 脚本: {'script': 路径, 'args': [...], 'cwd': 工作目录}
+   - 图表函数: {'chart': '模块:函数', 'kwargs': {...}, 'path': 模块所在目录, 'cwd': 工作目录}
+4. 每个任务前恢复 rcParams 和标准输出，脚本之间互不影响
+
+用法:
+    python render_daemon.py serve --workers 4          # 启动守护进程
+    python render_daemon.py run a.py b.py --cwd 目录    # 提交脚本并等待结果
+    python render_daemon.py stop                       # 停止守护进程
+"""
+
+import argparse
+import importlib
+import io
+import os
+import runpy
+import secrets
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Listener
+
+
+DEFAULT_ADDRESS = ('127.0.0.1', 47800)
+AUTHKEY_PATH = os.path.join(os.path.expanduser('~'), '.render_daemon_authkey')
+
+# 工作进程预先导入的模块（缺少的跳过）
+PRELOAD_MODULES = ['numpy', 'pandas', 'matplotlib.pyplot', 'mpl_toolkits.mplot3d', 'seaborn',
+                   'scipy.stats', 'scipy.signal', 'sklearn.linear_model', 'sklearn.metrics',
+                   'plotly.graph_objects', 'bs4', 'requests']
+PRELOAD_FONTS = ['SimHei', 'Microsoft YaHei']
+
+# 工作进程内预热后的 rcParams 快照
+_baseline_rc = None
+
+
+def _warm_up():
+    """工作进程初始化：导入常用库、解析字体、记录 rcParams 快照"""
+    import logging
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+
+    for name in PRELOAD_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            pass
+
+    from matplotlib import font_manager
+    logging.getLogger('matplotlib.font_manager').setLevel(logging.ERROR)
+    for font in PRELOAD_FONTS:
+        font_manager.findfont(font_manager.FontProperties(family=font), fallback_to_default=True)
+
+    # 工具目录在导入路径中，图表函数可以直接使用共用模块
+    toolkit = os.path.dirname(os.path.abspath(__file__))
+    if toolkit not in sys.path:
+        sys.path.insert(0, toolkit)
+
+    global _baseline_rc
+    _baseline_rc = matplotlib.rcParams.copy()
+
+
+def _run_job(job):
+    """在工作进程中执行一个任务，返回结果字典"""
+    import matplotlib
+    import matplotlib.pyplot as plt
+    from export_profiles import export_count, export_history, pop_export_log
+
+    start = time.perf_counter()
+    mark = export_count()
+    saved = (os.getcwd(), list(sys.argv), list(sys.path), sys.stdout, sys.stderr)
+    error = None
+    try:
+        matplotlib.rcParams.update(_baseline_rc)
+        if job.get('cwd'):
+            os.chdir(job['cwd'])
+
+        if 'script' in job:
+            script = os.path.abspath(job['script'])
+            sys.argv = [script] + list(job.get('args', []))
+            sys.path.insert(0, os.path.dirname(script))
+            try:
+                runpy.run_path(script, run_name='__main__')
+            except SystemExit as e:
+                if e.code not in (None, 0):
+                    error = f'SystemExit: {e.code}'
+        else:
+            if job.get('path'):
+                sys.path.insert(0, job['path'])
+            module_name, func_name = job['chart'].split(':')
+            func = getattr(importlib.import_module(module_name), func_name)
+            func(**job.get('kwargs', {}))
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+    finally:
+        plt.close('all')
+        # 脚本可能把 stdout/stderr 包装成 UTF-8（TextIOWrapper），
+        # 先分离再丢弃，否则包装对象被回收时会关闭底层的缓冲区
+        for stream, original in ((sys.stdout, saved[3]), (sys.stderr, saved[4])):
+            if stream is not original and isinstance(stream, io.TextIOWrapper):
+                stream.flush()
+                stream.detach()
+        cwd, sys.argv, sys.path[:], sys.stdout, sys.stderr = saved
+        os.chdir(cwd)
+        # 本任务的导出记录已从 export_history 取得，清空待打印的记录，避免在常驻进程中累积
+        pop_export_log()
+
+    return {
+        'job': job.get('script') or job.get('chart'),
+        'seconds': time.perf_counter() - start,
+        'error': error,
+        'pid': os.getpid(),
+        'exports': export_history(mark),
+    }
+
+
+def load_authkey(path=AUTHKEY_PATH, create=False):
+    """
+    读取认证密钥
+
+    参数:
+        path: 密钥文件
+        create: 文件不存在时生成32字节随机密钥（权限 0600，只有当前用户可读写）
+
+    返回:
+        密钥字节串；文件不存在且 create=False 时返回 None
+    """
+    if create and not os.path.exists(path):
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        except FileExistsError:
+            pass
+        else:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(secrets.token_bytes(32))
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+class RenderDaemon:
+    """渲染守护进程"""
+
+    def __init__(self, address=DEFAULT_ADDRESS, workers=None, authkey_path=AUTHKEY_PATH):
+        """
+        参数:
+            address: 监听地址 (主机, 端口)
+            workers: 工作进程数（默认CPU核数）
+            authkey_path: 认证密钥文件（不存在时生成）
+        """
+        self.address = address
+        self.workers = workers or os.cpu_count() or 1
+        self.authkey = load_authkey(authkey_path, create=True)
+        self._stop = threading.Event()
+
+    def _handle(self, conn, executor):
+        try:
+            while True:
+                try:
+                    command, payload = conn.recv()
+                except EOFError:
+                    return
+                if command == 'ping':
+                    conn.send(('ok', {'workers': self.workers, 'pid': os.getpid()}))
+                elif command == 'run':
+                    futures = [executor.submit(_run_job, job) for job in payload]
+                    conn.send(('ok', [f.result() for f in futures]))
+                elif command == 'stop':
+                    conn.send(('ok', None))
+                    self._stop.set()
+                    # 唤醒 accept()
+                    try:
+                        Client(self.address, authkey=self.authkey).close()
+                    except OSError:
+                        pass
+                    return
+                else:
+                    conn.send(('error', f'未知命令: {command}'))
+        finally:
+            conn.close()
+
+    def serve(self):
+        """启动并阻塞，直到收到 stop 命令"""
+        with ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up) as executor:
+            # 预先启动全部工作进程，第一批任务就不用等导入
+            list(executor.map(time.sleep, [0] * self.workers))
+            print(f"渲染守护进程已启动: {self.address[0]}:{self.address[1]}，工作进程 {self.workers} 个")
+
+            with Listener(self.address, authkey=self.authkey) as listener:
+                while not self._stop.is_set():
+                    try:
+                        conn = listener.accept()
+                    except (OSError, AuthenticationError):
+                        # 密钥错误或握手中断的连接直接丢弃
+                        continue
+                    if self._stop.is_set():
+                        conn.close()
+                        break
+                    threading.Thread(target=self._handle, args=(conn, executor), daemon=True).start()
+        print("渲染守护进程已停止")
+
+
+def _request(command, payload=None, address=DEFAULT_ADDRESS):
+    authkey = load_authkey()
+    if authkey is None:
+        raise ConnectionRefusedError(f'没有认证密钥文件 {AUTHKEY_PATH}，守护进程未启动过')
+    with Client(address, authkey=authkey) as conn:
+        conn.send((command, payload))
+        status, result = conn.recv()
+    if status != 'ok':
+        raise RuntimeError(result)
+    return result
+
+
+def is_running(address=DEFAULT_ADDRESS):
+    """守护进程是否在运行"""
+    try:
+        _request('ping', address=address)
+        return True
+    except (OSError, AuthenticationError):
+        return False
+
+
+def submit(jobs, address=DEFAULT_ADDRESS):
+    """
+    提交任务并等待完成
+
+    参数:
+        jobs: 任务字典列表（见模块说明）
+
+    返回:
+        [{'job', 'seconds', 'error', 'pid', 'exports'}, ...]
+    """
+    return _request('run', list(jobs), address=address)
+
+
+def render_scripts(scripts, cwd=None, address=DEFAULT_ADDRESS):
+    """提交一批脚本（各自在 cwd 下运行）"""
+    cwd = os.path.abspath(cwd or os.getcwd())
+    return submit([{'script': os.path.abspath(s), 'cwd': cwd} for s in scripts], address=address)
+
+
+def stop(address=DEFAULT_ADDRESS):
+    """停止守护进程"""
+    _request('stop', address=address)
+
+
+def print_results(results, wall):
+    """打印任务结果"""
+    print("\n" + "=" * 60)
+    print("渲染任务报告")
+    print("=" * 60)
+    for r in results:
+        status = '[OK]' if r['error'] is None else f"[ERROR] {r['error']}"
+        size = sum(e[2] for e in r['exports'])
+        print(f"  {os.path.basename(r['job']):35s} {r['seconds']:7.2f}s  {len(r['exports']):2d}张 "
+              f"{size / 1024 / 1024:7.2f} MB  (pid {r['pid']}) {status}")
+    print(f"\n  实际耗时: {wall:.2f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='本地图表渲染守护进程')
+    parser.add_argument('--host', default=DEFAULT_ADDRESS[0])
+    parser.add_argument('--port', type=int, default=DEFAULT_ADDRESS[1])
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = sub.add_parser('serve', help='启动守护进程')
+    serve_parser.add_argument('--workers', type=int, default=None)
+
+    run_parser = sub.add_parser('run', help='提交脚本')
+    run_parser.add_argument('scripts', nargs='+')
+    run_parser.add_argument('--cwd', default=None, help='脚本的工作目录（默认当前目录）')
+
+    sub.add_parser('stop', help='停止守护进程')
+    sub.add_parser('status', help='查看守护进程状态')
+
+    args = parser.parse_args()
+    address = (args.host, args.port)
+
+    if args.command == 'serve':
+        RenderDaemon(address, workers=args.workers).serve()
+    elif args.command == 'run':
+        start = time.perf_counter()
+        results = render_scripts(args.scripts, cwd=args.cwd, address=address)
+        print_results(results, time.perf_counter() - start)
+    elif args.command == 'stop':
+        stop(address)
+        print("已发送停止命令")
+    else:
+        print("运行中" if is_running(address) else "未运行")
+
+
+if __name__ == "__main__":
+    main()
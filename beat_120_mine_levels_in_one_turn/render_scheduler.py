@@ -0,0 +1,188 @@
+"""
+并行图表渲染调度器
+Parallel Figure Rendering Scheduler
+
+功能：
+1. 把 AdvancedVisualizer 的各个绘图方法分发到进程池并行渲染（Agg后端）
+2. 数据只写一次到内存映射的Parquet文件（缺少pyarrow时用pickle），
+   每个工作进程启动时加载一次，任务之间不再序列化DataFrame；
+   分布摘要在主进程计算一次，以JSON文件传给工作进程
+3. 耗时最长的图表优先调度，整套图表的总耗时接近最慢的单张图
+4. 输出每张图表的渲染耗时，以及导出的字节数和编码耗时
+5. 当前的导出配置随任务传给工作进程（不依赖环境变量或fork继承）
+6. 有图表渲染失败时，打印报告后抛出 RenderError
+"""
+
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from dist_summary import save_profile
+from export_profiles import (PROFILES, get_export_profile, pop_export_log, print_export_report,
+                             register_profile, set_export_profile)
+
+
+# 工作进程内的可视化器（每个进程初始化一次）
+_worker_visualizer = None
+
+
+class RenderError(RuntimeError):
+    """有图表渲染失败"""
+
+    def __init__(self, results):
+        self.results = results
+        failed = [f'{method} ({error})' for method, _, error, _, _ in results if error is not None]
+        super().__init__(f"{len(failed)} 张图表渲染失败: {'; '.join(failed)}")
+
+
+def share_dataframe(df, path_prefix):
+    """
+    把数据写成工作进程可共享读取的文件
+
+    返回:
+        文件路径
+    """
+    try:
+        path = path_prefix + '.parquet'
+        df.to_parquet(path)
+    except ImportError:
+        path = path_prefix + '.pkl'
+        df.to_pickle(path)
+    return path
+
+
+def load_shared_dataframe(path):
+    """读取 share_dataframe 写出的文件（Parquet使用内存映射）"""
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path, memory_map=True)
+    return pd.read_pickle(path)
+
+
+def _use_export_profile(name, settings):
+    """在工作进程中启用主进程的导出配置（包括主进程中注册的自定义配置）"""
+    if PROFILES.get(name) != settings:
+        register_profile(name, **settings)
+    set_export_profile(name)
+
+
+def _init_worker(data_path, output_dir, pyramid_dir, use_figure_cache, profile_path, export_profile):
+    """工作进程初始化：切换到Agg后端，启用导出配置，加载一次数据"""
+    import matplotlib
+    matplotlib.use('Agg', force=True)
+    _use_export_profile(*export_profile)
+
+    from advanced_visualization import AdvancedVisualizer
+
+    global _worker_visualizer
+    df = load_shared_dataframe(data_path)
+    _worker_visualizer = AdvancedVisualizer(df, output_dir=output_dir, pyramid_dir=pyramid_dir,
+                                            use_figure_cache=use_figure_cache, profile=profile_path)
+
+
+def _run_task(method, args, kwargs, export_profile):
+    """在工作进程中执行一个绘图方法，返回 (方法名, 耗时, 错误信息, 进程号, 导出记录)"""
+    _use_export_profile(*export_profile)
+    start = time.perf_counter()
+    error = None
+    try:
+        getattr(_worker_visualizer, method)(*args, **kwargs)
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+    return method, time.perf_counter() - start, error, os.getpid(), pop_export_log()
+
+
+class RenderScheduler:
+    """图表渲染调度器"""
+
+    def __init__(self, visualizer, workers=None):
+        """
+        初始化
+
+        参数:
+            visualizer: AdvancedVisualizer 实例
+            workers: 进程数（默认CPU核数；为1时在当前进程中顺序执行）
+        """
+        self.visualizer = visualizer
+        self.workers = workers or os.cpu_count() or 1
+
+    def _run_inline(self, tasks):
+        results = []
+        for method, args, kwargs in tasks:
+            start = time.perf_counter()
+            error = None
+            try:
+                getattr(self.visualizer, method)(*args, **kwargs)
+            except Exception as e:
+                error = f'{type(e).__name__}: {e}'
+            results.append((method, time.perf_counter() - start, error, os.getpid(), pop_export_log()))
+        return results
+
+    def _run_pool(self, tasks):
+        # 时间索引数据先在主进程构建好聚合金字塔，工作进程直接从磁盘加载
+        self.visualizer.get_pyramid()
+        profile = self.visualizer.get_profile()
+
+        share_dir = tempfile.mkdtemp(prefix='render_')
+        try:
+            data_path = share_dataframe(self.visualizer.df, os.path.join(share_dir, 'data'))
+            # 分布摘要也只计算一次
+            profile_path = os.path.join(share_dir, 'profile.json')
+            save_profile(profile, profile_path)
+            export_profile = get_export_profile()
+            results = []
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(tasks)),
+                                     initializer=_init_worker,
+                                     initargs=(data_path, self.visualizer.output_dir,
+                                               self.visualizer.pyramid_dir,
+                                               self.visualizer.figure_cache is not None,
+                                               profile_path, export_profile)) as executor:
+                futures = [executor.submit(_run_task, method, args, kwargs, export_profile)
+                           for method, args, kwargs in tasks]
+                for future in as_completed(futures):
+                    results.append(future.result())
+            return results
+        finally:
+            shutil.rmtree(share_dir, ignore_errors=True)
+
+    def run(self, tasks, check=True):
+        """
+        执行渲染任务
+
+        参数:
+            tasks: [(方法名, args, kwargs), ...]，按预计耗时从高到低排列
+            check: 有任务失败时抛出 RenderError（其余图表照常渲染，报告照常打印）
+
+        返回:
+            [(方法名, 耗时秒, 错误信息或None, 进程号, 导出记录), ...]
+        """
+        start = time.perf_counter()
+        if self.workers == 1 or len(tasks) <= 1:
+            results = self._run_inline(tasks)
+        else:
+            results = self._run_pool(tasks)
+        wall = time.perf_counter() - start
+
+        self.print_report(results, wall)
+        if check and any(r[2] is not None for r in results):
+            raise RenderError(results)
+        return results
+
+    @staticmethod
+    def print_report(results, wall):
+        """打印每张图表的渲染耗时和导出报告"""
+        print("\n" + "=" * 60)
+        print("渲染耗时报告")
+        print("=" * 60)
+        for method, seconds, error, pid, _ in sorted(results, key=lambda r: -r[1]):
+            status = '[OK]' if error is None else f'[ERROR] {error}'
+            print(f"  {method:35s} {seconds:7.2f}s  (pid {pid}) {status}")
+
+        total = sum(r[1] for r in results)
+        slowest = max((r[1] for r in results), default=0)
+        print(f"\n  累计渲染时间: {total:.2f}s | 最慢单图: {slowest:.2f}s | 实际耗时: {wall:.2f}s")
+
+        print_export_report([entry for r in results for entry in r[4]])
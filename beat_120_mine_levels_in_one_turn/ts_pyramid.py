@@ -0,0 +1,339 @@
+"""
+多分辨率时间序列聚合金字塔
+Multi-resolution Time-series Aggregate Pyramid
+
+功能：
+1. 只扫描一次原始数据，生成小时级聚合（和、平方和、计数、最小值、最大值）
+2. 日、周、月级聚合由下一层合并得到，不再读取原始数据
+3. 持久化到磁盘（Parquet，缺少pyarrow时使用pickle），按数据指纹复用
+4. 按调用方需要的分辨率，自动选择最粗的可用层级
+"""
+
+import pandas as pd
+import numpy as np
+from pandas.tseries.frequencies import to_offset
+import hashlib
+import json
+import os
+
+
+# 层级定义: (名称, 重采样频率, 由哪一层合并得到)
+# 周不能整齐地嵌套进月，所以周和月都由日级合并
+LEVELS = [
+    ('hour', 'h', None),
+    ('day', 'D', 'hour'),
+    ('week', 'W', 'day'),
+    ('month', 'MS', 'day'),
+]
+
+# 每层保存的可合并统计量（均值和标准差由它们推导）
+STATS = ['sum', 'sumsq', 'count', 'min', 'max']
+MERGE_RULES = {'sum': 'sum', 'sumsq': 'sum', 'count': 'sum', 'min': 'min', 'max': 'max'}
+
+# 持久化时的列名分隔符: "<列名>::<统计量>"
+COLUMN_SEP = '::'
+
+
+def nominal_seconds(freq):
+    """
+    频率字符串的名义时长（秒）
+
+    月、周等非固定长度的偏移量按名义长度近似，仅用于层级比较
+    """
+    offset = to_offset(freq)
+    try:
+        return offset.nanos / 1e9
+    except ValueError:
+        pass
+
+    code = offset.rule_code.split('-')[0].upper()
+    nominal_days = [('SM', 15), ('BQ', 91), ('BM', 30), ('BY', 365), ('BA', 365),
+                    ('W', 7), ('Q', 91), ('M', 30), ('Y', 365), ('A', 365), ('B', 1)]
+    for prefix, days in nominal_days:
+        if code.startswith(prefix):
+            return offset.n * days * 86400.0
+    raise ValueError(f"无法识别的频率: {freq}")
+
+
+def dataset_fingerprint(df, columns=None):
+    """
+    计算数据指纹（索引 + 指定列的内容哈希），用于判断金字塔缓存是否可复用
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns.tolist()
+
+    h = hashlib.sha1()
+    h.update(json.dumps([str(c) for c in columns], ensure_ascii=False).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df[columns], index=True).values.tobytes())
+    return h.hexdigest()[:16]
+
+
+class TimeSeriesPyramid:
+    """时间序列聚合金字塔"""
+
+    def __init__(self, levels, columns, fingerprint=None):
+        """
+        初始化（一般通过 build / load / load_or_build 创建）
+
+        参数:
+            levels: {层级名称: 聚合DataFrame}，列为 (原始列, 统计量) 的MultiIndex
+            columns: 参与聚合的数值列
+            fingerprint: 数据指纹
+        """
+        self.levels = levels
+        self.columns = list(columns)
+        self.fingerprint = fingerprint
+
+    # ------------------------------------------------------------------
+    # 构建
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _aggregate_raw(frame):
+        """对原始数据做唯一一次扫描，得到小时级部分聚合"""
+        values = frame.astype('float64')
+        keys = values.index.floor('h')
+        grouped = values.groupby(keys)
+
+        parts = {
+            'sum': grouped.sum(),
+            'sumsq': (values ** 2).groupby(keys).sum(),
+            'count': grouped.count(),
+            'min': grouped.min(),
+            'max': grouped.max(),
+        }
+        return TimeSeriesPyramid._assemble(parts)
+
+    @staticmethod
+    def _assemble(parts):
+        """把 {统计量: DataFrame} 拼成 (列, 统计量) 的MultiIndex表"""
+        out = pd.concat(parts, axis=1).swaplevel(axis=1).sort_index(axis=1)
+        counts = out.xs('count', axis=1, level=1)
+        return out[counts.sum(axis=1) > 0]
+
+    @staticmethod
+    def _merge(frame, freq):
+        """把某一层按更粗的频率合并（只用可合并统计量，结果是精确的）"""
+        parts = {}
+        for stat in STATS:
+            sub = frame.xs(stat, axis=1, level=1)
+            parts[stat] = sub.resample(freq).agg(MERGE_RULES[stat])
+        return TimeSeriesPyramid._assemble(parts)
+
+    @staticmethod
+    def _combine(partials):
+        """合并多个分块的小时级部分聚合（分块时间上可以重叠）"""
+        stacked = pd.concat(partials).sort_index()
+        parts = {}
+        for stat in STATS:
+            sub = stacked.xs(stat, axis=1, level=1)
+            parts[stat] = sub.groupby(level=0).agg(MERGE_RULES[stat])
+        return TimeSeriesPyramid._assemble(parts)
+
+    @classmethod
+    def _from_hour_level(cls, hour, columns, fingerprint):
+        levels = {'hour': hour}
+        for name, freq, parent in LEVELS[1:]:
+            levels[name] = cls._merge(levels[parent], freq)
+        return cls(levels, columns, fingerprint)
+
+    @classmethod
+    def build(cls, df, columns=None):
+        """
+        由带时间索引的DataFrame构建金字塔
+
+        参数:
+            df: 索引为DatetimeIndex的数据
+            columns: 参与聚合的列（默认全部数值列）
+        """
+        if not isinstance(df.index, pd.DatetimeIndex):
+            raise ValueError("构建聚合金字塔需要DatetimeIndex")
+
+        if columns is None:
+            columns = df.select_dtypes(include=[np.number]).columns.tolist()
+
+        hour = cls._aggregate_raw(df[columns])
+        return cls._from_hour_level(hour, columns, dataset_fingerprint(df, columns))
+
+    @classmethod
+    def build_from_chunks(cls, chunks, columns=None):
+        """
+        由多个分块（例如 read_csv(chunksize=...) 或多个文件）构建金字塔
+
+        参数:
+            chunks: 可迭代的DataFrame分块，每块都需要DatetimeIndex
+            columns: 参与聚合的列（默认取第一块的数值列）
+        """
+        partials = []
+        for chunk in chunks:
+            if columns is None:
+                columns = chunk.select_dtypes(include=[np.number]).columns.tolist()
+            partials.append(cls._aggregate_raw(chunk[columns]))
+
+        if not partials:
+            raise ValueError("没有可用的数据分块")
+
+        return cls._from_hour_level(cls._combine(partials), columns, None)
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def choose_level(self, resolution=None, min_points=None, start=None, end=None):
+        """
+        选择满足要求的最粗层级
+
+        参数:
+            resolution: 需要的时间分辨率（如 'D'、'W'），层级不能比它更粗
+            min_points: 查询范围内至少需要的行数（例如图表的像素宽度）
+
+        返回:
+            层级名称；请求的分辨率比小时还细时返回None
+        """
+        allowed = [(name, freq) for name, freq, _ in LEVELS]
+        if resolution is not None:
+            need = nominal_seconds(resolution)
+            allowed = [(name, freq) for name, freq in allowed if nominal_seconds(freq) <= need]
+            if not allowed:
+                return None
+
+        # 从粗到细依次尝试
+        for name, freq in reversed(allowed):
+            if min_points is None:
+                return name
+            if len(self.levels[name].loc[start:end]) >= min_points:
+                return name
+
+        return allowed[0][0]
+
+    @staticmethod
+    def _extract(frame, stat, columns):
+        """从合并统计量推导需要的统计值"""
+        if stat in ('sum', 'count', 'min', 'max'):
+            return frame.xs(stat, axis=1, level=1)[columns]
+
+        sums = frame.xs('sum', axis=1, level=1)[columns]
+        counts = frame.xs('count', axis=1, level=1)[columns].replace(0, np.nan)
+        if stat == 'mean':
+            return sums / counts
+        if stat == 'std':
+            sumsq = frame.xs('sumsq', axis=1, level=1)[columns]
+            var = (sumsq - sums ** 2 / counts) / (counts - 1)
+            return np.sqrt(var.clip(lower=0))
+        raise ValueError(f"不支持的统计量: {stat}")
+
+    def query(self, columns=None, resolution=None, stat='mean', min_points=None,
+              start=None, end=None):
+        """
+        查询聚合结果
+
+        参数:
+            columns: 需要的列（默认全部）
+            resolution: 时间分辨率；与层级频率不一致时从所选层级精确合并
+            stat: 'mean'、'std'、'sum'、'count'、'min' 或 'max'
+            min_points: 至少需要的行数
+            start, end: 时间范围
+
+        返回:
+            以时间为索引、每列一个统计值的DataFrame
+        """
+        if columns is None:
+            columns = self.columns
+
+        name = self.choose_level(resolution, min_points, start, end)
+        if name is None:
+            raise ValueError(f"请求的分辨率 {resolution} 比金字塔最细层级（小时）更细")
+
+        frame = self.levels[name].loc[start:end, list(columns)]
+
+        level_freq = dict((n, f) for n, f, _ in LEVELS)[name]
+        if resolution is not None and to_offset(resolution) != to_offset(level_freq):
+            frame = self._merge(frame, resolution)
+
+        return self._extract(frame, stat, list(columns))
+
+    def total(self, columns=None, stat='mean'):
+        """整个数据集的统计值（由月级合并，不读取原始数据）"""
+        if columns is None:
+            columns = self.columns
+
+        frame = self.levels['month']
+        parts = {}
+        for s in STATS:
+            sub = frame.xs(s, axis=1, level=1)
+            parts[s] = sub.agg(MERGE_RULES[s]).to_frame().T
+        merged = pd.concat(parts, axis=1).swaplevel(axis=1).sort_index(axis=1)
+        return self._extract(merged, stat, list(columns)).iloc[0]
+
+    # ------------------------------------------------------------------
+    # 持久化
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """保存到目录（每层一个文件 + meta.json）"""
+        os.makedirs(path, exist_ok=True)
+
+        file_format = None
+        for name, frame in self.levels.items():
+            flat = frame.copy()
+            flat.columns = [f'{col}{COLUMN_SEP}{stat}' for col, stat in frame.columns]
+            try:
+                flat.to_parquet(os.path.join(path, f'{name}.parquet'))
+                file_format = 'parquet'
+            except ImportError:
+                flat.to_pickle(os.path.join(path, f'{name}.pkl'))
+                file_format = 'pkl'
+
+        meta = {
+            'columns': [str(c) for c in self.columns],
+            'fingerprint': self.fingerprint,
+            'format': file_format,
+            'rows': {name: len(frame) for name, frame in self.levels.items()},
+        }
+        with open(os.path.join(path, 'meta.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path):
+        """从目录加载"""
+        with open(os.path.join(path, 'meta.json'), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+
+        levels = {}
+        for name, _, _ in LEVELS:
+            file_path = os.path.join(path, f"{name}.{meta['format']}")
+            if meta['format'] == 'parquet':
+                flat = pd.read_parquet(file_path)
+            else:
+                flat = pd.read_pickle(file_path)
+            flat.columns = pd.MultiIndex.from_tuples(
+                [tuple(c.rsplit(COLUMN_SEP, 1)) for c in flat.columns])
+            levels[name] = flat
+
+        return cls(levels, meta['columns'], meta['fingerprint'])
+
+    @classmethod
+    def load_or_build(cls, df, cache_dir, columns=None):
+        """
+        按数据指纹加载已持久化的金字塔，不存在时构建并保存
+
+        参数:
+            df: 索引为DatetimeIndex的数据
+            cache_dir: 金字塔缓存根目录（每个数据指纹一个子目录）
+            columns: 参与聚合的列
+        """
+        if columns is None:
+            columns = df.select_dtypes(include=[np.number]).columns.tolist()
+
+        fingerprint = dataset_fingerprint(df, columns)
+        path = os.path.join(cache_dir, fingerprint)
+
+        if os.path.exists(os.path.join(path, 'meta.json')):
+            print(f"[OK] 加载聚合金字塔: {path}")
+            return cls.load(path)
+
+        pyramid = cls.build(df, columns)
+        pyramid.save(path)
+        rows = ', '.join(f'{name}={len(frame)}' for name, frame in pyramid.levels.items())
+        print(f"[OK] 构建聚合金字塔: {path} ({rows})")
+        return pyramid
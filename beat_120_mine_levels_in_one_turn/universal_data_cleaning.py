@@ -18,6 +18,9 @@ import seaborn as sns
 from datetime import datetime
 import os
 import warnings
+
+from export_profiles import save_figure
+
 warnings.filterwarnings('ignore')
 
 # 设置中文显示
@@ -472,10 +475,10 @@ class UniversalDataCleaner:
         
         # 保存图表
         viz_file = os.path.join(self.output_dir, 'cleaning_visualization.png')
-        plt.savefig(viz_file, dpi=300, bbox_inches='tight')
+        saved = save_figure(viz_file)
         plt.close()
         
-        print(f"[OK] 可视化报告已保存: {viz_file}")
+        print(f"[OK] 可视化报告已保存: {saved}")
     
     def save_cleaned_data(self, filename='cleaned_data.csv'):
         """
@@ -0,0 +1,178 @@
+"""
+可续爬的URL队列
+Persistent URL Frontier with Dedup and Checkpoints
+
+功能：
+1. 优先级队列：priority 小的先取，相同时按加入顺序
+2. 去重：所有见过的URL（待爬、已爬、失败）都记录在SQLite中（URL为唯一键），
+   同一URL只会入队一次；比较前去掉 #片段、协议和主机名转小写
+3. 每个页面的抽取结果与"已爬"状态在同一个事务中保存
+4. 检查点：每 checkpoint_every 个页面或 checkpoint_interval 秒提交一次；
+   中断后重新打开同一文件即从上个检查点继续，检查点之后的页面会重新爬取（结果不会重复），
+   上次获取失败的页面（超时、服务器错误等）重新入队
+5. stats() / summary() 统计待爬、已爬、失败的URL数和结果条数
+
+用法:
+    with URLFrontier('data/crawl_state.sqlite') as frontier:
+        frontier.add_many(seed_urls)
+        while (entry := frontier.pop()) is not None:
+            url, depth = entry
+            records, links = fetch_and_parse(url)
+            frontier.add_many(links, priority=depth + 1, depth=depth + 1)
+            frontier.done(url, records)
+        data = list(frontier.iter_results())
+"""
+
+import heapq
+import json
+import sqlite3
+import time
+from urllib.parse import urldefrag, urlsplit, urlunsplit
+
+
+QUEUED, DONE, FAILED = 0, 1, 2
+
+
+def normalize_url(url):
+    """去重用的URL形式：去掉 #片段，协议和主机名转小写"""
+    parts = urlsplit(urldefrag(url).url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/',
+                       parts.query, ''))
+
+
+class URLFrontier:
+    """URL队列（SQLite持久化的去重集合 + 内存中的优先级堆）"""
+
+    def __init__(self, path=':memory:', checkpoint_every=20, checkpoint_interval=30.0,
+                 retry_failed=True):
+        """
+        参数:
+            path: SQLite数据库文件（':memory:' 表示只去重、不可续爬）
+            checkpoint_every: 每完成多少个页面提交一次检查点
+            checkpoint_interval: 距上次检查点超过多少秒时提交
+            retry_failed: 续爬时把之前失败的URL重新入队
+        """
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self._db = sqlite3.connect(path)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS urls (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE,
+                priority REAL,
+                depth INTEGER,
+                state INTEGER,
+                error TEXT
+            );
+            CREATE TABLE IF NOT EXISTS results (
+                id INTEGER PRIMARY KEY,
+                url_id INTEGER,
+                record TEXT
+            );""")
+        if retry_failed:
+            self._db.execute("UPDATE urls SET state = ?, error = NULL WHERE state = ?", (QUEUED, FAILED))
+        self._db.commit()
+        # 待爬URL的内存堆: (priority, id, url, depth)
+        self._heap = [tuple(row) for row in self._db.execute(
+            "SELECT priority, id, url, depth FROM urls WHERE state = ?", (QUEUED,))]
+        heapq.heapify(self._heap)
+        self.resumed = self.stats()['seen'] > 0
+        self._pending = 0
+        self._last_checkpoint = time.monotonic()
+
+    def add(self, url, priority=0, depth=0):
+        """
+        加入一个URL
+
+        返回:
+            是否为新URL（见过的URL不会再次入队）
+        """
+        url = normalize_url(url)
+        cursor = self._db.execute(
+            "INSERT OR IGNORE INTO urls (url, priority, depth, state) VALUES (?, ?, ?, ?)",
+            (url, priority, depth, QUEUED))
+        if cursor.rowcount != 1:
+            return False
+        heapq.heappush(self._heap, (priority, cursor.lastrowid, url, depth))
+        return True
+
+    def add_many(self, urls, priority=0, depth=0):
+        """加入一组URL，返回其中新URL的个数"""
+        return sum(self.add(url, priority, depth) for url in urls)
+
+    def pop(self):
+        """
+        取出优先级最高的待爬URL
+
+        返回:
+            (url, depth)，队列为空时返回 None
+        """
+        if not self._heap:
+            return None
+        _, _, url, depth = heapq.heappop(self._heap)
+        return url, depth
+
+    def done(self, url, records=()):
+        """记录页面已爬及其抽取结果"""
+        url = normalize_url(url)
+        url_id = self._db.execute("SELECT id FROM urls WHERE url = ?", (url,)).fetchone()[0]
+        self._db.executemany("INSERT INTO results (url_id, record) VALUES (?, ?)",
+                             ((url_id, json.dumps(record, ensure_ascii=False)) for record in records))
+        self._db.execute("UPDATE urls SET state = ? WHERE id = ?", (DONE, url_id))
+        self._maybe_checkpoint()
+
+    def failed(self, url, error=''):
+        """记录页面获取失败（本次运行不再重试，续爬时按 retry_failed 重新入队）"""
+        self._db.execute("UPDATE urls SET state = ?, error = ? WHERE url = ?",
+                         (FAILED, str(error), normalize_url(url)))
+        self._maybe_checkpoint()
+
+    def _maybe_checkpoint(self):
+        self._pending += 1
+        if (self._pending >= self.checkpoint_every
+                or time.monotonic() - self._last_checkpoint >= self.checkpoint_interval):
+            self.checkpoint()
+
+    def checkpoint(self):
+        """提交检查点（队列、去重集合和结果）"""
+        self._db.commit()
+        self._pending = 0
+        self._last_checkpoint = time.monotonic()
+
+    def iter_results(self):
+        """按爬取顺序逐条返回全部抽取结果（包括之前中断的运行）"""
+        for (record,) in self._db.execute("SELECT record FROM results ORDER BY id"):
+            yield json.loads(record)
+
+    def stats(self):
+        """
+        返回:
+            字典: seen, queued, done, failed（URL数）, results（结果条数）
+        """
+        counts = dict(self._db.execute("SELECT state, COUNT(*) FROM urls GROUP BY state"))
+        return {
+            'seen': sum(counts.values()),
+            'queued': counts.get(QUEUED, 0),
+            'done': counts.get(DONE, 0),
+            'failed': counts.get(FAILED, 0),
+            'results': self._db.execute("SELECT COUNT(*) FROM results").fetchone()[0],
+        }
+
+    def summary(self):
+        s = self.stats()
+        return (f"URL: 已见 {s['seen']} | 待爬 {s['queued']} | 已爬 {s['done']} | "
+                f"失败 {s['failed']} | 结果 {s['results']} 条")
+
+    def __len__(self):
+        return len(self._heap)
+
+    def close(self):
+        self.checkpoint()
+        self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -7,6 +7,13 @@ import numpy as np
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
 from matplotlib import cm
+import os
+import sys
+
+# 三维场景图按 FIGURE_PROFILE 导出（vector 配置下稠密对象自动栅格化）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from export_profiles import save_figure
 
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']
@@ -73,8 +80,8 @@ ax.legend(loc='upper left')
 ax.view_init(elev=20, azim=45)
 
 plt.tight_layout()
-plt.savefig('Day1_3D_Visualization/output_1_multi_object_scene.png', dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_1_multi_object_scene.png")
+saved = save_figure('Day1_3D_Visualization/output_1_multi_object_scene.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # ============================================================================
@@ -126,8 +133,8 @@ ax.legend(loc='upper left')
 ax.view_init(elev=25, azim=45)
 
 plt.tight_layout()
-plt.savefig('Day1_3D_Visualization/output_2_3d_path.png', dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_2_3d_path.png")
+saved = save_figure('Day1_3D_Visualization/output_2_3d_path.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # ============================================================================
@@ -181,8 +188,8 @@ ax2.set_title('三维向量场', fontsize=14, fontweight='bold')
 ax2.view_init(elev=25, azim=45)
 
 plt.tight_layout()
-plt.savefig('Day1_3D_Visualization/output_3_contour_vector.png', dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_3_contour_vector.png")
+saved = save_figure('Day1_3D_Visualization/output_3_contour_vector.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # ============================================================================
@@ -224,8 +231,8 @@ ax.set_title('三维体绘制示例（球体+立方体）', fontsize=16, fontwei
 ax.view_init(elev=20, azim=45)
 
 plt.tight_layout()
-plt.savefig('Day1_3D_Visualization/output_4_voxel.png', dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_4_voxel.png")
+saved = save_figure('Day1_3D_Visualization/output_4_voxel.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 print("\n" + "=" * 60)
@@ -6,6 +6,13 @@ Day 2 - 任务2.3: 其他高级二维图表
 import numpy as np
 import matplotlib.pyplot as plt
 import plotly.graph_objects as go
+import os
+import sys
+
+# 雷达图、极坐标图通过 save_figure 保存
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from export_profiles import save_figure
 
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']
@@ -60,8 +67,8 @@ ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), fontsize=12)
 ax.grid(True, linestyle='--', alpha=0.7)
 
 plt.tight_layout()
-plt.savefig('Day2_Advanced_2D/output_1_radar_chart.png', dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_1_radar_chart.png")
+saved = save_figure('Day2_Advanced_2D/output_1_radar_chart.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # 使用Plotly创建交互式雷达图
@@ -149,8 +156,8 @@ for angle, temp, hour in zip(theta, temperature, hours):
                 ha='center', va='bottom', fontsize=9)
 
 plt.tight_layout()
-plt.savefig('Day2_Advanced_2D/output_2_polar_chart.png', dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_2_polar_chart.png")
+saved = save_figure('Day2_Advanced_2D/output_2_polar_chart.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # ============================================================================
@@ -193,8 +200,8 @@ ax.text(0, -wind_speed.max() * 0.15,
         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
 
 plt.tight_layout()
-plt.savefig('Day2_Advanced_2D/output_3_polar_scatter.png', dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_3_polar_scatter.png")
+saved = save_figure('Day2_Advanced_2D/output_3_polar_scatter.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # 使用Plotly创建交互式极坐标图
@@ -0,0 +1,158 @@
+"""
+豆瓣Top250页面解析基准
+Benchmark: BeautifulSoup(html.parser) + find/find_all vs compiled CSS rules on each backend
+
+用法:
+    python bench_html_parse.py             # 使用 fixtures/ 下保存的页面（没有时按豆瓣页面结构生成）
+    python bench_html_parse.py --save      # 先从豆瓣抓取10页Top250保存到 fixtures/
+    python bench_html_parse.py --repeat 20 # 每个后端重复解析的轮数
+"""
+
+import argparse
+import glob
+import os
+import random
+import time
+
+from bs4 import BeautifulSoup
+
+from task1_web_scraper import DoubanMovieCrawler
+from html_parsers import available_backends
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def fixture_path(start):
+    return os.path.join(FIXTURE_DIR, f'douban_top250_{start:03d}.html')
+
+
+def save_fixtures(crawler):
+    """抓取10页Top250保存为fixtures"""
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    starts = list(range(0, 250, 25))
+    for start, html in zip(starts, crawler.get_pages(starts)):
+        if html:
+            with open(fixture_path(start), 'w', encoding='utf-8') as f:
+                f.write(html)
+    print(f"  {crawler.scheduler.summary()}")
+
+
+def _render_item(rank, rng):
+    """按豆瓣Top250页面的结构生成一个条目"""
+    rating = round(rng.uniform(8.3, 9.7), 1)
+    return f"""
+        <li>
+            <div class="item">
+                <div class="pic">
+                    <em class="">{rank}</em>
+                    <a href="https://movie.douban.com/subject/{1290000 + rank}/">
+                        <img width="100" alt="电影{rank}" src="https://img1.doubanio.com/view/photo/s_ratio_poster/public/p{480000 + rank}.jpg" class="">
+                    </a>
+                </div>
+                <div class="info">
+                    <div class="hd">
+                        <a href="https://movie.douban.com/subject/{1290000 + rank}/" class="">
+                            <span class="title">电影{rank}</span>
+                            <span class="title">&nbsp;/&nbsp;Movie {rank}</span>
+                            <span class="other">&nbsp;/&nbsp;别名{rank}(港)  /  别名{rank}(台)</span>
+                        </a>
+                        <span class="playable">[可播放]</span>
+                    </div>
+                    <div class="bd">
+                        <p class="">
+                            导演: 导演{rank} Director {rank}&nbsp;&nbsp;&nbsp;主演: 主演{rank} Actor {rank} /...<br>
+                            {rng.randint(1950, 2020)}&nbsp;/&nbsp;美国&nbsp;/&nbsp;犯罪 剧情
+                        </p>
+                        <div class="star">
+                            <span class="rating{int(rating // 1)}-t"></span>
+                            <span class="rating_num" property="v:average">{rating}</span>
+                            <span property="v:best" content="10.0"></span>
+                            <span>{rng.randint(100000, 3000000)}人评价</span>
+                        </div>
+                        <p class="quote">
+                            <span class="inq">这是第{rank}部电影的引言。</span>
+                        </p>
+                    </div>
+                </div>
+            </div>
+        </li>"""
+
+
+def generate_fixtures(seed=0):
+    """没有保存的页面时，按豆瓣页面结构（含导航、脚本等页面框架）生成10页"""
+    rng = random.Random(seed)
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    chrome = ''.join(f'<li><a href="https://www.douban.com/link{i}">导航链接{i}</a></li>' for i in range(120))
+    script = '<script type="text/javascript">' + 'var _data = {"k": "v"};' * 400 + '</script>'
+    for start in range(0, 250, 25):
+        items = ''.join(_render_item(rank, rng) for rank in range(start + 1, start + 26))
+        html = (f'<!DOCTYPE html><html lang="zh-CN"><head><meta charset="utf-8"><title>豆瓣电影 Top 250</title>'
+                f'{script}</head><body><div id="db-global-nav"><ul>{chrome}</ul></div>'
+                f'<div id="content"><h1>豆瓣电影 Top 250</h1><div class="article">'
+                f'<ol class="grid_view">{items}</ol></div></div>{script}</body></html>')
+        with open(fixture_path(start), 'w', encoding='utf-8') as f:
+            f.write(html)
+
+
+def parse_page_findall(html):
+    """旧实现：html.parser 建树后逐条 find / find_all"""
+    soup = BeautifulSoup(html, 'html.parser')
+    page_movies = []
+    for item in soup.find_all('div', class_='item'):
+        info = item.find('div', class_='bd').find('p').text.strip()
+        info_lines = [line.strip() for line in info.split('\n') if line.strip()]
+        quote_tag = item.find('span', class_='inq')
+        page_movies.append({
+            '电影名称': item.find('span', class_='title').text,
+            '评分': float(item.find('span', class_='rating_num').text),
+            '评价人数': int(item.find('div', class_='star').find_all('span')[-1].text.replace('人评价', '')),
+            '导演和主演': info_lines[0] if info_lines else '',
+            '年份和类型': info_lines[1] if len(info_lines) > 1 else '',
+            '引言': quote_tag.text if quote_tag else '',
+        })
+    return page_movies
+
+
+def bench(parse, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        movies = [movie for html in pages for movie in parse(html)]
+    return movies, (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description='豆瓣Top250页面解析基准')
+    parser.add_argument('--save', action='store_true', help='先从豆瓣抓取页面保存到 fixtures/')
+    parser.add_argument('--repeat', type=int, default=5, help='每个后端重复解析的轮数')
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures(DoubanMovieCrawler())
+    paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, 'douban_top250_*.html')))
+    if not paths:
+        print("fixtures/ 下没有保存的页面，按豆瓣页面结构生成10页")
+        generate_fixtures()
+        paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, 'douban_top250_*.html')))
+    pages = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            pages.append(f.read())
+
+    print("=" * 80)
+    print(f"解析 {len(pages)} 页（{sum(map(len, pages)) / 1024:.0f} KB），每种方式 {args.repeat} 轮取平均")
+    print("=" * 80)
+
+    baseline, base_time = bench(parse_page_findall, pages, args.repeat)
+    print(f"  {'html.parser + find':<22} {base_time * 1000:8.1f} ms | {len(baseline)} 部电影")
+    for name in available_backends():
+        crawler = DoubanMovieCrawler(parser=name)
+        movies, seconds = bench(crawler.parse_page, pages, args.repeat)
+        status = '输出一致' if movies == baseline else '输出不一致!'
+        print(f"  {'规则 + ' + name:<22} {seconds * 1000:8.1f} ms | 加速 {base_time / seconds:5.1f}x | {status}")
+    missing = sorted(set(['selectolax', 'lxml']) - set(available_backends()))
+    if missing:
+        print(f"\n未安装的后端: {', '.join(missing)}（pip install selectolax / lxml）")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,21 @@ Day 3 - 任务3.1: 爬虫项目实战
 完整的爬虫项目：爬取豆瓣电影Top250
 """
 
+import os
+import sys
+import time
 import requests
-from bs4 import BeautifulSoup
+import numpy as np
 import pandas as pd
-import time
 import json
 from datetime import datetime
 
+# 共用工具目录（自适应限速抓取、HTML抽取规则、分块模拟数据生成）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from crawl_engine import FetchScheduler
+from html_parsers import Field, ParseRules
+from mock_data import generate, numbered, write_chunks
+
 print("=" * 60)
 print("Day 3 - 任务3.1: 爬虫项目实战")
 print("项目：爬取豆瓣电影Top250")
@@ -28,65 +36,78 @@ print("存储格式: CSV和JSON")
 # 2. 爬虫实现
 # ============================================================================
 
+# 豆瓣Top250页面的抽取规则（每部电影一个 div.item）
+DOUBAN_ITEM = 'div.item'
+DOUBAN_FIELDS = {
+    '电影名称': Field('span.title', default=None),
+    '评分': Field('span.rating_num', default=None),
+    '评价人数': Field('div.star span', index=-1, default=None),
+    '信息': Field('div.bd p'),
+    '引言': Field('span.inq'),
+}
+
+
 class DoubanMovieCrawler:
     """豆瓣电影爬虫类"""
     
-    def __init__(self):
+    def __init__(self, concurrency=4, delay=0.5, parser='auto'):
+        """
+        参数:
+            concurrency: 同时请求的页数上限（被限流时自动降低，之后逐步恢复）
+            delay: 同一主机两次请求之间的最小间隔秒数（0 表示不额外等待，速率上限为每秒1000次，
+                   被限流时仍会自动降低）
+            parser: HTML解析后端（auto / selectolax / lxml / soup）
+        """
         self.base_url = "https://movie.douban.com/top250"
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
+        self.concurrency = concurrency
+        self.delay = delay
+        self.scheduler = FetchScheduler(rate=1 / max(delay, 0.001), max_connections=concurrency,
+                                        initial_concurrency=concurrency, headers=self.headers, timeout=10)
+        self.rules = ParseRules(DOUBAN_ITEM, DOUBAN_FIELDS, backend=parser)
         self.movies = []
         
-    def get_page(self, start):
-        """获取单页数据"""
-        try:
-            params = {'start': start, 'filter': ''}
-            response = requests.get(self.base_url, headers=self.headers, 
-                                   params=params, timeout=10)
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            print(f"  ✗ 请求失败: {e}")
-            return None
+    def get_pages(self, starts):
+        """
+        并发获取多页（页面之间没有依赖，请求同时发出）
+        
+        参数:
+            starts: 各页的 start 参数
+        
+        返回:
+            与 starts 顺序相同的页面HTML列表，获取失败的页为 None
+        """
+        params = [{'start': start, 'filter': ''} for start in starts]
+        responses = self.scheduler.get_many([self.base_url] * len(starts), params=params)
+        pages = []
+        for start, response in zip(starts, responses):
+            if isinstance(response, requests.RequestException):
+                print(f"  ✗ 请求失败 (start={start}): {response}")
+                pages.append(None)
+            else:
+                pages.append(response.text)
+        return pages
     
     def parse_page(self, html):
-        """解析页面数据"""
-        soup = BeautifulSoup(html, 'html.parser')
-        items = soup.find_all('div', class_='item')
-        
+        """解析页面数据（抽取规则在创建爬虫时已编译）"""
         page_movies = []
-        for item in items:
+        for item in self.rules.parse(html):
             try:
-                # 电影名称
-                title = item.find('span', class_='title').text
-                
-                # 评分
-                rating = item.find('span', class_='rating_num').text
-                
-                # 评价人数
-                rating_people = item.find('div', class_='star').find_all('span')[-1].text
-                rating_people = rating_people.replace('人评价', '')
-                
-                # 导演和主演
-                info = item.find('div', class_='bd').find('p').text.strip()
-                info_lines = [line.strip() for line in info.split('\n') if line.strip()]
-                director_actors = info_lines[0] if info_lines else ''
+                if item['电影名称'] is None:
+                    raise ValueError('缺少电影名称')
                 
-                # 年份和类型
-                year_type = info_lines[1] if len(info_lines) > 1 else ''
-                
-                # 引言
-                quote_tag = item.find('span', class_='inq')
-                quote = quote_tag.text if quote_tag else ''
+                # 导演和主演、年份和类型分别在信息的第1、2行
+                info_lines = [line.strip() for line in item['信息'].split('\n') if line.strip()]
                 
                 movie = {
-                    '电影名称': title,
-                    '评分': float(rating),
-                    '评价人数': int(rating_people),
-                    '导演和主演': director_actors,
-                    '年份和类型': year_type,
-                    '引言': quote
+                    '电影名称': item['电影名称'],
+                    '评分': float(item['评分']),
+                    '评价人数': int(item['评价人数'].replace('人评价', '')),
+                    '导演和主演': info_lines[0] if info_lines else '',
+                    '年份和类型': info_lines[1] if len(info_lines) > 1 else '',
+                    '引言': item['引言']
                 }
                 page_movies.append(movie)
                 
@@ -100,13 +121,14 @@ class DoubanMovieCrawler:
         """执行爬取"""
         print("\n[步骤2] 开始爬取数据...")
         
-        # 豆瓣Top250共10页，每页25部电影
-        for page in range(10):
-            start = page * 25
-            print(f"\n正在爬取第 {page + 1}/10 页 (start={start})...")
-            
-            # 获取页面
-            html = self.get_page(start)
+        # 豆瓣Top250共10页，每页25部电影；各页URL事先已知，并发获取后按排名顺序合并
+        starts = list(range(0, 250, 25))
+        print(f"\n并发爬取 {len(starts)} 页（最多同时 {self.concurrency} 页，同一主机请求间隔 {self.delay}s）...")
+        begin = time.perf_counter()
+        pages = self.get_pages(starts)
+        seconds = time.perf_counter() - begin
+        
+        for page, html in enumerate(pages):
             if not html:
                 print(f"  ✗ 第{page + 1}页获取失败，跳过")
                 continue
@@ -114,14 +136,17 @@ class DoubanMovieCrawler:
             # 解析数据
             page_movies = self.parse_page(html)
             self.movies.extend(page_movies)
-            print(f"  ✓ 成功爬取 {len(page_movies)} 部电影")
-            
-            # 礼貌性延迟
-            time.sleep(1)
+            print(f"  ✓ 第{page + 1}页: 成功爬取 {len(page_movies)} 部电影")
         
         print(f"\n✓ 爬取完成！共获取 {len(self.movies)} 部电影数据")
+        print(f"  耗时 {seconds:.1f}s（各页请求耗时合计 {self.scheduler.engine.stats['seconds']:.1f}s）")
+        print(f"  {self.scheduler.summary()}")
         return self.movies
     
+    def close(self):
+        """关闭抓取调度器（后台事件循环和连接池）"""
+        self.scheduler.close()
+    
     def save_data(self):
         """保存数据"""
         print("\n[步骤3] 保存数据...")
@@ -195,7 +220,10 @@ if __name__ == "__main__":
     crawler = DoubanMovieCrawler()
     
     # 执行爬取
-    movies = crawler.crawl()
+    try:
+        movies = crawler.crawl()
+    finally:
+        crawler.close()
     
     # 保存数据
     if movies:
@@ -215,41 +243,68 @@ if __name__ == "__main__":
 # 备注：如果豆瓣网站无法访问，可以使用模拟数据
 # ============================================================================
 
-def generate_mock_data():
-    """生成模拟数据（用于演示）"""
-    print("\n[备用方案] 生成模拟数据...")
-    
-    import random
-    
-    movie_names = [
-        '肖申克的救赎', '霸王别姬', '阿甘正传', '泰坦尼克号', '这个杀手不太冷',
-        '美丽人生', '千与千寻', '辛德勒的名单', '盗梦空间', '忠犬八公的故事',
-        '海上钢琴师', '三傻大闹宝莱坞', '放牛班的春天', '楚门的世界', '大话西游',
-        '教父', '龙猫', '当幸福来敲门', '怦然心动', '触不可及'
-    ]
-    
-    movies = []
-    for i, name in enumerate(movie_names):
-        movie = {
-            '电影名称': name,
-            '评分': round(random.uniform(8.5, 9.7), 1),
-            '评价人数': random.randint(100000, 2000000),
-            '导演和主演': f'导演{i+1} / 主演{i+1}',
-            '年份和类型': f'{random.randint(1990, 2020)} / 剧情',
-            '引言': f'这是一部优秀的电影{i+1}'
-        }
-        movies.append(movie)
+MOCK_MOVIE_NAMES = [
+    '肖申克的救赎', '霸王别姬', '阿甘正传', '泰坦尼克号', '这个杀手不太冷',
+    '美丽人生', '千与千寻', '辛德勒的名单', '盗梦空间', '忠犬八公的故事',
+    '海上钢琴师', '三傻大闹宝莱坞', '放牛班的春天', '楚门的世界', '大话西游',
+    '教父', '龙猫', '当幸福来敲门', '怦然心动', '触不可及'
+]
+
+
+def make_mock_chunk(rng, start, n):
+    """生成第 start 部起的 n 部模拟电影（整列生成；前20部使用真实片名，之后为"电影N"）"""
+    number = np.arange(start + 1, start + n + 1)
+    names = pd.Series(numbered('电影', number))
+    known = number <= len(MOCK_MOVIE_NAMES)
+    if known.any():
+        names = names.astype(object)
+        names[known] = [MOCK_MOVIE_NAMES[k - 1] for k in number[known]]
+    years = rng.integers(1990, 2021, n)
+    return pd.DataFrame({
+        '电影名称': names,
+        '评分': np.round(rng.uniform(8.5, 9.7, n), 1),
+        '评价人数': rng.integers(100000, 2000001, n),
+        '导演和主演': pd.Series(numbered('导演', number)) + ' / ' + pd.Series(numbered('主演', number)),
+        '年份和类型': pd.Categorical.from_codes(years - 1990, categories=[f'{y} / 剧情' for y in range(1990, 2021)]),
+        '引言': numbered('这是一部优秀的电影', number),
+    })
+
+
+def _tee_json(chunks, path):
+    """逐块返回数据，同时把记录追加写入JSON数组文件（不需要把全部数据放在内存中）"""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('[')
+        first = True
+        for chunk in chunks:
+            for record in chunk.to_dict('records'):
+                f.write('\n  ' if first else ',\n  ')
+                f.write(json.dumps(record, ensure_ascii=False, default=str))
+                first = False
+            yield chunk
+        f.write('\n]\n')
+
+
+def generate_mock_data(n_rows=20, seed=None, chunksize=1_000_000, fmt='csv'):
+    """
+    生成模拟数据（用于演示，也可生成百万行以上的数据做压力测试）
     
-    # 保存模拟数据
-    df = pd.DataFrame(movies)
-    df.to_csv('Day3_Data_Processing/douban_top250_mock.csv', index=False, encoding='utf-8-sig')
+    参数:
+        n_rows: 电影数量
+        seed: 随机种子（None 表示每次不同）
+        chunksize: 每块行数，内存占用只与块大小有关
+        fmt: 输出格式，'csv' 或 'parquet'（同时写出同样内容的 douban_top250_mock.json）
+    """
+    print("\n[备用方案] 生成模拟数据...")
     
-    with open('Day3_Data_Processing/douban_top250_mock.json', 'w', encoding='utf-8') as f:
-        json.dump(movies, f, ensure_ascii=False, indent=2)
+    output_file = f'Day3_Data_Processing/douban_top250_mock.{fmt}'
+    json_file = 'Day3_Data_Processing/douban_top250_mock.json'
+    os.makedirs(os.path.dirname(json_file), exist_ok=True)
+    chunks = generate(make_mock_chunk, n_rows, seed=seed, chunksize=chunksize)
+    total = write_chunks(_tee_json(chunks, json_file), output_file)
     
-    print(f"✓ 已生成模拟数据: {len(movies)} 部电影")
-    print("  - douban_top250_mock.csv")
-    print("  - douban_top250_mock.json")
+    print(f"✓ 已生成模拟数据: {total} 部电影")
+    print(f"  - {os.path.basename(output_file)}")
+    print(f"  - {os.path.basename(json_file)}")
 
 # 如果需要使用模拟数据，取消下面的注释
 # generate_mock_data()
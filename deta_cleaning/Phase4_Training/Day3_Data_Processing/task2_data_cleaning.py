@@ -7,6 +7,13 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
+import os
+import sys
+
+# 清洗前后的对比图按导出配置保存
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from export_profiles import save_figure
 
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']
@@ -91,8 +98,8 @@ axes[1].set_ylabel('缺失数量')
 axes[1].tick_params(axis='x', rotation=45)
 
 plt.tight_layout()
-plt.savefig('Day3_Data_Processing/output_1_missing_values.png', dpi=300, bbox_inches='tight')
-print("\n✓ 已保存: output_1_missing_values.png")
+saved = save_figure('Day3_Data_Processing/output_1_missing_values.png')
+print(f"\n✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # ============================================================================
@@ -152,8 +159,8 @@ axes[1, 1].set_ylabel('家庭收入')
 axes[1, 1].grid(True, alpha=0.3)
 
 plt.tight_layout()
-plt.savefig('Day3_Data_Processing/output_2_outliers_before.png', dpi=300, bbox_inches='tight')
-print("\n✓ 已保存: output_2_outliers_before.png")
+saved = save_figure('Day3_Data_Processing/output_2_outliers_before.png')
+print(f"\n✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # 4.2 使用IQR方法检测和处理异常值
@@ -382,8 +389,8 @@ axes[1, 2].set_ylabel('成绩')
 axes[1, 2].grid(True, alpha=0.3)
 
 plt.tight_layout()
-plt.savefig('Day3_Data_Processing/output_3_comparison.png', dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_3_comparison.png")
+saved = save_figure('Day3_Data_Processing/output_3_comparison.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 print("\n" + "=" * 60)
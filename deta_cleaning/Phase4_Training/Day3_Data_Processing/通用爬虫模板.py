@@ -2,27 +2,68 @@
 通用爬虫模板 - 可以修改为爬取任何网站
 使用说明：
 1. 修改 base_url 为目标网站
-2. 修改 parse_page 方法中的选择器
-3. 修改 crawl 方法中的分页逻辑
+2. 修改 ITEM_SELECTOR 和 FIELDS 中的CSS选择器
+3. 修改 page_urls 方法中的分页逻辑（需要顺着页面里的链接继续爬时设置 FOLLOW_SELECTOR）
+4. 长时间爬取时设置 stream_path，每爬完一页就把结果追加写入NDJSON文件，内存占用不随页数增长
+5. 长时间爬取时设置 state_path（设置 stream_path 时默认保存在它旁边）：URL队列、已爬集合和结果
+   定期保存到SQLite，中断后用同样的参数重新运行即从上个检查点继续，已爬的页面不会重新获取，
+   获取失败的页面会重试
 """
 
+import os
+import sys
 import requests
-from bs4 import BeautifulSoup
 import pandas as pd
-import time
-import json
 from datetime import datetime
+from urllib.parse import urljoin, urlsplit
+
+# 共用工具目录（流式NDJSON读写、自适应限速抓取、HTML抽取规则、可续爬的URL队列）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from ndjson_stream import NDJSONWriter, iter_chunks
+from crawl_engine import FetchScheduler
+from html_parsers import Field, ParseRules
+from url_frontier import URLFrontier
+
+
+# ========== 重要：根据目标网站修改抽取规则（创建爬虫时编译一次） ==========
+# 示例1: 爬取列表项    ITEM_SELECTOR = 'div.item-class'
+# 示例2: 爬取表格      ITEM_SELECTOR = 'table tr + tr'  # 跳过表头（第一行之后的行）
+# 示例3: 爬取文章      ITEM_SELECTOR = 'article'
+ITEM_SELECTOR = 'div.your-target-class'
+
+# 字段名 -> Field(条目内的CSS选择器, attr=取属性（默认取文本）, index=第几个匹配)
+FIELDS = {
+    '标题': Field('h2'),
+    '内容': Field('p'),
+    '链接': Field('a', attr='href'),
+    # 添加更多字段...
+}
+
+# 顺着页面中的链接继续爬取（只跟随同一网站的链接）；None 表示只爬 page_urls 给出的页面
+# 示例: FOLLOW_SELECTOR = 'a.next'            # 下一页
+#       FOLLOW_SELECTOR = 'div.list a.detail'  # 详情页
+FOLLOW_SELECTOR = None
+# =====================================================================
 
 class GenericWebCrawler:
     """通用网页爬虫类"""
     
-    def __init__(self, base_url, target_name="数据"):
+    def __init__(self, base_url, target_name="数据", stream_path=None, rate=1.0, parser='auto',
+                 state_path=None, checkpoint_every=20):
         """
         初始化爬虫
         
         参数:
             base_url: 目标网站的URL
             target_name: 爬取目标的名称（用于显示）
+            stream_path: 结果写入的NDJSON文件（.gz/.zst 结尾时压缩），每爬完一页追加写入，
+                         设置后数据不保存在 data_list 中；None 表示爬完后统一保存
+            rate: 每秒请求数上限（被限流时自动降低，之后逐步恢复）
+            parser: HTML解析后端（auto / selectolax / lxml / soup）
+            state_path: 爬取状态的SQLite文件（URL队列、已爬集合、结果），设置后可中断续爬；
+                        默认在设置了 stream_path 时为 stream_path + '.state.sqlite'，
+                        否则只在本次运行内去重（删除该文件即从头开始）
+            checkpoint_every: 每爬完多少页保存一次检查点
         """
         # ========== 在这里修改目标网站 ==========
         self.base_url = base_url
@@ -34,13 +75,22 @@ class GenericWebCrawler:
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
         }
+        self.scheduler = FetchScheduler(rate=rate, headers=self.headers, timeout=10)
+        self.rules = ParseRules(ITEM_SELECTOR, FIELDS, backend=parser)
+        self.follow = self.rules.backend.compile(FOLLOW_SELECTOR) if FOLLOW_SELECTOR else None
+        if state_path is None and stream_path:
+            state_path = stream_path + '.state.sqlite'
+        self.state_path = state_path
+        self.checkpoint_every = checkpoint_every
         self.data_list = []
+        self.stream_path = stream_path
+        self.total = 0
+        self._writer = None
         
     def get_page(self, url):
-        """获取页面内容"""
+        """获取页面内容（限速，412/429/5xx、超时和连接重置时退避重试）"""
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            response.raise_for_status()
+            response = self.scheduler.get(url)
             response.encoding = response.apparent_encoding
             return response.text
         except requests.RequestException as e:
@@ -51,56 +101,36 @@ class GenericWebCrawler:
         """
         解析页面数据
         
-        ========== 重要：根据目标网站修改这里 ==========
+        按模块顶部的 ITEM_SELECTOR 和 FIELDS 抽取，需要加工字段时在这里修改
         """
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # 示例1: 爬取列表项
-        # items = soup.find_all('div', class_='item-class')
-        
-        # 示例2: 爬取表格
-        # items = soup.find('table').find_all('tr')[1:]  # 跳过表头
-        
-        # 示例3: 爬取文章
-        # items = soup.find_all('article')
-        
-        # ========== 修改选择器 ==========
-        items = soup.find_all('div', class_='your-target-class')
-        # ================================
-        
         page_data = []
-        for item in items:
+        for item in self.rules.items(html):
             try:
-                # ========== 根据需要提取的字段修改 ==========
-                data = {
-                    '标题': item.find('h2').text.strip() if item.find('h2') else '',
-                    '内容': item.find('p').text.strip() if item.find('p') else '',
-                    '链接': item.find('a')['href'] if item.find('a') else '',
-                    # 添加更多字段...
-                }
-                # ==========================================
-                
-                page_data.append(data)
-                
+                page_data.append(self.rules.extract(item))
             except Exception as e:
                 print(f"  ✗ 解析项目失败: {e}")
                 continue
         
         return page_data
     
-    def crawl(self, num_pages=5, delay=1):
-        """
-        执行爬取
-        
-        参数:
-            num_pages: 要爬取的页数
-            delay: 每次请求之间的延迟（秒）
-        """
-        print(f"\n开始爬取 {self.target_name}...")
-        print(f"目标网站: {self.base_url}")
-        print(f"计划爬取: {num_pages} 页")
-        print("=" * 60)
-        
+    def find_links(self, html, url):
+        """页面中匹配 FOLLOW_SELECTOR 的同站链接（转为绝对URL）"""
+        if self.follow is None:
+            return []
+        backend = self.rules.backend
+        host = urlsplit(url).netloc
+        links = []
+        for node in backend.select(backend.parse(html), self.follow):
+            href = backend.attr(node, 'href')
+            if href:
+                link = urljoin(url, href)
+                if urlsplit(link).netloc == host:
+                    links.append(link)
+        return links
+    
+    def page_urls(self, num_pages):
+        """要爬取的分页URL（按顺序；重复的URL只爬一次）"""
+        urls = []
         for page in range(num_pages):
             # ========== 根据网站的分页方式修改 ==========
             
@@ -116,53 +146,140 @@ class GenericWebCrawler:
             # 方式4: 固定URL（不分页）
             url = self.base_url
             # ===========================================
-            
-            print(f"\n正在爬取第 {page + 1}/{num_pages} 页...")
+            urls.append(url)
+        return urls
+    
+    def crawl(self, num_pages=5, delay=None, max_pages=None):
+        """
+        执行爬取
+        
+        参数:
+            num_pages: 分页数（page_urls 生成的种子URL数）
+            delay: 两次请求之间的最短间隔（秒），即速率上限 1/delay；None 时使用构造时的 rate
+            max_pages: 本次运行最多获取的页面数（None 表示直到队列为空）
+        
+        返回:
+            爬取的数据列表（流式模式下为写出的条数）；续爬时包括之前运行的结果
+        """
+        print(f"\n开始爬取 {self.target_name}...")
+        print(f"目标网站: {self.base_url}")
+        print(f"计划爬取: {num_pages} 页")
+        print("=" * 60)
+        
+        if delay:
+            self.scheduler.engine.set_rate(1 / delay)
+        with URLFrontier(self.state_path or ':memory:', checkpoint_every=self.checkpoint_every) as frontier:
+            if frontier.resumed:
+                print(f"从检查点继续: {frontier.summary()}")
+            # 分页URL按顺序排在最前；已见过的URL（包括重复的分页URL）不会再入队
+            frontier.add_many(self.page_urls(num_pages))
+            # 先写出检查点中已保存的结果（上次检查点之后写出的部分会随页面重新爬取），
+            # 之后每爬完一页追加
+            self.total = 0
+            self.data_list = []
+            self._writer = NDJSONWriter(self.stream_path) if self.stream_path else None
+            try:
+                self._emit(frontier.iter_results())
+                self._crawl_frontier(frontier, max_pages)
+            finally:
+                # 中断（包括 Ctrl+C）时也保存检查点
+                frontier.checkpoint()
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+            print(f"  {frontier.summary()}")
+        
+        print(f"\n✓ 爬取完成！共获取 {self.total} 条数据")
+        print(f"  {self.scheduler.summary()}")
+        if self.stream_path:
+            print(f"  ✓ 数据已写入: {self.stream_path}")
+            return self.total
+        return self.data_list
+    
+    def _crawl_frontier(self, frontier, max_pages):
+        """按优先级从队列中取URL爬取，页面结果和发现的链接记入队列"""
+        fetched = 0
+        while max_pages is None or fetched < max_pages:
+            entry = frontier.pop()
+            if entry is None:
+                break
+            url, depth = entry
+            fetched += 1
+            print(f"\n正在爬取第 {fetched} 页（队列中还有 {len(frontier)} 个）...")
             print(f"URL: {url}")
             
             # 获取页面
             html = self.get_page(url)
             if not html:
-                print(f"  ✗ 第{page + 1}页获取失败，跳过")
+                print("  ✗ 页面获取失败，跳过")
+                frontier.failed(url, '获取失败')
                 continue
             
-            # 解析数据
+            # 解析数据，链接按深度排在当前分页之后
             page_data = self.parse_page(html)
-            self.data_list.extend(page_data)
-            print(f"  ✓ 成功爬取 {len(page_data)} 条数据")
-            
-            # 礼貌性延迟
-            if page < num_pages - 1:
-                time.sleep(delay)
-        
-        print(f"\n✓ 爬取完成！共获取 {len(self.data_list)} 条数据")
-        return self.data_list
+            new_links = frontier.add_many(self.find_links(html, url), priority=depth + 1, depth=depth + 1)
+            frontier.done(url, page_data)
+            self._emit(page_data)
+            print(f"  ✓ 成功爬取 {len(page_data)} 条数据" + (f"，新链接 {new_links} 个" if new_links else ""))
+    
+    def _emit(self, records):
+        """把一批结果追加到 stream_path（写出后立即刷新）或 data_list"""
+        if self._writer is None:
+            count = len(self.data_list)
+            self.data_list.extend(records)
+            self.total += len(self.data_list) - count
+            return
+        for record in records:
+            self._writer.write(record)
+            self.total += 1
+        self._writer.flush()
+    
+    def close(self):
+        """关闭抓取调度器（后台事件循环和连接池）"""
+        self.scheduler.close()
     
     def save_data(self, output_dir='Day3_Data_Processing', filename='crawled_data'):
         """保存数据"""
-        if not self.data_list:
+        if not self.total:
             print("⚠️ 没有数据可保存")
             return
         
         print("\n保存数据...")
-        
-        # 保存为CSV
-        df = pd.DataFrame(self.data_list)
         csv_file = f'{output_dir}/{filename}.csv'
-        df.to_csv(csv_file, index=False, encoding='utf-8-sig')
-        print(f"  ✓ 已保存CSV: {csv_file}")
         
-        # 保存为JSON
-        json_file = f'{output_dir}/{filename}.json'
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(self.data_list, f, ensure_ascii=False, indent=2)
-        print(f"  ✓ 已保存JSON: {json_file}")
+        if self.stream_path:
+            # 流式模式：按块把NDJSON转成CSV，不一次性读入内存
+            df = None
+            for i, chunk in enumerate(iter_chunks(self.stream_path)):
+                chunk_df = pd.DataFrame(chunk)
+                chunk_df.to_csv(csv_file, index=False, mode='w' if i == 0 else 'a',
+                                header=(i == 0), encoding='utf-8-sig' if i == 0 else 'utf-8')
+                if df is None:
+                    df = chunk_df
+            print(f"  ✓ 已保存CSV: {csv_file}")
+        else:
+            # 保存为CSV
+            df = pd.DataFrame(self.data_list)
+            df.to_csv(csv_file, index=False, encoding='utf-8-sig')
+            print(f"  ✓ 已保存CSV: {csv_file}")
+            
+            # 保存为NDJSON（每行一条记录）
+            ndjson_file = f'{output_dir}/{filename}.ndjson'
+            with NDJSONWriter(ndjson_file) as writer:
+                writer.write_many(self.data_list)
+            print(f"  ✓ 已保存NDJSON: {ndjson_file}")
         
         # 生成简单报告
-        self.generate_report(df, output_dir, filename)
+        self.generate_report(df, output_dir, filename, total=self.total)
     
-    def generate_report(self, df, output_dir, filename):
-        """生成数据报告"""
+    def generate_report(self, df, output_dir, filename, total=None):
+        """
+        生成数据报告
+        
+        参数:
+            df: 数据（流式模式下只有第一块，用于列出字段）
+            total: 数据总量（默认 len(df)）
+        """
         report = f"""
 {'=' * 60}
 {self.target_name} 爬取报告
@@ -170,7 +287,7 @@ class GenericWebCrawler:
 
 爬取时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 目标网站: {self.base_url}
-数据总量: {len(df)} 条
+数据总量: {len(df) if total is None else total} 条
 
 数据字段: {', '.join(df.columns.tolist())}
 
@@ -200,7 +317,8 @@ if __name__ == "__main__":
     # 示例1: 爬取豆瓣电影
     crawler = GenericWebCrawler(
         base_url="https://www.bilibili.com/v/popular/rank/all",
-        target_name="哔哩哔哩排行榜"
+        target_name="哔哩哔哩排行榜",
+        # state_path='Day3_Data_Processing/crawl_state.sqlite',  # 中断后可续爬
     )
     
     # 示例2: 爬取其他网站（取消注释使用）
@@ -212,10 +330,13 @@ if __name__ == "__main__":
     # =======================================
     
     # 执行爬取
-    data = crawler.crawl(
-        num_pages=3,    # 爬取页数
-        delay=1         # 延迟秒数
-    )
+    try:
+        data = crawler.crawl(
+            num_pages=3,    # 爬取页数
+            delay=1         # 最短请求间隔秒数（被限流时自动放慢）
+        )
+    finally:
+        crawler.close()
     
     # 保存数据
     if data:
@@ -230,7 +351,7 @@ if __name__ == "__main__":
     print("\n" + "=" * 60)
     print("💡 提示：")
     print("1. 修改 base_url 为您的目标网站")
-    print("2. 修改 parse_page 方法中的选择器")
-    print("3. 修改 crawl 方法中的URL构建方式")
+    print("2. 修改 ITEM_SELECTOR 和 FIELDS 中的CSS选择器")
+    print("3. 修改 page_urls 方法中的URL构建方式（或设置 FOLLOW_SELECTOR 跟随链接）")
     print("4. 运行脚本开始爬取")
     print("=" * 60)
@@ -10,6 +10,13 @@ from sklearn.datasets import make_classification
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import confusion_matrix, classification_report, accuracy_score
+import os
+import sys
+
+# 混淆矩阵图按当前导出配置保存（见 export_profiles）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from export_profiles import save_figure
 
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']
@@ -79,9 +86,8 @@ axes[1].set_ylabel('真实标签', fontsize=12)
 axes[1].set_title('二分类混淆矩阵（归一化）', fontsize=14, fontweight='bold')
 
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_1_binary_confusion_matrix.png', 
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_1_binary_confusion_matrix.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_1_binary_confusion_matrix.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # 打印分类报告
@@ -141,9 +147,8 @@ axes[1].set_ylabel('真实标签', fontsize=12)
 axes[1].set_title('多分类混淆矩阵（归一化）', fontsize=14, fontweight='bold')
 
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_2_multi_confusion_matrix.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_2_multi_confusion_matrix.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_2_multi_confusion_matrix.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # 打印分类报告
@@ -257,9 +262,8 @@ ax4.text(0.1, 0.95, metrics_table, fontsize=10, verticalalignment='top',
         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
 
 plt.suptitle('多分类模型综合性能分析', fontsize=16, fontweight='bold', y=0.98)
-plt.savefig('Day4_5_Model_Evaluation/output_3_comprehensive_analysis.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_3_comprehensive_analysis.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_3_comprehensive_analysis.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 print("\n" + "=" * 60)
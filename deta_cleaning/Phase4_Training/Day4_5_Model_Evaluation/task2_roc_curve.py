@@ -12,6 +12,13 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import roc_curve, auc, roc_auc_score
 from sklearn.preprocessing import label_binarize
 from itertools import cycle
+import os
+import sys
+
+# ROC曲线图通过共用工具目录的 save_figure 导出
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from export_profiles import save_figure
 
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']
@@ -84,9 +91,8 @@ ax.text(0.6, 0.2, info_text, fontsize=10,
         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
 
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_1_binary_roc.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_1_binary_roc.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_1_binary_roc.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 print(f"  AUC = {roc_auc:.4f}")
 plt.close()
 
@@ -174,9 +180,8 @@ ax.legend(loc="lower right", fontsize=10)
 ax.grid(True, alpha=0.3)
 
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_2_multi_roc.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_2_multi_roc.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_2_multi_roc.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 print(f"  微平均AUC = {roc_auc_dict['micro']:.4f}")
 print(f"  宏平均AUC = {roc_auc_dict['macro']:.4f}")
 plt.close()
@@ -246,9 +251,8 @@ ax.text(0.55, 0.15, info_text, fontsize=10,
         bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.9))
 
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_3_model_comparison_roc.png',
-            dpi=300, bbox_inches='tight')
-print("\n✓ 已保存: output_3_model_comparison_roc.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_3_model_comparison_roc.png')
+print(f"\n✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # ============================================================================
@@ -328,9 +332,8 @@ ax3.grid(True, alpha=0.3, axis='y')
 
 plt.suptitle('ROC曲线详细分析', fontsize=16, fontweight='bold', y=1.02)
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_4_detailed_roc_analysis.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_4_detailed_roc_analysis.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_4_detailed_roc_analysis.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 print("\n" + "=" * 60)
@@ -10,6 +10,13 @@ from sklearn.model_selection import train_test_split, learning_curve
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score
+import os
+import sys
+
+# 学习曲线图的导出（dpi、格式）由 export_profiles 决定
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from export_profiles import save_figure
 
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']
@@ -100,9 +107,8 @@ ax.text(0.05, 0.95, info_text, transform=ax.transAxes,
         bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
 
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_1_learning_curve_samples.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_1_learning_curve_samples.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_1_learning_curve_samples.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 print(f"  训练集准确率: {train_mean[-1]:.4f}")
 print(f"  验证集准确率: {val_mean[-1]:.4f}")
 plt.close()
@@ -198,9 +204,8 @@ ax.text(0.05, 0.95, info_text, transform=ax.transAxes,
         bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.9))
 
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_2_learning_curve_iterations.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_2_learning_curve_iterations.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_2_learning_curve_iterations.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 print(f"  最佳迭代次数: {best_iter}")
 print(f"  最佳测试准确率: {best_score:.4f}")
 plt.close()
@@ -276,9 +281,8 @@ for idx, ((name, model), color) in enumerate(zip(models.items(), colors)):
 
 plt.suptitle('多模型学习曲线对比', fontsize=16, fontweight='bold', y=1.02)
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_3_multi_model_learning_curves.png',
-            dpi=300, bbox_inches='tight')
-print("\n✓ 已保存: output_3_multi_model_learning_curves.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_3_multi_model_learning_curves.png')
+print(f"\n✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # ============================================================================
@@ -358,9 +362,8 @@ ax3.legend(loc='upper right', fontsize=10)
 ax3.grid(True, alpha=0.3)
 
 plt.suptitle('学习曲线综合分析', fontsize=16, fontweight='bold', y=0.995)
-plt.savefig('Day4_5_Model_Evaluation/output_4_comprehensive_learning_analysis.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_4_comprehensive_learning_analysis.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_4_comprehensive_learning_analysis.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 print("\n" + "=" * 60)
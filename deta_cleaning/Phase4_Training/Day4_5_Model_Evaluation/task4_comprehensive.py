@@ -14,6 +14,13 @@ from sklearn.svm import SVC
 from sklearn.metrics import (accuracy_score, precision_score, recall_score, 
                             f1_score, roc_auc_score, confusion_matrix)
 import pandas as pd
+import os
+import sys
+
+# 对比图和仪表盘用共用的 save_figure 保存
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from export_profiles import save_figure
 
 # 设置中文字体
 plt.rcParams['font.sans-serif'] = ['Microsoft YaHei', 'SimHei']
@@ -124,9 +131,8 @@ ax.grid(True, alpha=0.3, axis='y')
 ax.set_ylim([0, 1.1])
 
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_1_multi_metric_comparison.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_1_multi_metric_comparison.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_1_multi_metric_comparison.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # ============================================================================
@@ -168,9 +174,8 @@ ax.legend(loc='upper right', bbox_to_anchor=(1.3, 1.1), fontsize=12)
 ax.grid(True, linestyle='--', alpha=0.7)
 
 plt.tight_layout()
-plt.savefig('Day4_5_Model_Evaluation/output_2_radar_comparison.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_2_radar_comparison.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_2_radar_comparison.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # ============================================================================
@@ -320,9 +325,8 @@ ax7.text(0.1, 0.95, summary_text, fontsize=9, verticalalignment='top',
         bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.9))
 
 plt.suptitle('模型性能综合仪表盘', fontsize=18, fontweight='bold', y=0.995)
-plt.savefig('Day4_5_Model_Evaluation/output_3_comprehensive_dashboard.png',
-            dpi=300, bbox_inches='tight')
-print("✓ 已保存: output_3_comprehensive_dashboard.png")
+saved = save_figure('Day4_5_Model_Evaluation/output_3_comprehensive_dashboard.png')
+print(f"✓ 已保存: {os.path.basename(saved)}")
 plt.close()
 
 # ============================================================================
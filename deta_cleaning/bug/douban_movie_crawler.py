@@ -4,16 +4,23 @@ Douban Top250 Movies Crawler and Visualization
 Crawl Douban Top250 movies data and create visualizations
 """
 
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
-import time
-import random
 import sys
 import io
+import os
+import time
+
+# FFT分箱KDE和大数据量散点栅格化（与 AdvancedVisualizer 共用）
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from density import fft_kde
+from scatter_raster import FitStats, density_scatter
+from export_profiles import save_figure
+from crawl_engine import FetchScheduler
+from html_parsers import Field, ParseRules
 
 # Set output encoding
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -36,9 +43,27 @@ print("=" * 70)
 # Part 1: Crawl Douban Top250 Data
 # ============================================================================
 
-def crawl_douban_top250():
-    """Crawl Douban Top250 movies data"""
+# Extraction rules for a Top250 page: one <li> per movie in ol.grid_view
+TOP250_ITEM = 'ol.grid_view > li'
+TOP250_FIELDS = {
+    'rank': Field('em', default='0'),
+    'title': Field('div.info span.title', default='Unknown'),
+    'rating': Field('div.info span.rating_num', default='0'),
+    'votes': Field('div.info div.star span', index=3, default='0'),
+}
+
+
+def crawl_douban_top250(parser='auto', concurrency=4, delay=0.5):
+    """
+    Crawl Douban Top250 movies data
+    
+    parser: HTML backend for the extraction rules (auto / selectolax / lxml / soup)
+    concurrency: max pages in flight (lowered automatically when throttled)
+    delay: minimum seconds between two requests to the same host (0 means no extra wait,
+           capped at 1000 requests per second and still lowered when throttled)
+    """
     print("\n[1/3] Crawling Douban Top250 data...")
+    rules = ParseRules(TOP250_ITEM, TOP250_FIELDS, backend=parser)
     
     headers = {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -49,67 +74,53 @@ def crawl_douban_top250():
     }
     
     movies = []
-    
-    for page in range(0, 250, 25):
-        url = f'https://movie.douban.com/top250?start={page}'
+    # Page URLs are known up front: fetch them concurrently (per-host delay, backoff +
+    # Retry-After when throttled) and walk the responses in page order
+    scheduler = FetchScheduler(rate=1 / max(delay, 0.001), max_connections=concurrency,
+                               initial_concurrency=concurrency, headers=headers, timeout=10)
+    urls = [f'https://movie.douban.com/top250?start={page}' for page in range(0, 250, 25)]
+    print(f"   Fetching {len(urls)} pages (up to {concurrency} at a time, {delay}s apart per host)...")
+    try:
+        begin = time.perf_counter()
+        responses = scheduler.get_many(urls)
+        seconds = time.perf_counter() - begin
         
-        try:
-            print(f"   Crawling page {page//25 + 1}...")
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            movie_list = soup.find('ol', class_='grid_view')
-            
-            if not movie_list:
-                print(f"   Warning: Page {page//25 + 1} not found")
-                continue
-            
-            movie_items = movie_list.find_all('li')
-            
-            for item in movie_items:
-                try:
-                    info_div = item.find('div', class_='info')
-                    if not info_div:
-                        continue
-                    
-                    rank_em = item.find('em')
-                    rank = rank_em.text if rank_em else "0"
-                    
-                    title_span = info_div.find('span', class_='title')
-                    title = title_span.text if title_span else "Unknown"
-                    
-                    rating_span = info_div.find('span', class_='rating_num')
-                    rating = rating_span.text if rating_span else "0"
-                    
-                    star_div = info_div.find('div', class_='star')
-                    if star_div:
-                        rating_people_spans = star_div.find_all('span')
-                        if len(rating_people_spans) >= 4:
-                            rating_people = rating_people_spans[3].text.replace('人评价', '').strip()
-                        else:
-                            rating_people = "0"
-                    else:
-                        rating_people = "0"
-                    
-                    if rank != "0" and title != "Unknown":
-                        movies.append({
-                            'Rank': int(rank),
-                            'Title': title,
-                            'Rating': float(rating),
-                            'Votes': int(rating_people) if rating_people.isdigit() else 0
-                        })
-                    
-                except Exception as e:
+        for page, response in zip(range(0, 250, 25), responses):
+            try:
+                if isinstance(response, Exception):
+                    raise response
+                
+                movie_items = rules.parse(response.text)
+                
+                if not movie_items:
+                    print(f"   Warning: Page {page//25 + 1} not found")
                     continue
-            
-            print(f"   Page {page//25 + 1} done, got {len(movie_items)} movies")
-            time.sleep(random.uniform(1, 2))
-            
-        except Exception as e:
-            print(f"   Failed to crawl page {page//25 + 1}: {e}")
-            continue
-    
+                
+                for item in movie_items:
+                    try:
+                        rating_people = item['votes'].replace('人评价', '').strip()
+                        
+                        if item['rank'] != "0" and item['title'] != "Unknown":
+                            movies.append({
+                                'Rank': int(item['rank']),
+                                'Title': item['title'],
+                                'Rating': float(item['rating']),
+                                'Votes': int(rating_people) if rating_people.isdigit() else 0
+                            })
+                        
+                    except Exception as e:
+                        continue
+                
+                print(f"   Page {page//25 + 1} done, got {len(movie_items)} movies")
+                
+            except Exception as e:
+                print(f"   Failed to crawl page {page//25 + 1}: {e}")
+                continue
+        
+        print(f"   Fetched in {seconds:.1f}s (sum of page requests {scheduler.engine.stats['seconds']:.1f}s)")
+        print(f"   {scheduler.summary()}")
+    finally:
+        scheduler.close()
     print(f"\n   Successfully crawled {len(movies)} movies!")
     return movies
 
@@ -187,8 +198,7 @@ def visualize_data(df):
     n, bins, patches = ax2.hist(df['Rating'], bins=20, color='skyblue', 
                                  edgecolor='black', alpha=0.7)
     
-    from scipy import stats
-    density = stats.gaussian_kde(df['Rating'])
+    density = fft_kde(df['Rating'].values)
     xs = np.linspace(df['Rating'].min(), df['Rating'].max(), 200)
     ax2_twin = ax2.twinx()
     ax2_twin.plot(xs, density(xs), 'r-', linewidth=2, label='Density')
@@ -285,20 +295,19 @@ def visualize_data(df):
     df_valid = df[df['Votes'] > 0].copy()
     
     if len(df_valid) > 0:
-        scatter = ax6.scatter(df_valid['Votes']/10000, df_valid['Rating'], 
-                             c=df_valid['Rank'], cmap='viridis_r', 
-                             s=100, alpha=0.6, edgecolors='black', linewidth=0.5)
+        # Switches to a pixel grid of mean rank for very large inputs
+        scatter = density_scatter(ax6, df_valid['Votes'].values/10000, df_valid['Rating'].values,
+                                  c=df_valid['Rank'].values, cmap='viridis_r',
+                                  s=100, alpha=0.6, edgecolors='black', linewidth=0.5)
         
-        # Try to add trend line, skip if data is problematic
-        try:
-            if len(df_valid) > 1:
-                z = np.polyfit(df_valid['Votes'], df_valid['Rating'], 1)
-                p = np.poly1d(z)
-                ax6.plot(df_valid['Votes']/10000, p(df_valid['Votes']), 
-                        "r--", linewidth=2, alpha=0.8, label='Trend')
-                ax6.legend()
-        except:
-            pass  # Skip trend line if calculation fails
+        # Trend line from sufficient statistics; skipped when the fit is degenerate
+        fit = FitStats.from_arrays(df_valid['Votes'].values, df_valid['Rating'].values)
+        slope, intercept = fit.slope_intercept()
+        if np.isfinite(slope):
+            votes_line = np.array([df_valid['Votes'].min(), df_valid['Votes'].max()])
+            ax6.plot(votes_line/10000, slope * votes_line + intercept,
+                    "r--", linewidth=2, alpha=0.8, label='Trend')
+            ax6.legend()
         
         cbar = plt.colorbar(scatter, ax=ax6)
         cbar.set_label('Rank', fontsize=11)
@@ -316,8 +325,8 @@ def visualize_data(df):
     
     plt.tight_layout()
     output_file = f'{output_dir}/douban_top250_analysis.png'
-    plt.savefig(output_file, dpi=300, bbox_inches='tight')
-    print(f"\n   Comprehensive chart saved: {output_file}")
+    saved = save_figure(output_file)
+    print(f"\n   Comprehensive chart saved: {saved}")
     plt.close()
     
     create_detailed_boxplot(df, output_dir)
@@ -362,8 +371,8 @@ IQR: {stats['75%'] - stats['25%']:.2f}
     ax.set_ylim(7.5, 10)
     
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/douban_boxplot_detailed.png', dpi=300, bbox_inches='tight')
-    print(f"   Detailed boxplot saved")
+    saved = save_figure(f'{output_dir}/douban_boxplot_detailed.png')
+    print(f"   Detailed boxplot saved: {saved}")
     plt.close()
 
 
@@ -379,8 +388,7 @@ def create_detailed_histogram(df, output_dir):
     for i, patch in enumerate(patches):
         patch.set_facecolor(cm(n[i]/n.max()))
     
-    from scipy import stats
-    density = stats.gaussian_kde(df['Rating'])
+    density = fft_kde(df['Rating'].values)
     xs = np.linspace(df['Rating'].min(), df['Rating'].max(), 200)
     ax_twin = ax.twinx()
     ax_twin.plot(xs, density(xs), 'r-', linewidth=3, label='Density', alpha=0.8)
@@ -412,8 +420,8 @@ def create_detailed_histogram(df, output_dir):
            fontsize=11, verticalalignment='top', family='monospace')
     
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/douban_histogram_detailed.png', dpi=300, bbox_inches='tight')
-    print(f"   Detailed histogram saved")
+    saved = save_figure(f'{output_dir}/douban_histogram_detailed.png')
+    print(f"   Detailed histogram saved: {saved}")
     plt.close()
 
 
@@ -10,6 +10,12 @@ import seaborn as sns
 import numpy as np
 import sys
 import io
+import os
+
+# 演示图表的导出格式由 FIGURE_PROFILE 控制
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from export_profiles import save_figure
 
 # Set output encoding
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
@@ -151,8 +157,8 @@ IQR: {stats['75%'] - stats['25%']:.2f}
     ax.set_ylim(7.5, 10)
     
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/douban_boxplot.png', dpi=300, bbox_inches='tight')
-    print(f"      Saved: douban_boxplot.png")
+    saved = save_figure(f'{output_dir}/douban_boxplot.png')
+    print(f"      Saved: {os.path.basename(saved)}")
     plt.close()
     
     # ========== 2. Histogram (Detailed) ==========
@@ -206,8 +212,8 @@ IQR: {stats['75%'] - stats['25%']:.2f}
            family='monospace')
     
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/douban_histogram.png', dpi=300, bbox_inches='tight')
-    print(f"      Saved: douban_histogram.png")
+    saved = save_figure(f'{output_dir}/douban_histogram.png')
+    print(f"      Saved: {os.path.basename(saved)}")
     plt.close()
     
     # ========== 3. Comprehensive Analysis (6-in-1) ==========
@@ -287,8 +293,8 @@ IQR: {stats['75%'] - stats['25%']:.2f}
                 fontsize=18, fontweight='bold', y=0.98)
     
     plt.tight_layout()
-    plt.savefig(f'{output_dir}/douban_comprehensive.png', dpi=300, bbox_inches='tight')
-    print(f"      Saved: douban_comprehensive.png")
+    saved = save_figure(f'{output_dir}/douban_comprehensive.png')
+    print(f"      Saved: {os.path.basename(saved)}")
     plt.close()
 
 
@@ -9,6 +9,13 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 import os
+import sys
+
+# 分布摘要与 AdvancedVisualizer 共用
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'beat_120_mine_levels_in_one_turn'))
+import dist_summary
+from export_profiles import save_figure
 
 # 设置中文显示
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Microsoft YaHei']
@@ -224,15 +231,20 @@ def detect_outliers(df, method='iqr'):
     
     return outliers_info
 
-def visualize_data(df, output_dir='./'):
+def visualize_data(df, output_dir='./', profile=None):
     """
     数据可视化
+    
+    参数:
+        profile: 分布摘要（dist_summary.profile_distributions 的结果），箱线图由它绘制
     """
     print("\n" + "=" * 50)
     print("步骤 6: 数据可视化")
     print("=" * 50)
     
     numeric_columns = df.select_dtypes(include=[np.number]).columns
+    if profile is None:
+        profile = dist_summary.profile_distributions(df, numeric_columns)
     
     # 6.1 缺失值热图
     print("\n生成缺失值热图...")
@@ -240,9 +252,9 @@ def visualize_data(df, output_dir='./'):
     sns.heatmap(df.isnull(), cbar=True, yticklabels=False, cmap='viridis')
     plt.title('缺失值分布热图', fontsize=16, pad=20)
     plt.tight_layout()
-    plt.savefig(f'{output_dir}missing_values_heatmap.png', dpi=300, bbox_inches='tight')
+    saved = save_figure(f'{output_dir}missing_values_heatmap.png')
     plt.close()
-    print(f"保存: {output_dir}missing_values_heatmap.png")
+    print(f"保存: {saved}")
     
     # 6.2 数据分布箱线图
     print("\n生成箱线图...")
@@ -251,7 +263,7 @@ def visualize_data(df, output_dir='./'):
     
     for idx, col in enumerate(numeric_columns[:16]):
         if idx < len(axes):
-            df[col].plot(kind='box', ax=axes[idx])
+            dist_summary.plot_box(axes[idx], profile, [col], shownotches=False, showmeans=False)
             axes[idx].set_title(col, fontsize=10)
             axes[idx].set_ylabel('')
     
@@ -261,9 +273,9 @@ def visualize_data(df, output_dir='./'):
     
     plt.suptitle('各特征箱线图', fontsize=16, y=1.00)
     plt.tight_layout()
-    plt.savefig(f'{output_dir}boxplots.png', dpi=300, bbox_inches='tight')
+    saved = save_figure(f'{output_dir}boxplots.png')
     plt.close()
-    print(f"保存: {output_dir}boxplots.png")
+    print(f"保存: {saved}")
     
     # 6.3 相关性热图
     print("\n生成相关性热图...")
@@ -273,9 +285,9 @@ def visualize_data(df, output_dir='./'):
                 center=0, square=True, linewidths=1)
     plt.title('特征相关性热图', fontsize=16, pad=20)
     plt.tight_layout()
-    plt.savefig(f'{output_dir}correlation_heatmap.png', dpi=300, bbox_inches='tight')
+    saved = save_figure(f'{output_dir}correlation_heatmap.png')
     plt.close()
-    print(f"保存: {output_dir}correlation_heatmap.png")
+    print(f"保存: {saved}")
     
     print("\n可视化完成！")
 
@@ -329,8 +341,14 @@ def main():
     # 5. 检测异常值
     outliers_info = detect_outliers(df, method='iqr')
     
+    # 5.1 生成分布摘要（四分位数、须线、异常值样本、固定边界直方图），
+    #     箱线图、小提琴图和直方图都由它绘制，AdvancedVisualizer 可以直接读取
+    numeric_columns = df.select_dtypes(include=[np.number]).columns
+    profile = dist_summary.profile_distributions(df, numeric_columns)
+    dist_summary.save_profile(profile, os.path.join(output_dir, 'distribution_profile.json'))
+    
     # 6. 数据可视化
-    visualize_data(df, output_dir=output_dir)
+    visualize_data(df, output_dir=output_dir, profile=profile)
     
     # 7. 保存清洗后的数据
     save_cleaned_data(df, output_file)
@@ -9,6 +9,13 @@ from mpl_toolkits.axes_grid1.inset_locator import inset_axes, mark_inset
 import numpy as np
 import plotly.graph_objects as go
 import pandas as pd
+import os
+import sys
+
+# 示例图表用 export_profiles.save_figure 保存，格式随 FIGURE_PROFILE 变化
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                '..', '..', 'beat_120_mine_levels_in_one_turn'))
+from export_profiles import save_figure
 
 # 设置中文字体（如果需要）
 plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
@@ -51,7 +58,7 @@ def create_3d_bar_chart():
     ax.view_init(elev=20, azim=45)
     
     plt.tight_layout()
-    plt.savefig('3d_bar_chart.png', dpi=300, bbox_inches='tight')
+    save_figure('3d_bar_chart.png')
     plt.show()
 
 
@@ -86,7 +93,7 @@ def create_3d_line_chart():
     ax.view_init(elev=20, azim=45)
     
     plt.tight_layout()
-    plt.savefig('3d_line_chart.png', dpi=300, bbox_inches='tight')
+    save_figure('3d_line_chart.png')
     plt.show()
 
 
@@ -123,7 +130,7 @@ def create_3d_scatter_chart():
     ax.view_init(elev=20, azim=45)
     
     plt.tight_layout()
-    plt.savefig('3d_scatter_chart.png', dpi=300, bbox_inches='tight')
+    save_figure('3d_scatter_chart.png')
     plt.show()
 
 
@@ -159,7 +166,7 @@ def create_3d_surface_chart():
     ax.view_init(elev=30, azim=45)
     
     plt.tight_layout()
-    plt.savefig('3d_surface_chart.png', dpi=300, bbox_inches='tight')
+    save_figure('3d_surface_chart.png')
     plt.show()
 
 
@@ -201,7 +208,7 @@ def create_step_plot():
     axes[1, 1].grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('step_plots.png', dpi=300, bbox_inches='tight')
+    save_figure('step_plots.png')
     plt.show()
 
 
@@ -245,7 +252,7 @@ def create_inset_plot():
     ax.legend()
     
     plt.tight_layout()
-    plt.savefig('inset_plot.png', dpi=300, bbox_inches='tight')
+    save_figure('inset_plot.png')
     plt.show()
 
 
@@ -303,7 +310,7 @@ def create_multicolor_fill():
     ax.grid(True, alpha=0.3)
     
     plt.tight_layout()
-    plt.savefig('multicolor_fill.png', dpi=300, bbox_inches='tight')
+    save_figure('multicolor_fill.png')
     plt.show()
 
 